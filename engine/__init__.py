@@ -1,26 +1,96 @@
+import importlib
+
+from .clock import Clock, SystemClock, VirtualClock
 from .controller import EngineController
+from .events import (
+    CueAdvanced,
+    EngineEvent,
+    EventBus,
+    OutputChanged,
+    OverrideToggled,
+    PalettesChanged,
+    PatchChanged,
+    SceneChanged,
+    ScenesChanged,
+    SequencesChanged,
+    TransportChanged,
+)
 from .fade_engine import FadeEngine
-from .models import Cue, FixtureGroup, FixturePatch, FixtureState, LiveOverride, Scene, Sequence, ShowFile, Transition, TriggerMode
+from .metrics import EngineMetrics, MetricsSnapshot
+from .models import Cue, FixtureGroup, FixturePatch, FixtureState, LiveOverride, Palette, Scene, Sequence, ShowFile, Transition, TriggerMode
+from .monitor import UniverseMonitor
 from .output_engine import OutputEngine
+from .palettes import PaletteStore
+from .patch_index import PatchIndex
+from .patch_transaction import PatchConflictError, PatchTransaction
 from .scene_engine import SceneEngine
 from .sequence_engine import SequenceEngine
 from .state_manager import EngineStateManager
+from .tracking import TrackingEngine
+
+# Imported on first use: they pull in multiprocessing and are not needed to start the console.
+_LAZY_EXPORTS = {
+    "EngineProcess": ".process",
+    "FrameRecorder": ".offline_renderer",
+    "OfflineRenderer": ".offline_renderer",
+    "ProcessEngineController": ".process",
+    "RenderAction": ".offline_renderer",
+    "SharedRing": ".frame_bus",
+}
 
 __all__ = [
+    "Clock",
     "Cue",
+    "CueAdvanced",
     "EngineController",
+    "EngineEvent",
+    "EngineMetrics",
+    "EngineProcess",
+    "EventBus",
     "FadeEngine",
     "FixtureGroup",
     "FixturePatch",
     "FixtureState",
+    "FrameRecorder",
     "LiveOverride",
+    "MetricsSnapshot",
+    "OfflineRenderer",
+    "OutputChanged",
     "OutputEngine",
+    "OverrideToggled",
+    "Palette",
+    "PaletteStore",
+    "PalettesChanged",
+    "PatchConflictError",
+    "PatchIndex",
+    "PatchTransaction",
+    "PatchChanged",
+    "ProcessEngineController",
+    "RenderAction",
     "Scene",
+    "SceneChanged",
     "SceneEngine",
+    "ScenesChanged",
     "Sequence",
     "SequenceEngine",
+    "SequencesChanged",
+    "SharedRing",
     "EngineStateManager",
     "ShowFile",
+    "SystemClock",
+    "TrackingEngine",
     "Transition",
+    "TransportChanged",
     "TriggerMode",
-]
\ No newline at end of file
+    "UniverseMonitor",
+    "VirtualClock",
+]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -2,16 +2,25 @@ from __future__ import annotations
 
 import time
 import uuid
-from dataclasses import dataclass
+from collections.abc import MutableMapping
+from dataclasses import dataclass, replace
 
 from fixture import Fixture
 
+from .clock import Clock, SystemClock
+from .events import CueAdvanced, EventBus, PalettesChanged, PatchChanged, ScenesChanged, TransportChanged
 from .fade_engine import FadeEngine
-from .models import Cue, FixtureGroup, FixturePatch, FixtureState, Scene, Sequence, ShowFile, Transition, TriggerMode
+from .metrics import EngineMetrics, MetricsSnapshot
+from .monitor import UniverseMonitor
+from .models import Cue, FixtureGroup, FixturePatch, FixtureState, Palette, Scene, Sequence, ShowFile, Transition, TriggerMode
 from .output_engine import OutputEngine
+from .palettes import PaletteStore, referenced_palettes
+from .patch_index import AddressRange, PatchIndex
+from .patch_transaction import FixtureSnapshot, PatchConflictError, PatchTransaction, validate_address
 from .scene_engine import SceneEngine
 from .sequence_engine import SequenceEngine
 from .state_manager import EngineStateManager
+from .tracking import TrackingEngine
 
 
 @dataclass(slots=True)
@@ -24,25 +33,45 @@ class _FadeState:
 
 
 class EngineController:
-    def __init__(self, fixtures: list[Fixture], update_manager=None) -> None:
+    def __init__(self, fixtures: list[Fixture], update_manager=None, *, clock: Clock | None = None) -> None:
         self.fixtures = fixtures
+        self.clock = clock or SystemClock()
         self.groups: list[FixtureGroup] = []
+        self.patch_index = PatchIndex(fixtures)
         self.state_manager = EngineStateManager()
+        self.events: EventBus = self.state_manager.events
         self.scene_engine = SceneEngine()
         self.fade_engine = FadeEngine()
-        self.sequence_engine = SequenceEngine()
-        self.output_engine = OutputEngine(fixtures, update_manager) if update_manager is not None else None
+        self.sequence_engine = SequenceEngine(self.clock)
+        self.tracking_engine = TrackingEngine()
+        self.monitor = UniverseMonitor()
+        self.metrics = EngineMetrics()
+        self._outputs: dict[int, OutputEngine] = {}
+        if update_manager is not None:
+            self._outputs[1] = OutputEngine(fixtures, update_manager)
         self._fade_state: _FadeState | None = None
         self._loaded_sequence_id: str | None = None
         self._pending_render = False
+        self._tracking_stale = True
+        self._show_template = ShowFile(fixtures=[])
+        self.events.subscribe(ScenesChanged, self._on_scenes_changed)
+        self.events.subscribe(PalettesChanged, self._on_palettes_changed)
 
     @property
     def state(self):
         return self.state_manager.state
 
+    @property
+    def output_engine(self) -> OutputEngine | None:
+        return next(iter(self._outputs.values()), None)
+
+    @property
+    def output_universes(self) -> list[int]:
+        return sorted(self._outputs)
+
     @property
     def is_output_enabled(self) -> bool:
-        return self.output_engine is not None
+        return bool(self._outputs)
 
     @property
     def loaded_sequence_id(self) -> str | None:
@@ -84,12 +113,35 @@ class EngineController:
     def is_fading(self) -> bool:
         return self._fade_state is not None
 
+    @property
+    def is_idle(self) -> bool:
+        return self._fade_state is None and not self._pending_render
+
+    def next_change_at(self) -> float | None:
+        # While idle, tick() leaves the output alone until the sequence next advances; otherwise the next tick moves it.
+        if not self.is_idle:
+            return self.clock.now()
+        return self.sequence_engine.next_advance_at()
+
+    def attach_output(self, update_manager, *, universe: int = 1) -> None:
+        output = OutputEngine(self.fixtures, update_manager, universe=universe)
+        output.set_master_dimmer(self.state.master_dimmer)
+        self._outputs[universe] = output
+        self._pending_render = True
+        self.events.publish(TransportChanged("output"))
+
+    def scene_names(self) -> dict[str, str]:
+        names = getattr(self.state.scenes, "names", None)
+        if names is not None:
+            return names()
+        return {scene_id: scene.name for scene_id, scene in self.state.scenes.items()}
+
     def build_default_scene(self, name: str = "Scene 1") -> Scene:
         return Scene(id=self._new_id("scene"), name=name, fixture_states={})
 
     def add_scene(self, scene: Scene) -> None:
         normalized_states = self.scene_engine.resolve_scene(scene)
-        self.state_manager.add_scene(Scene(id=scene.id, name=scene.name, fixture_states=normalized_states, notes=scene.notes))
+        self.state_manager.add_scene(Scene(id=scene.id, name=scene.name, fixture_states=normalized_states, notes=scene.notes, palette_id=scene.palette_id))
 
     def create_scene(
         self,
@@ -121,49 +173,49 @@ class EngineController:
         num_channels: int = 5,
         position: tuple[int, int] = (0, 0),
         angle: int = 0,
+        universe: int = 1,
     ) -> Fixture:
-        next_fixture_id = max((fixture.fixture_id for fixture in self.fixtures), default=0) + 1
-        fixture = Fixture(
-            fixture_id=next_fixture_id,
-            start_address=start_address,
-            num_channels=num_channels,
-            position=position,
-            angle=angle,
-        )
-        self.fixtures.append(fixture)
-        if self.output_engine is not None:
-            self.output_engine = OutputEngine(self.fixtures, self.output_engine._update_manager)
-        if self.state.base_output:
-            updated_base = dict(self.state.base_output)
-            updated_base[next_fixture_id] = FixtureState(fixture_id=next_fixture_id)
-            self.state_manager.set_base_output(updated_base, dirty=self.state.dirty)
-        if self.state.current_output:
-            updated_output = dict(self.state.current_output)
-            updated_output[next_fixture_id] = FixtureState(fixture_id=next_fixture_id)
-            self.state_manager.set_output(updated_output, dirty=self.state.dirty)
-        self._pending_render = True
+        with self.bulk_patch(validate=False) as patch:
+            fixture = patch.add(
+                start_address=start_address,
+                num_channels=num_channels,
+                position=position,
+                angle=angle,
+                universe=universe,
+            )
         return fixture
 
+    def remove_fixture(self, fixture_id: int) -> None:
+        with self.bulk_patch(validate=False) as patch:
+            patch.remove(fixture_id)
+
     def duplicate_scene(self, scene_id: str, new_name: str) -> Scene:
         scene = self.state.scenes[scene_id]
+        # The duplicate shares its source's palette or interned block until either one is edited.
         duplicate = Scene(
             id=self._new_id("scene"),
             name=new_name,
-            fixture_states={fixture_id: state.normalized() for fixture_id, state in scene.fixture_states.items()},
+            fixture_states=scene.fixture_states,
             notes=scene.notes,
+            palette_id=scene.palette_id,
         )
-        self.add_scene(duplicate)
+        self.state_manager.add_scene(duplicate)
         return duplicate
 
     def update_scene_states(self, scene_id: str, states: list[FixtureState]) -> Scene:
         scene = self.state.scenes[scene_id]
-        updated_scene = Scene(
-            id=scene.id,
-            name=scene.name,
-            fixture_states={state.fixture_id: state.normalized() for state in states},
-            notes=scene.notes,
+        # Editing a linked scene's states detaches it from its palette (unless they still match); only
+        # update_palette changes every linked scene.
+        self.state_manager.add_scene(
+            Scene(
+                id=scene.id,
+                name=scene.name,
+                fixture_states={state.fixture_id: state.normalized() for state in states},
+                notes=scene.notes,
+                palette_id=scene.palette_id,
+            )
         )
-        self.state_manager.add_scene(updated_scene)
+        updated_scene = self.state.scenes[scene_id]
         if self.state.current_scene_id == scene_id:
             base_output = self.scene_engine.overlay_states(self.get_base_scene_states(), updated_scene.fixture_states)
             self._render_base_states(base_output, dirty=self.state.live_override.active)
@@ -171,12 +223,48 @@ class EngineController:
 
     def rename_scene(self, scene_id: str, name: str) -> None:
         scene = self.state.scenes[scene_id]
-        self.state_manager.add_scene(Scene(id=scene.id, name=name, fixture_states=scene.fixture_states, notes=scene.notes))
+        self.state_manager.add_scene(Scene(id=scene.id, name=name, fixture_states=scene.fixture_states, notes=scene.notes, palette_id=scene.palette_id))
+
+    def create_palette(self, scene_id: str, name: str) -> Palette:
+        scene = self.state.scenes[scene_id]
+        palette = Palette(
+            id=self._new_id("palette"),
+            fixture_states={fixture_id: state.normalized() for fixture_id, state in scene.fixture_states.items()},
+            name=name,
+        )
+        self.state_manager.add_palette(palette)
+        self.state_manager.add_scene(Scene(id=scene.id, name=scene.name, fixture_states=palette.fixture_states, notes=scene.notes, palette_id=palette.id))
+        return palette
+
+    def link_scene_palette(self, scene_id: str, palette_id: str | None) -> Scene:
+        scene = self.state.scenes[scene_id]
+        if palette_id is None:
+            # Unlinking moves the scene onto an interned copy of the palette's states, so later palette edits no longer reach it.
+            linked = Scene(id=scene.id, name=scene.name, fixture_states=scene.fixture_states, notes=scene.notes)
+        else:
+            palette = self.state.palettes.get(palette_id)
+            if palette is None:
+                raise KeyError(palette_id)
+            linked = Scene(id=scene.id, name=scene.name, fixture_states=palette.fixture_states, notes=scene.notes, palette_id=palette_id)
+        self.state_manager.add_scene(linked)
+        linked = self.state.scenes[scene_id]
+        if self.state.current_scene_id == scene_id:
+            base_output = self.scene_engine.overlay_states(self.get_base_scene_states(), linked.fixture_states)
+            self._render_base_states(base_output, dirty=self.state.live_override.active)
+        return linked
+
+    def update_palette(self, palette_id: str, states: list[FixtureState], *, name: str | None = None) -> Palette:
+        palette = self.state_manager.update_palette(palette_id, {state.fixture_id: state for state in states}, name=name)
+        current_scene_id = self.state.current_scene_id
+        if current_scene_id is not None and self.state.scenes[current_scene_id].palette_id == palette_id:
+            base_output = self.scene_engine.overlay_states(self.get_base_scene_states(), palette.fixture_states)
+            self._render_base_states(base_output, dirty=self.state.live_override.active)
+        return palette
 
     def delete_scene(self, scene_id: str) -> None:
         if scene_id not in self.state.scenes:
             return
-        del self.state.scenes[scene_id]
+        self.state_manager.remove_scene(scene_id)
         if self.state.current_scene_id == scene_id:
             replacement = next(iter(self.state.scenes), None)
             self.state_manager.set_current_scene(replacement)
@@ -191,24 +279,13 @@ class EngineController:
 
     def apply_scene(self, scene_id: str, fade_ms: int = 0) -> None:
         target_scene = self.state.scenes[scene_id]
-        target_states = self._scene_to_base_output(target_scene)
-        if fade_ms > 0:
-            self._fade_state = _FadeState(
-                started_at=time.time(),
-                duration_ms=fade_ms,
-                start_states=self.get_live_output_states(),
-                end_states=target_states,
-                destination_scene_id=scene_id,
-            )
-        else:
-            self.state_manager.set_current_scene(scene_id)
-            self._fade_state = None
-            self._render_base_states(target_states, dirty=self.state.live_override.active)
+        self._transition_to(self._scene_to_base_output(target_scene), scene_id, fade_ms)
 
     def set_master_dimmer(self, value: float) -> None:
         self.state_manager.set_master_dimmer(value)
-        if self.output_engine is not None:
-            self.output_engine.set_master_dimmer(self.state.master_dimmer)
+        for output in self._outputs.values():
+            output.set_master_dimmer(self.state.master_dimmer)
+        if self._outputs:
             self._pending_render = True
 
     def set_blackout(self, enabled: bool) -> None:
@@ -241,11 +318,17 @@ class EngineController:
 
     def rename_sequence(self, sequence_id: str, name: str) -> None:
         sequence = self.state.sequences[sequence_id]
-        self._store_sequence(Sequence(id=sequence.id, name=name, cues=sequence.cues, notes=sequence.notes, cyclic=sequence.cyclic))
+        self._store_sequence(Sequence(id=sequence.id, name=name, cues=sequence.cues, notes=sequence.notes, cyclic=sequence.cyclic, tracking=sequence.tracking))
 
     def set_sequence_cyclic(self, sequence_id: str, cyclic: bool) -> Sequence:
         sequence = self.state.sequences[sequence_id]
-        updated = Sequence(id=sequence.id, name=sequence.name, cues=sequence.cues, notes=sequence.notes, cyclic=cyclic)
+        updated = Sequence(id=sequence.id, name=sequence.name, cues=sequence.cues, notes=sequence.notes, cyclic=cyclic, tracking=sequence.tracking)
+        self._store_sequence(updated)
+        return updated
+
+    def set_sequence_tracking(self, sequence_id: str, tracking: bool) -> Sequence:
+        sequence = self.state.sequences[sequence_id]
+        updated = Sequence(id=sequence.id, name=sequence.name, cues=sequence.cues, notes=sequence.notes, cyclic=sequence.cyclic, tracking=tracking)
         self._store_sequence(updated)
         return updated
 
@@ -265,10 +348,34 @@ class EngineController:
             transition=Transition(fade_in_ms=fade_in_ms, hold_ms=hold_ms),
             trigger_mode=trigger_mode,
         )
-        updated = Sequence(id=sequence.id, name=sequence.name, cues=[*sequence.cues, cue], notes=sequence.notes, cyclic=sequence.cyclic)
+        updated = Sequence(
+            id=sequence.id,
+            name=sequence.name,
+            cues=[*sequence.cues, cue],
+            notes=sequence.notes,
+            cyclic=sequence.cyclic,
+            tracking=sequence.tracking,
+        )
         self._store_sequence(updated)
         return updated
 
+    def record_tracking_cue(
+        self,
+        sequence_id: str,
+        name: str,
+        *,
+        fade_in_ms: int = 0,
+        hold_ms: int = 0,
+        trigger_mode: TriggerMode = TriggerMode.MANUAL,
+    ) -> Sequence:
+        sequence = self.state.sequences[sequence_id]
+        tracker = TrackingEngine()
+        tracker.build(sequence, self.state.scenes)
+        changes = tracker.diff(tracker.final_state(), self.get_live_output_states())
+        scene = Scene(id=self._new_id("scene"), name=name, fixture_states=changes)
+        self.add_scene(scene)
+        return self.add_cue_to_sequence(sequence_id, scene.id, fade_in_ms=fade_in_ms, hold_ms=hold_ms, trigger_mode=trigger_mode)
+
     def remove_cue_from_sequence(self, sequence_id: str, cue_id: str) -> Sequence:
         sequence = self.state.sequences[sequence_id]
         updated = Sequence(
@@ -277,6 +384,7 @@ class EngineController:
             cues=[cue for cue in sequence.cues if cue.id != cue_id],
             notes=sequence.notes,
             cyclic=sequence.cyclic,
+            tracking=sequence.tracking,
         )
         self._store_sequence(updated)
         return updated
@@ -284,64 +392,93 @@ class EngineController:
     def load_sequence(self, sequence_id: str) -> None:
         self._loaded_sequence_id = sequence_id
         self.sequence_engine.load(self.state.sequences[sequence_id])
+        self.events.publish(TransportChanged("sequence"))
+        self._publish_cue_advanced()
 
     def pause_sequence(self) -> None:
         self.sequence_engine.pause()
+        self.events.publish(TransportChanged("pause"))
 
     def resume_sequence(self) -> None:
         self.sequence_engine.resume()
+        self.events.publish(TransportChanged("pause"))
 
     def set_rhythm_bpm(self, bpm: float) -> None:
         self.sequence_engine.set_rhythm_bpm(bpm)
+        self.events.publish(TransportChanged("rhythm"))
 
     def start_rhythm_play(self) -> Cue | None:
         cue = self.sequence_engine.start_rhythm()
+        self.events.publish(TransportChanged("rhythm"))
         if cue is not None:
-            self.apply_scene(cue.scene_id, fade_ms=cue.transition.fade_in_ms)
+            self._play_cue(cue)
         return cue
 
     def stop_rhythm_play(self) -> None:
         self.sequence_engine.stop_rhythm()
+        self.events.publish(TransportChanged("rhythm"))
 
     def go_next_cue(self) -> Cue | None:
         cue = self.sequence_engine.go()
         if cue is None:
             return None
-        self.apply_scene(cue.scene_id, fade_ms=cue.transition.fade_in_ms)
+        self._play_cue(cue)
         return cue
 
+    def go_to_cue(self, cue_id: str, *, fade_ms: int | None = None) -> Cue | None:
+        return self._jump(self.sequence_engine.goto_cue_id(cue_id), fade_ms)
+
+    def go_to_cue_number(self, cue_number: int, *, fade_ms: int | None = None) -> Cue | None:
+        return self._jump(self.sequence_engine.goto_cue_number(cue_number), fade_ms)
+
     def go_previous_cue(self) -> Cue | None:
         cue = self.sequence_engine.back()
         if cue is None:
             return None
-        self.apply_scene(cue.scene_id, fade_ms=cue.transition.fade_in_ms)
+        self._play_cue(cue)
         return cue
 
+    def metrics_snapshot(self) -> MetricsSnapshot:
+        return self.metrics.snapshot()
+
     def tick(self) -> tuple[bool, list[int] | None] | None:
-        auto_cue = self.sequence_engine.poll_auto_advance()
-        if auto_cue is not None:
-            self.apply_scene(auto_cue.scene_id, fade_ms=auto_cue.transition.fade_in_ms)
+        started = time.perf_counter()
+        try:
+            return self._advance()
+        finally:
+            self.metrics.record_tick(time.perf_counter() - started)
+
+    def _advance(self) -> tuple[bool, list[int] | None] | None:
+        self._poll_sequence()
 
         if self._fade_state is not None:
-            elapsed_ms = int((time.time() - self._fade_state.started_at) * 1000)
+            elapsed_ms = int((self.clock.now() - self._fade_state.started_at) * 1000)
             progress = 1.0 if self._fade_state.duration_ms <= 0 else elapsed_ms / self._fade_state.duration_ms
-            blended = self.fade_engine.interpolate(
+            blended = self.fade_engine.blend(
                 self._fade_state.start_states,
                 self._fade_state.end_states,
                 progress,
             )
-            self._render_base_states(blended, dirty=self.state.live_override.active)
+            self._render_base_changes(blended, dirty=self.state.live_override.active, normalized=True)
             if progress >= 1.0:
                 if self._fade_state.destination_scene_id is not None:
                     self.state_manager.set_current_scene(self._fade_state.destination_scene_id)
                 self._fade_state = None
-        elif self._pending_render:
+                self.events.publish(TransportChanged("fade"))
+        if self._pending_render:
             self._queue_output(self.get_effective_live_states())
             self._pending_render = False
 
-        if self.output_engine is not None:
-            return self.output_engine.flush()
-        return None
+        result = None
+        for output in self._outputs.values():
+            flush_started = time.perf_counter()
+            sent, frame = output.flush()
+            if sent:
+                self.metrics.record_frame(time.perf_counter() - flush_started)
+                self.monitor.record(output.universe, frame)
+            if result is None:
+                result = sent, frame
+        return result
 
     def get_live_output_states(self) -> dict[int, FixtureState]:
         if self.state.current_output:
@@ -354,9 +491,9 @@ class EngineController:
         return self._zero_states()
 
     def get_effective_live_states(self) -> dict[int, FixtureState]:
-        return self.scene_engine.merge_override(self.get_base_scene_states(), self.state.live_override)
+        return self.scene_engine.merge_override(self._normalized_base(), self.state.live_override)
 
-    def build_show_file(self) -> ShowFile:
+    def build_show_file(self, *, scenes: list[Scene] | MutableMapping[str, Scene] | None = None) -> ShowFile:
         fixture_patches = [
             FixturePatch(
                 fixture_id=fixture.fixture_id,
@@ -364,14 +501,23 @@ class EngineController:
                 num_channels=fixture.num_channels,
                 position=fixture.position,
                 angle=fixture.angle,
+                universe=fixture.universe,
             )
             for fixture in self.fixtures
         ]
-        scenes = list(self.state.scenes.values())
+        snapshot = getattr(self.state.scenes, "snapshot", None)
+        if scenes is None:
+            # A lazy library is handed over unmaterialised, so savers only decode the scenes they need.
+            scenes = snapshot() if snapshot is not None else list(self.state.scenes.values())
         sequences = list(self.state.sequences.values())
-        return ShowFile(fixtures=fixture_patches, groups=self.groups, scenes=scenes, sequences=sequences)
+        palettes = self.state.palettes.values() + self.state.palettes.blocks()
+        if not isinstance(scenes, MutableMapping):
+            palettes = referenced_palettes(palettes, scenes)
+        return replace(self._show_template, fixtures=fixture_patches, groups=self.groups, scenes=scenes, sequences=sequences, palettes=palettes)
 
     def load_show_file(self, show_file: ShowFile) -> None:
+        # The show is rebuilt with the loaded file's own type and extra fields, so a partial load saves as one.
+        self._show_template = replace(show_file, fixtures=[], groups=[], scenes=[], sequences=[], palettes=[])
         self.fixtures[:] = [
             Fixture(
                 fixture_id=patch.fixture_id,
@@ -379,24 +525,32 @@ class EngineController:
                 num_channels=patch.num_channels,
                 position=patch.position,
                 angle=patch.angle,
+                universe=patch.universe,
             )
             for patch in show_file.fixtures
         ]
+        self.patch_index.rebuild(self.fixtures)
         self.groups = list(show_file.groups)
-        self.state.scenes.clear()
-        self.state.sequences.clear()
-        for scene in show_file.scenes:
-            self.add_scene(scene)
+        self.state_manager.clear_library()
+        palettes = PaletteStore(show_file.palettes)
+        if isinstance(show_file.scenes, MutableMapping):
+            self.state_manager.replace_scenes(show_file.scenes, palettes)
+        else:
+            self.state_manager.replace_scenes({scene.id: scene for scene in show_file.scenes}, palettes)
         for sequence in show_file.sequences:
             self._store_sequence(sequence)
         self._loaded_sequence_id = None
-        if self.output_engine is not None:
-            self.output_engine = OutputEngine(self.fixtures, self.output_engine._update_manager)
+        self.events.publish(TransportChanged("sequence"))
+        self._outputs = {
+            universe: OutputEngine(self.fixtures, output._update_manager, universe=universe)
+            for universe, output in self._outputs.items()
+        }
         first_scene_id = next(iter(self.state.scenes), None)
         self.state_manager.set_current_scene(first_scene_id)
         self.state_manager.clear_override()
         if first_scene_id is not None:
             self._render_base_states(self._scene_to_base_output(self.state.scenes[first_scene_id]), dirty=False)
+        self.events.publish(PatchChanged(frozenset(fixture.fixture_id for fixture in self.fixtures)))
 
     def update_fixture_patch(
         self,
@@ -406,28 +560,178 @@ class EngineController:
         num_channels: int | None = None,
         position: tuple[int, int] | None = None,
         angle: int | None = None,
+        universe: int | None = None,
     ) -> None:
-        fixture = self._fixture_by_id(fixture_id)
-        requires_output_rebuild = False
-        if start_address is not None:
-            requires_output_rebuild = requires_output_rebuild or start_address != fixture.start_address
-            fixture.start_address = start_address
-        if num_channels is not None:
-            requires_output_rebuild = requires_output_rebuild or num_channels != fixture.num_channels
-            fixture.num_channels = num_channels
-        if position is not None:
-            fixture.position = position
-        if angle is not None:
-            fixture.angle = angle
-        if requires_output_rebuild and self.output_engine is not None:
-            self.output_engine = OutputEngine(self.fixtures, self.output_engine._update_manager)
+        with self.bulk_patch(validate=False) as patch:
+            patch.readdress(fixture_id, start_address=start_address, num_channels=num_channels, universe=universe)
+            patch.move(fixture_id, position=position, angle=angle)
+
+    def bulk_patch(self, *, validate: bool = True) -> PatchTransaction:
+        return PatchTransaction(self, validate=validate)
+
+    def apply_patch_transaction(self, transaction: PatchTransaction) -> None:
+        index = self.patch_index
+        removed = [index.get(fixture_id) for fixture_id in transaction.removed]
+        snapshots: dict[int, FixtureSnapshot] = {}
+        released_ranges = [AddressRange.of(fixture) for fixture in removed]
+        readdressed: list[Fixture] = []
+        for fixture in removed:
+            index.remove(fixture.fixture_id)
+        for fixture_id, changes in transaction.updates.items():
+            fixture = index.get(fixture_id)
+            snapshots[fixture_id] = FixtureSnapshot.of(fixture)
+            previous_range = AddressRange.of(fixture)
+            for name, value in changes.items():
+                setattr(fixture, name, value)
+            if AddressRange.of(fixture) != previous_range:
+                released_ranges.append(previous_range)
+                readdressed.append(fixture)
+                index.reindex(fixture)
+        added = list(transaction.added.values())
+        for fixture in added:
+            index.add(fixture)
+
+        if transaction.validate:
+            try:
+                self._validate_patch(added + readdressed)
+            except ValueError:
+                for fixture in added:
+                    index.remove(fixture.fixture_id)
+                for fixture_id, snapshot in snapshots.items():
+                    snapshot.restore(index.get(fixture_id))
+                    index.reindex(index.get(fixture_id))
+                for fixture in removed:
+                    index.add(fixture)
+                raise
+
+        removed_ids = {fixture.fixture_id for fixture in removed}
+        if removed_ids:
+            self.fixtures[:] = [fixture for fixture in self.fixtures if fixture.fixture_id not in removed_ids]
+        self.fixtures.extend(added)
+
+        for output in self._outputs.values():
+            for fixture_id in removed_ids:
+                output.remove_fixture(fixture_id)
+            for fixture in readdressed:
+                output.update_fixture(fixture)
+            for fixture in added:
+                output.add_fixture(fixture)
+            for address_range in released_ranges:
+                output.release_channels(address_range.universe, address_range.start, address_range.end - address_range.start + 1)
+
+        if added or removed_ids:
+            if self.state.base_output:
+                updated_base = {fixture_id: state for fixture_id, state in self.state.base_output.items() if fixture_id not in removed_ids}
+                updated_base.update({fixture.fixture_id: FixtureState(fixture_id=fixture.fixture_id) for fixture in added})
+                self.state_manager.set_base_output(updated_base, dirty=self.state.dirty)
+            if self.state.current_output:
+                updated_output = {fixture_id: state for fixture_id, state in self.state.current_output.items() if fixture_id not in removed_ids}
+                updated_output.update({fixture.fixture_id: FixtureState(fixture_id=fixture.fixture_id) for fixture in added})
+                self.state_manager.set_output(updated_output, dirty=self.state.dirty)
         self._pending_render = True
+        touched_ids = removed_ids | set(transaction.updates) | {fixture.fixture_id for fixture in added}
+        if touched_ids:
+            self.events.publish(PatchChanged(frozenset(touched_ids)))
+
+    def _poll_sequence(self) -> None:
+        was_rhythm_playing = self.sequence_engine.is_rhythm_enabled
+        auto_cue = self.sequence_engine.poll_auto_advance()
+        if auto_cue is not None:
+            self._play_cue(auto_cue)
+        if was_rhythm_playing != self.sequence_engine.is_rhythm_enabled:
+            self.events.publish(TransportChanged("rhythm"))
+
+    def _jump(self, cue: Cue | None, fade_ms: int | None) -> Cue | None:
+        if cue is None:
+            return None
+        self._play_cue(cue, fade_ms=fade_ms)
+        return cue
+
+    def _play_cue(self, cue: Cue, *, fade_ms: int | None = None) -> None:
+        if fade_ms is None:
+            fade_ms = cue.transition.fade_in_ms
+        sequence = self.loaded_sequence
+        if sequence is not None and sequence.tracking:
+            if self._tracking_stale or self.tracking_engine.sequence is not sequence:
+                self.tracking_engine.build(sequence, self.state.scenes)
+                self._tracking_stale = False
+            tracked_states = self.tracking_engine.tracked_state(self.sequence_engine.cue_index)
+            target_states = self.scene_engine.overlay_states(self.get_base_scene_states(), tracked_states)
+            self._transition_to(target_states, cue.scene_id, fade_ms)
+        else:
+            self.apply_scene(cue.scene_id, fade_ms=fade_ms)
+        self._publish_cue_advanced()
+
+    def _transition_to(self, target_states: dict[int, FixtureState], scene_id: str | None, fade_ms: int) -> None:
+        was_fading = self._fade_state is not None
+        start_states = self._normalized_base()
+        target_states = {fixture_id: state.normalized() for fixture_id, state in target_states.items()}
+        moving_ids = frozenset(
+            fixture_id
+            for fixture_id, state in target_states.items()
+            if start_states.get(fixture_id) != state
+        )
+        if fade_ms > 0 and moving_ids:
+            self._fade_state = _FadeState(
+                started_at=self.clock.now(),
+                duration_ms=fade_ms,
+                start_states={fixture_id: start_states.get(fixture_id, FixtureState(fixture_id=fixture_id)) for fixture_id in moving_ids},
+                end_states={fixture_id: target_states[fixture_id] for fixture_id in moving_ids},
+                destination_scene_id=scene_id,
+            )
+        else:
+            if scene_id is not None:
+                self.state_manager.set_current_scene(scene_id)
+            self._fade_state = None
+            if moving_ids or not self.state.base_output:
+                self._render_base_changes({fixture_id: target_states[fixture_id] for fixture_id in moving_ids}, dirty=self.state.live_override.active)
+        if was_fading != (self._fade_state is not None):
+            self.events.publish(TransportChanged("fade"))
+
+    def _on_scenes_changed(self, event: ScenesChanged) -> None:
+        sequence = self.loaded_sequence
+        if sequence is not None and sequence.tracking and any(cue.scene_id in event.scene_ids for cue in sequence.cues):
+            self._tracking_stale = True
+
+    def _on_palettes_changed(self, event: PalettesChanged) -> None:
+        if self.loaded_sequence is not None and self.loaded_sequence.tracking:
+            self._tracking_stale = True
+
+    def _publish_cue_advanced(self) -> None:
+        cue = self.sequence_engine.current_cue
+        self.events.publish(CueAdvanced(self._loaded_sequence_id, cue.id if cue is not None else None, self.current_cue_number))
+
+    def find_patch_conflicts(
+        self,
+        start_address: int,
+        num_channels: int,
+        *,
+        universe: int = 1,
+        exclude_fixture_id: int | None = None,
+    ) -> list[int]:
+        return self.patch_index.overlapping(start_address, num_channels, universe=universe, exclude_fixture_id=exclude_fixture_id)
+
+    def find_free_address(self, num_channels: int, *, universe: int | None = None) -> tuple[int, int] | None:
+        return self.patch_index.find_free_block(num_channels, universe=universe)
 
     def _render_live_states(self, states: dict[int, FixtureState], *, dirty: bool) -> None:
         normalized = {fixture_id: state.normalized() for fixture_id, state in states.items()}
         self.state_manager.set_output(normalized, dirty=dirty)
         self._queue_output(normalized)
 
+    def _render_base_changes(self, changes: dict[int, FixtureState], *, dirty: bool, normalized: bool = False) -> None:
+        if not normalized:
+            changes = {fixture_id: state.normalized() for fixture_id, state in changes.items()}
+        base_output = self._normalized_base()
+        base_output.update(changes)
+        self.state_manager.set_base_output(base_output, dirty=dirty, changed_ids=changes.keys())
+        if self.state.live_override.active:
+            effective = self.scene_engine.merge_override(base_output, self.state.live_override)
+            self.state_manager.set_output(effective, dirty=True, changed_ids=changes.keys())
+            self._queue_output({fixture_id: effective[fixture_id] for fixture_id in changes})
+        else:
+            self._queue_output(changes)
+
     def _render_base_states(self, states: dict[int, FixtureState], *, dirty: bool) -> None:
         normalized = {fixture_id: state.normalized() for fixture_id, state in states.items()}
         self.state_manager.set_base_output(normalized, dirty=dirty)
@@ -437,19 +741,32 @@ class EngineController:
         self._queue_output(effective)
 
     def _queue_output(self, states: dict[int, FixtureState]) -> None:
-        if self.output_engine is None:
+        if not self._outputs:
             return
         if self.state.blackout:
-            zeroed = {fixture.fixture_id: FixtureState(fixture_id=fixture.fixture_id) for fixture in self.fixtures}
-            self.output_engine.render(zeroed)
-        else:
-            self.output_engine.render(states)
+            states = {fixture.fixture_id: FixtureState(fixture_id=fixture.fixture_id) for fixture in self.fixtures}
+        for output in self._outputs.values():
+            output.render(states)
+
+    def _validate_patch(self, fixtures: list[Fixture]) -> None:
+        conflicts: list[tuple[int, int]] = []
+        for fixture in fixtures:
+            validate_address(fixture)
+            conflicts.extend(
+                (fixture.fixture_id, other_id)
+                for other_id in self.patch_index.overlapping(
+                    fixture.start_address,
+                    fixture.num_channels,
+                    universe=fixture.universe,
+                    exclude_fixture_id=fixture.fixture_id,
+                )
+            )
+        if conflicts:
+            fixture_id, other_id = conflicts[0]
+            raise PatchConflictError(f"Fixture {fixture_id} overlaps fixture {other_id}.", conflicts)
 
     def _fixture_by_id(self, fixture_id: int) -> Fixture:
-        for fixture in self.fixtures:
-            if fixture.fixture_id == fixture_id:
-                return fixture
-        raise KeyError(f"Unknown fixture id: {fixture_id}")
+        return self.patch_index.get(fixture_id)
 
     def _store_sequence(self, sequence: Sequence) -> None:
         self.state_manager.set_sequence(sequence)
@@ -459,6 +776,12 @@ class EngineController:
     def _scene_to_base_output(self, scene: Scene) -> dict[int, FixtureState]:
         return self.scene_engine.overlay_states(self.get_base_scene_states(), self.scene_engine.resolve_scene(scene))
 
+    def _normalized_base(self) -> dict[int, FixtureState]:
+        # base_output is only ever written with normalized states, so a shallow copy stands in for get_base_scene_states().
+        if self.state.base_output:
+            return dict(self.state.base_output)
+        return self._zero_states()
+
     def _zero_states(self) -> dict[int, FixtureState]:
         return {
             fixture.fixture_id: FixtureState(fixture_id=fixture.fixture_id)
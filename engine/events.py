@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+
+@dataclass(frozen=True, slots=True)
+class EngineEvent:
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class SceneChanged(EngineEvent):
+    scene_id: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class ScenesChanged(EngineEvent):
+    scene_ids: frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
+class PalettesChanged(EngineEvent):
+    palette_ids: frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
+class SequencesChanged(EngineEvent):
+    sequence_ids: frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
+class OutputChanged(EngineEvent):
+    fixture_ids: frozenset[int]
+
+
+@dataclass(frozen=True, slots=True)
+class CueAdvanced(EngineEvent):
+    sequence_id: str | None
+    cue_id: str | None
+    cue_number: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class OverrideToggled(EngineEvent):
+    active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class TransportChanged(EngineEvent):
+    reason: str
+
+
+@dataclass(frozen=True, slots=True)
+class PatchChanged(EngineEvent):
+    fixture_ids: frozenset[int]
+
+
+EventT = TypeVar("EventT", bound=EngineEvent)
+
+
+class EventBus:
+    def __init__(self) -> None:
+        self._subscribers: dict[type[EngineEvent], list[Callable[[EngineEvent], None]]] = defaultdict(list)
+
+    def subscribe(self, event_type: type[EventT], callback: Callable[[EventT], None]) -> Callable[[], None]:
+        self._subscribers[event_type].append(callback)
+
+        def unsubscribe() -> None:
+            callbacks = self._subscribers.get(event_type)
+            if callbacks is not None and callback in callbacks:
+                callbacks.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, event: EngineEvent) -> None:
+        for event_type in type(event).__mro__:
+            callbacks = self._subscribers.get(event_type)
+            if callbacks:
+                for callback in list(callbacks):
+                    callback(event)
+            if event_type is EngineEvent:
+                break
@@ -26,4 +26,25 @@ class FadeEngine:
                 white=round(start.white + (end.white - start.white) * clamped_progress),
             ).normalized()
 
-        return blended
\ No newline at end of file
+        return blended
+
+    def blend(
+        self,
+        start_states: dict[int, FixtureState],
+        end_states: dict[int, FixtureState],
+        progress: float,
+    ) -> dict[int, FixtureState]:
+        # Both sides are already normalized and cover the same fixtures, so every blended value stays in range.
+        clamped_progress = max(0.0, min(1.0, progress))
+        blended: dict[int, FixtureState] = {}
+        for fixture_id, start in start_states.items():
+            end = end_states[fixture_id]
+            blended[fixture_id] = FixtureState(
+                fixture_id,
+                round(start.intensity + (end.intensity - start.intensity) * clamped_progress),
+                round(start.red + (end.red - start.red) * clamped_progress),
+                round(start.green + (end.green - start.green) * clamped_progress),
+                round(start.blue + (end.blue - start.blue) * clamped_progress),
+                round(start.white + (end.white - start.white) * clamped_progress),
+            )
+        return blended
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import struct
+from multiprocessing import shared_memory
+
+DEFAULT_RING_SLOTS = 64
+
+_RING_HEADER = struct.Struct("<QII")
+_SLOT_HEADER = struct.Struct("<QI")
+
+
+class SharedRing:
+    def __init__(self, slot_size: int = 0, slots: int = DEFAULT_RING_SLOTS, *, name: str | None = None) -> None:
+        if name is None:
+            if slot_size <= 0 or slots <= 0:
+                raise ValueError("A shared ring needs a positive slot size and slot count.")
+            self._memory = shared_memory.SharedMemory(create=True, size=_RING_HEADER.size + slots * (_SLOT_HEADER.size + slot_size))
+            _RING_HEADER.pack_into(self._memory.buf, 0, 0, slot_size, slots)
+            self._owner = True
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self._written, self.slot_size, self.slots = _RING_HEADER.unpack_from(self._memory.buf, 0)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def latest_sequence(self) -> int:
+        return _RING_HEADER.unpack_from(self._memory.buf, 0)[0]
+
+    def write(self, payload: bytes) -> int:
+        if len(payload) > self.slot_size:
+            raise ValueError(f"Payload of {len(payload)} bytes does not fit a {self.slot_size}-byte slot.")
+        buffer = self._memory.buf
+        sequence = self._written + 1
+        offset = self._slot_offset(sequence)
+        # Zero the slot's sequence first so a reader racing this write discards the slot instead of tearing it.
+        _SLOT_HEADER.pack_into(buffer, offset, 0, len(payload))
+        start = offset + _SLOT_HEADER.size
+        buffer[start:start + len(payload)] = payload
+        _SLOT_HEADER.pack_into(buffer, offset, sequence, len(payload))
+        struct.pack_into("<Q", buffer, 0, sequence)
+        self._written = sequence
+        return sequence
+
+    def read_since(self, sequence: int) -> tuple[int, list[bytes]]:
+        latest = self.latest_sequence
+        payloads = []
+        for candidate in range(max(sequence + 1, latest - self.slots + 1), latest + 1):
+            payload = self._read_slot(candidate)
+            if payload is not None:
+                payloads.append(payload)
+        return latest, payloads
+
+    def read_latest(self) -> tuple[int, bytes | None]:
+        latest = self.latest_sequence
+        return latest, self._read_slot(latest) if latest else None
+
+    def close(self) -> None:
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def _read_slot(self, sequence: int) -> bytes | None:
+        buffer = self._memory.buf
+        offset = self._slot_offset(sequence)
+        slot_sequence, length = _SLOT_HEADER.unpack_from(buffer, offset)
+        if slot_sequence != sequence:
+            return None
+        start = offset + _SLOT_HEADER.size
+        payload = bytes(buffer[start:start + length])
+        if _SLOT_HEADER.unpack_from(buffer, offset)[0] != sequence:
+            return None
+        return payload
+
+    def _slot_offset(self, sequence: int) -> int:
+        return _RING_HEADER.size + (sequence % self.slots) * (_SLOT_HEADER.size + self.slot_size)
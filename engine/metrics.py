@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+
+DEFAULT_METRIC_SAMPLES = 256
+DEFAULT_FRAME_BUDGET_MS = 25.0
+FPS_WINDOW_SECONDS = 1.0
+
+
+class MetricRing:
+    def __init__(self, size: int = DEFAULT_METRIC_SAMPLES) -> None:
+        if size <= 0:
+            raise ValueError("A metric ring needs at least one sample.")
+        self._values = array("d", bytes(8 * size))
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, len(self._values))
+
+    def add(self, value: float) -> None:
+        self._values[self._count % len(self._values)] = value
+        self._count += 1
+
+    def values(self) -> list[float]:
+        size = len(self._values)
+        if self._count <= size:
+            return self._values[:self._count].tolist()
+        start = self._count % size
+        return self._values[start:].tolist() + self._values[:start].tolist()
+
+
+@dataclass(slots=True)
+class MetricsSnapshot:
+    budget_ms: float
+    output_fps: float = 0.0
+    tick_p50_ms: float | None = None
+    tick_p95_ms: float | None = None
+    tick_max_ms: float | None = None
+    send_p95_ms: float | None = None
+    refresh_p95_ms: float | None = None
+    queue_depth: int = 0
+    alerts: list[str] = field(default_factory=list)
+
+
+class EngineMetrics:
+    def __init__(self, *, samples: int = DEFAULT_METRIC_SAMPLES, budget_ms: float = DEFAULT_FRAME_BUDGET_MS) -> None:
+        self.budget_ms = budget_ms
+        self._lock = threading.Lock()
+        self._tick_ms = MetricRing(samples)
+        self._send_ms = MetricRing(samples)
+        self._refresh_ms = MetricRing(samples)
+        self._frame_times = MetricRing(samples)
+        self._queue_depth = 0
+
+    def record_tick(self, seconds: float) -> None:
+        with self._lock:
+            self._tick_ms.add(seconds * 1000)
+
+    def record_frame(self, send_seconds: float, *, sent_at: float | None = None) -> None:
+        with self._lock:
+            self._send_ms.add(send_seconds * 1000)
+            self._frame_times.add(time.monotonic() if sent_at is None else sent_at)
+
+    def record_refresh(self, seconds: float) -> None:
+        with self._lock:
+            self._refresh_ms.add(seconds * 1000)
+
+    def record_queue_depth(self, depth: int) -> None:
+        self._queue_depth = depth
+
+    def snapshot(self, *, now: float | None = None) -> MetricsSnapshot:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            ticks = sorted(self._tick_ms.values())
+            sends = sorted(self._send_ms.values())
+            refreshes = sorted(self._refresh_ms.values())
+            frame_times = self._frame_times.values()
+        snapshot = MetricsSnapshot(
+            budget_ms=self.budget_ms,
+            output_fps=sum(1 for sent_at in frame_times if now - sent_at <= FPS_WINDOW_SECONDS) / FPS_WINDOW_SECONDS,
+            tick_p50_ms=_percentile(ticks, 0.50),
+            tick_p95_ms=_percentile(ticks, 0.95),
+            tick_max_ms=ticks[-1] if ticks else None,
+            send_p95_ms=_percentile(sends, 0.95),
+            refresh_p95_ms=_percentile(refreshes, 0.95),
+            queue_depth=self._queue_depth,
+        )
+        snapshot.alerts = budget_alerts(snapshot)
+        return snapshot
+
+
+def budget_alerts(snapshot: MetricsSnapshot) -> list[str]:
+    alerts = []
+    for label, value in (
+        ("Engine tick", snapshot.tick_p95_ms),
+        ("DMX send", snapshot.send_p95_ms),
+        ("GUI refresh", snapshot.refresh_p95_ms),
+    ):
+        if value is not None and value > snapshot.budget_ms:
+            alerts.append(f"{label} p95 {value:.1f} ms exceeds the {snapshot.budget_ms:.0f} ms frame budget")
+    if snapshot.queue_depth > 1:
+        alerts.append(f"{snapshot.queue_depth} commands waiting for the engine")
+    return alerts
+
+
+def _percentile(ordered: list[float], fraction: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
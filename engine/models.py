@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -47,6 +48,7 @@ class FixturePatch:
     num_channels: int
     position: tuple[int, int] = (0, 0)
     angle: int = 0
+    universe: int = 1
 
 
 @dataclass(slots=True)
@@ -56,12 +58,20 @@ class Transition:
     hold_ms: int = 0
 
 
+@dataclass(slots=True)
+class Palette:
+    id: str
+    fixture_states: dict[int, FixtureState] = field(default_factory=dict)
+    name: str = ""
+
+
 @dataclass(slots=True)
 class Scene:
     id: str
     name: str
     fixture_states: dict[int, FixtureState] = field(default_factory=dict)
     notes: str = ""
+    palette_id: str | None = None
 
     def with_updates(self, states: list[FixtureState]) -> "Scene":
         updated_states = dict(self.fixture_states)
@@ -86,6 +96,7 @@ class Sequence:
     cues: list[Cue] = field(default_factory=list)
     notes: str = ""
     cyclic: bool = False
+    tracking: bool = False
 
 
 @dataclass(slots=True)
@@ -107,6 +118,7 @@ class LiveOverride:
 class ShowFile:
     fixtures: list[FixturePatch]
     groups: list[FixtureGroup] = field(default_factory=list)
-    scenes: list[Scene] = field(default_factory=list)
+    scenes: list[Scene] | MutableMapping[str, Scene] = field(default_factory=list)
     sequences: list[Sequence] = field(default_factory=list)
-    schema_version: int = 1
\ No newline at end of file
+    schema_version: int = 1
+    palettes: list[Palette] = field(default_factory=list)
\ No newline at end of file
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Sequence
+
+from fixture import Fixture
+
+from .models import FixtureState
+from .output_engine import fixture_channel_values
+
+DMX_UNIVERSE_SIZE = 512
+
+
+class UniverseMonitor:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._frames: dict[int, bytes] = {}
+        self._frame_counts: dict[int, int] = {}
+
+    def record(self, universe: int, values: Sequence[int]) -> None:
+        frame = bytes(values[:DMX_UNIVERSE_SIZE])
+        with self._lock:
+            self._frames[universe] = frame
+            self._frame_counts[universe] = self._frame_counts.get(universe, 0) + 1
+
+    def frame(self, universe: int) -> bytes | None:
+        with self._lock:
+            return self._frames.get(universe)
+
+    def frame_count(self, universe: int) -> int:
+        with self._lock:
+            return self._frame_counts.get(universe, 0)
+
+    def universes(self) -> list[int]:
+        with self._lock:
+            return sorted(self._frames)
+
+
+def compose_frame(
+    fixtures: Iterable[Fixture],
+    states: dict[int, FixtureState],
+    universe: int,
+    *,
+    master_dimmer: float = 1.0,
+) -> bytes:
+    values = bytearray(DMX_UNIVERSE_SIZE)
+    for fixture in fixtures:
+        state = states.get(fixture.fixture_id)
+        if fixture.universe != universe or state is None:
+            continue
+        start = fixture.start_address - 1
+        channels = fixture_channel_values(state, fixture.num_channels)[: DMX_UNIVERSE_SIZE - start]
+        values[start:start + len(channels)] = bytes(int(value * master_dimmer) for value in channels)
+    return bytes(values)
+
+
+def channel_owners(fixtures: Iterable[Fixture], universe: int) -> list[list[int]]:
+    owners: list[list[int]] = [[] for _ in range(DMX_UNIVERSE_SIZE)]
+    for fixture in fixtures:
+        if fixture.universe != universe:
+            continue
+        for channel in range(fixture.start_address - 1, min(DMX_UNIVERSE_SIZE, fixture.start_address - 1 + fixture.num_channels)):
+            owners[channel].append(fixture.fixture_id)
+    return owners
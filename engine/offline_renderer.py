@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+from .clock import VirtualClock
+from .controller import EngineController
+from .models import ShowFile
+
+DMX_UNIVERSE_SIZE = 512
+DEFAULT_FRAME_RATE = 40.0
+# Frames this close to an auto-advance deadline go through the controller, so float rounding never skips a cue.
+_DEADLINE_MARGIN = 0.001
+
+
+class FrameRecorder:
+    def __init__(self) -> None:
+        self.values = bytearray(DMX_UNIVERSE_SIZE)
+        self.master_dimmer = 1.0
+        self.last_frame = bytes(DMX_UNIVERSE_SIZE)
+        self.on_frame_sent = None
+        self._dimmer_table: bytes | None = None
+        self._pending = False
+
+    def queue_update(self, channel: int, value: int) -> None:
+        self.values[channel] = value
+        self._pending = True
+
+    def queue_multi_update(self, start_channel: int, values: list[int]) -> None:
+        end_channel = start_channel + len(values)
+        if end_channel > DMX_UNIVERSE_SIZE:
+            raise IndexError(f"Channels {start_channel + 1}-{end_channel} are outside the universe.")
+        if None in values:
+            for offset, value in enumerate(values):
+                if value is not None:
+                    self.values[start_channel + offset] = value
+        else:
+            self.values[start_channel:end_channel] = bytes(values)
+        self._pending = True
+
+    def process_updates(self, current_values: list[int]) -> tuple[bool, bytes | None]:
+        if not self._pending:
+            return False, None
+        self._pending = False
+        current_values[:] = self.values
+        self.last_frame = self.dim(self.values)
+        if self.on_frame_sent:
+            self.on_frame_sent(list(self.last_frame))
+        return True, self.last_frame
+
+    def set_master_dimmer(self, value: float) -> None:
+        self.master_dimmer = value
+        self._dimmer_table = None if value == 1.0 else bytes(int(level * value) for level in range(256))
+        self._pending = True
+
+    def dim(self, values: bytearray) -> bytes:
+        frame = bytes(values)
+        return frame if self._dimmer_table is None else frame.translate(self._dimmer_table)
+
+
+@dataclass(slots=True)
+class RenderAction:
+    at_ms: int
+    action: str
+    value: float | None = None
+
+
+class OfflineRenderer:
+    ACTIONS = ("go", "back", "pause", "resume", "start_rhythm", "stop_rhythm", "bpm", "master", "blackout")
+
+    def __init__(self, show_file: ShowFile, *, frame_rate: float = DEFAULT_FRAME_RATE) -> None:
+        if frame_rate <= 0:
+            raise ValueError("Frame rate must be positive.")
+        self.show_file = show_file
+        self.frame_rate = frame_rate
+        # Each frame holds one 512-channel block per patched universe, in ascending universe order.
+        self.universes = sorted({patch.universe for patch in show_file.fixtures}) or [1]
+
+    def iter_frames(
+        self,
+        sequence_id: str,
+        duration_ms: int,
+        actions: Iterable[RenderAction] | None = None,
+    ) -> Iterator[bytes]:
+        clock = VirtualClock()
+        recorders = [FrameRecorder() for _ in self.universes]
+        controller = EngineController([], clock=clock)
+        for universe, recorder in zip(self.universes, recorders):
+            controller.attach_output(recorder, universe=universe)
+        controller.load_show_file(self.show_file)
+        controller.load_sequence(sequence_id)
+
+        pending = sorted(actions if actions is not None else [RenderAction(at_ms=0, action="go")], key=lambda item: item.at_ms)
+        for action in pending:
+            if action.action not in self.ACTIONS:
+                raise ValueError(f"Unknown render action: {action.action}")
+
+        frame_interval = 1.0 / self.frame_rate
+        frame_count = int(duration_ms / 1000.0 * self.frame_rate) + 1
+        action_index = 0
+        frame = b""
+        for frame_index in range(frame_count):
+            now = frame_index * frame_interval
+            elapsed_ms = frame_index * frame_interval * 1000.0
+            action_due = action_index < len(pending) and pending[action_index].at_ms <= elapsed_ms
+            change_at = controller.next_change_at()
+            if frame and not action_due and (change_at is None or now < change_at - _DEADLINE_MARGIN):
+                # Nothing is fading or scheduled before this frame, so a tick would send the same frame again.
+                yield frame
+                continue
+            clock.set(now)
+            while action_index < len(pending) and pending[action_index].at_ms <= elapsed_ms:
+                self._perform(controller, pending[action_index])
+                action_index += 1
+            controller.tick()
+            frame = b"".join(recorder.last_frame for recorder in recorders)
+            yield frame
+
+    def render_to_file(
+        self,
+        path: str | Path | BinaryIO,
+        sequence_id: str,
+        duration_ms: int,
+        actions: Iterable[RenderAction] | None = None,
+    ) -> int:
+        if hasattr(path, "write"):
+            return self._write_frames(path, sequence_id, duration_ms, actions)
+        with Path(path).open("wb") as handle:
+            return self._write_frames(handle, sequence_id, duration_ms, actions)
+
+    def render_to_array(
+        self,
+        sequence_id: str,
+        duration_ms: int,
+        actions: Iterable[RenderAction] | None = None,
+    ) -> bytearray:
+        frames = bytearray()
+        for frame in self.iter_frames(sequence_id, duration_ms, actions):
+            frames += frame
+        return frames
+
+    def _write_frames(
+        self,
+        handle: BinaryIO,
+        sequence_id: str,
+        duration_ms: int,
+        actions: Iterable[RenderAction] | None,
+    ) -> int:
+        written = 0
+        for frame in self.iter_frames(sequence_id, duration_ms, actions):
+            handle.write(frame)
+            written += 1
+        return written
+
+    def _perform(self, controller: EngineController, action: RenderAction) -> None:
+        if action.action == "go":
+            controller.go_next_cue()
+        elif action.action == "back":
+            controller.go_previous_cue()
+        elif action.action == "pause":
+            controller.pause_sequence()
+        elif action.action == "resume":
+            controller.resume_sequence()
+        elif action.action == "start_rhythm":
+            if action.value is not None:
+                controller.set_rhythm_bpm(action.value)
+            controller.start_rhythm_play()
+        elif action.action == "stop_rhythm":
+            controller.stop_rhythm_play()
+        elif action.action == "bpm":
+            controller.set_rhythm_bpm(action.value or 120.0)
+        elif action.action == "master":
+            controller.set_master_dimmer(1.0 if action.value is None else action.value)
+        elif action.action == "blackout":
+            controller.set_blackout(bool(action.value))
+
+
+def frame_at(frames: bytes | bytearray, index: int, universe_count: int = 1) -> bytes:
+    frame_size = DMX_UNIVERSE_SIZE * universe_count
+    start = index * frame_size
+    return bytes(frames[start:start + frame_size])
@@ -5,12 +5,45 @@ from fixture import Fixture
 from .models import FixtureState
 
 
+def fixture_channel_values(state: FixtureState, num_channels: int) -> list[int]:
+    channel_values = [0] * num_channels
+    ordered_values = [
+        state.intensity,
+        state.red,
+        state.green,
+        state.blue,
+        state.white,
+    ]
+    for index in range(min(num_channels, len(ordered_values))):
+        channel_values[index] = ordered_values[index]
+    return channel_values
+
+
 class OutputEngine:
-    def __init__(self, fixtures: list[Fixture], update_manager) -> None:
-        self._fixtures = {fixture.fixture_id: fixture for fixture in fixtures}
+    def __init__(self, fixtures: list[Fixture], update_manager, *, universe: int = 1) -> None:
+        self.universe = universe
+        self._fixtures = {fixture.fixture_id: fixture for fixture in fixtures if fixture.universe == universe}
         self._update_manager = update_manager
         self._current_values = [0] * 512
 
+    def add_fixture(self, fixture: Fixture) -> None:
+        if fixture.universe == self.universe:
+            self._fixtures[fixture.fixture_id] = fixture
+
+    def remove_fixture(self, fixture_id: int) -> None:
+        self._fixtures.pop(fixture_id, None)
+
+    def update_fixture(self, fixture: Fixture) -> None:
+        if fixture.universe == self.universe:
+            self._fixtures[fixture.fixture_id] = fixture
+        else:
+            self._fixtures.pop(fixture.fixture_id, None)
+
+    def release_channels(self, universe: int, start_address: int, num_channels: int) -> None:
+        if universe != self.universe:
+            return
+        self._update_manager.queue_multi_update(start_address - 1, [0] * num_channels)
+
     def render(self, fixture_states: dict[int, FixtureState]) -> None:
         for fixture_id, state in fixture_states.items():
             fixture = self._fixtures.get(fixture_id)
@@ -25,14 +58,4 @@ class OutputEngine:
         self._update_manager.set_master_dimmer(value)
 
     def _fixture_to_channels(self, state: FixtureState, fixture: Fixture) -> list[int]:
-        channel_values = [0] * fixture.num_channels
-        ordered_values = [
-            state.intensity,
-            state.red,
-            state.green,
-            state.blue,
-            state.white,
-        ]
-        for index in range(min(fixture.num_channels, len(ordered_values))):
-            channel_values[index] = ordered_values[index]
-        return channel_values
\ No newline at end of file
+        return fixture_channel_values(state, fixture.num_channels)
\ No newline at end of file
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+
+from .models import FixtureState, Palette, Scene
+
+BLOCK_PREFIX = "block-"
+
+
+def palette_digest(fixture_states: dict[int, FixtureState]) -> str:
+    rows = sorted(
+        (state.fixture_id, state.intensity, state.red, state.green, state.blue, state.white)
+        for state in fixture_states.values()
+    )
+    return hashlib.blake2b(repr(rows).encode("ascii"), digest_size=12).hexdigest()
+
+
+def is_state_block(palette_id: str | None) -> bool:
+    return palette_id is not None and palette_id.startswith(BLOCK_PREFIX)
+
+
+def referenced_palettes(palettes: Iterable[Palette], scenes: Iterable[Scene]) -> list[Palette]:
+    palette_ids = {scene.palette_id for scene in scenes if scene.palette_id is not None}
+    return [palette for palette in palettes if palette.id in palette_ids]
+
+
+def share_state_blocks(palettes: Iterable[Palette], scenes: Iterable[Scene]) -> tuple[list[Palette], list[Scene]]:
+    # Explicitly linked palettes are kept as they are. Any other state dict used by more than one scene (or
+    # already stored as a block) becomes a block palette written once, and those scenes are copied to reference it.
+    scenes = list(scenes)
+    palettes = list(palettes)
+    stored_blocks = {id(palette.fixture_states): palette for palette in palettes if is_state_block(palette.id)}
+    users: dict[int, list[int]] = {}
+    for index, scene in enumerate(scenes):
+        if scene.palette_id is None or is_state_block(scene.palette_id):
+            users.setdefault(id(scene.fixture_states), []).append(index)
+    blocks: list[Palette] = []
+    for indices in users.values():
+        fixture_states = scenes[indices[0]].fixture_states
+        block = stored_blocks.get(id(fixture_states))
+        if block is None and len(indices) > 1 and fixture_states:
+            block = Palette(id=BLOCK_PREFIX + palette_digest(fixture_states), fixture_states=fixture_states)
+        palette_id = block.id if block is not None else None
+        if block is not None:
+            blocks.append(block)
+        for index in indices:
+            if scenes[index].palette_id != palette_id:
+                scenes[index] = replace(scenes[index], palette_id=palette_id)
+    explicit = referenced_palettes((palette for palette in palettes if not is_state_block(palette.id)), scenes)
+    return explicit + blocks, scenes
+
+
+class PaletteStore:
+    def __init__(self, palettes: Iterable[Palette] = ()) -> None:
+        self._palettes: dict[str, Palette] = {}
+        self._blocks: dict[str, dict[int, FixtureState]] = {}
+        self._block_ids: dict[str, dict[int, FixtureState]] = {}
+        for palette in palettes:
+            self.add(palette)
+
+    def __len__(self) -> int:
+        return len(self._palettes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._palettes)
+
+    def __contains__(self, palette_id: object) -> bool:
+        return palette_id in self._palettes
+
+    def get(self, palette_id: str | None) -> Palette | None:
+        return self._palettes.get(palette_id) if palette_id is not None else None
+
+    def values(self) -> list[Palette]:
+        return list(self._palettes.values())
+
+    def add(self, palette: Palette) -> Palette:
+        if is_state_block(palette.id):
+            # A block stored in a show file seeds the intern table; it is shared content, not a palette users edit.
+            self._block_ids[palette.id] = self._intern(palette.fixture_states, adopt=True)
+            return palette
+        self._palettes[palette.id] = palette
+        return palette
+
+    def intern(self, fixture_states: dict[int, FixtureState]) -> dict[int, FixtureState]:
+        return self._intern(fixture_states, adopt=False)
+
+    def link_scene(self, scene: Scene) -> Scene:
+        # Scenes linked to a palette share its dict. Every other scene shares the interned dict for its content,
+        # which is never edited in place: changing a scene's states always hands it another block.
+        if scene.palette_id is None or is_state_block(scene.palette_id):
+            fixture_states = self._block_ids.get(scene.palette_id) if scene.palette_id is not None else None
+            if fixture_states is not scene.fixture_states:
+                fixture_states = self.intern(scene.fixture_states)
+            if scene.palette_id is None and fixture_states is scene.fixture_states:
+                return scene
+            return replace(scene, fixture_states=fixture_states, palette_id=None)
+        palette = self._palettes.get(scene.palette_id)
+        if palette is None:
+            palette = self.add(Palette(id=scene.palette_id, fixture_states=dict(self.intern(scene.fixture_states))))
+        if scene.fixture_states is palette.fixture_states:
+            return scene
+        fixture_states = self.intern(scene.fixture_states)
+        if fixture_states == palette.fixture_states:
+            return replace(scene, fixture_states=palette.fixture_states)
+        # States that no longer match the palette detach the scene instead of editing every linked scene.
+        return replace(scene, fixture_states=fixture_states, palette_id=None)
+
+    def blocks(self) -> list[Palette]:
+        return [Palette(id=palette_id, fixture_states=fixture_states) for palette_id, fixture_states in self._block_ids.items()]
+
+    def update(self, palette_id: str, fixture_states: dict[int, FixtureState], *, name: str | None = None) -> Palette:
+        palette = self._palettes[palette_id]
+        # Linked scenes share the palette's dict, so updating it in place re-points every one of them at once.
+        palette.fixture_states.clear()
+        palette.fixture_states.update((fixture_id, state.normalized()) for fixture_id, state in fixture_states.items())
+        if name is not None:
+            palette.name = name
+        return palette
+
+    def prune(self, scenes: Iterable[Scene]) -> int:
+        scenes = list(scenes)
+        keep = {palette.id for palette in referenced_palettes(self._palettes.values(), scenes)}
+        removed = [palette_id for palette_id in self._palettes if palette_id not in keep]
+        for palette_id in removed:
+            del self._palettes[palette_id]
+        used = {id(scene.fixture_states) for scene in scenes}
+        self._blocks = {digest: states for digest, states in self._blocks.items() if id(states) in used}
+        self._block_ids = {palette_id: states for palette_id, states in self._block_ids.items() if id(states) in used}
+        return len(removed)
+
+    def _intern(self, fixture_states: dict[int, FixtureState], *, adopt: bool) -> dict[int, FixtureState]:
+        normalized = {fixture_id: state.normalized() for fixture_id, state in fixture_states.items()}
+        if adopt and normalized == fixture_states:
+            normalized = fixture_states
+        return self._blocks.setdefault(palette_digest(normalized), normalized)
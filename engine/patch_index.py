@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+
+from fixture import Fixture
+
+DMX_UNIVERSE_SIZE = 512
+
+
+@dataclass(frozen=True, slots=True)
+class AddressRange:
+    universe: int
+    start: int
+    end: int
+
+    @classmethod
+    def of(cls, fixture: Fixture) -> "AddressRange":
+        return cls(universe=fixture.universe, start=fixture.start_address, end=fixture.start_address + fixture.num_channels - 1)
+
+
+class PatchIndex:
+    def __init__(self, fixtures: list[Fixture] | None = None) -> None:
+        self._by_id: dict[int, Fixture] = {}
+        self._ranges: dict[int, AddressRange] = {}
+        # Per universe, (start, fixture_id) pairs kept sorted so overlap queries are a bisect plus a short scan.
+        self._starts: dict[int, list[tuple[int, int]]] = {}
+        self._max_width: dict[int, int] = {}
+        self._max_fixture_id = 0
+        for fixture in fixtures or []:
+            self.add(fixture)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, fixture_id: object) -> bool:
+        return fixture_id in self._by_id
+
+    def get(self, fixture_id: int) -> Fixture:
+        try:
+            return self._by_id[fixture_id]
+        except KeyError:
+            raise KeyError(f"Unknown fixture id: {fixture_id}") from None
+
+    def next_fixture_id(self) -> int:
+        return self._max_fixture_id + 1
+
+    def universes(self) -> list[int]:
+        return sorted(universe for universe, entries in self._starts.items() if entries)
+
+    def add(self, fixture: Fixture) -> None:
+        if fixture.fixture_id in self._by_id:
+            raise ValueError(f"Duplicate fixture id: {fixture.fixture_id}")
+        self._by_id[fixture.fixture_id] = fixture
+        self._max_fixture_id = max(self._max_fixture_id, fixture.fixture_id)
+        self._insert_range(fixture.fixture_id, AddressRange.of(fixture))
+
+    def remove(self, fixture_id: int) -> Fixture:
+        fixture = self._by_id.pop(fixture_id)
+        self._remove_range(fixture_id)
+        if fixture_id == self._max_fixture_id:
+            self._max_fixture_id = max(self._by_id, default=0)
+        return fixture
+
+    def reindex(self, fixture: Fixture) -> None:
+        if self._ranges.get(fixture.fixture_id) == AddressRange.of(fixture):
+            return
+        self._remove_range(fixture.fixture_id)
+        self._insert_range(fixture.fixture_id, AddressRange.of(fixture))
+
+    def rebuild(self, fixtures: list[Fixture]) -> None:
+        self._by_id.clear()
+        self._ranges.clear()
+        self._starts.clear()
+        self._max_width.clear()
+        self._max_fixture_id = 0
+        for fixture in fixtures:
+            self.add(fixture)
+
+    def overlapping(
+        self,
+        start_address: int,
+        num_channels: int,
+        *,
+        universe: int = 1,
+        exclude_fixture_id: int | None = None,
+    ) -> list[int]:
+        entries = self._starts.get(universe)
+        if not entries:
+            return []
+        end_address = start_address + num_channels - 1
+        # No fixture is wider than max_width, so anything starting earlier than this cannot reach start_address.
+        lowest_start = start_address - self._max_width[universe] + 1
+        overlapping: list[int] = []
+        for index in range(bisect_left(entries, (lowest_start, -1)), bisect_right(entries, (end_address, float("inf")))):
+            entry_start, fixture_id = entries[index]
+            if fixture_id == exclude_fixture_id:
+                continue
+            if self._ranges[fixture_id].end >= start_address and entry_start <= end_address:
+                overlapping.append(fixture_id)
+        return overlapping
+
+    def conflicts(self) -> list[tuple[int, int]]:
+        pairs: list[tuple[int, int]] = []
+        for universe, entries in self._starts.items():
+            active: list[tuple[int, int]] = []
+            for start, fixture_id in entries:
+                active = [(end, other_id) for end, other_id in active if end >= start]
+                pairs.extend((other_id, fixture_id) for _end, other_id in active)
+                active.append((self._ranges[fixture_id].end, fixture_id))
+        return pairs
+
+    def find_free_block(self, num_channels: int, *, universe: int | None = None, start_address: int = 1) -> tuple[int, int] | None:
+        if num_channels < 1 or num_channels > DMX_UNIVERSE_SIZE:
+            return None
+        candidates = [universe] if universe is not None else [*self.universes(), max(self.universes(), default=0) + 1]
+        if universe is None and 1 not in candidates:
+            candidates.insert(0, 1)
+        for candidate in candidates:
+            address = self._free_start_in_universe(candidate, num_channels, start_address)
+            if address is not None:
+                return candidate, address
+        return None
+
+    def _free_start_in_universe(self, universe: int, num_channels: int, start_address: int) -> int | None:
+        entries = self._starts.get(universe, [])
+        cursor = max(1, start_address)
+        lowest_start = cursor - self._max_width.get(universe, 1) + 1
+        for entry_start, fixture_id in entries[bisect_left(entries, (lowest_start, -1)):]:
+            if entry_start - cursor >= num_channels:
+                break
+            cursor = max(cursor, self._ranges[fixture_id].end + 1)
+        if cursor + num_channels - 1 > DMX_UNIVERSE_SIZE:
+            return None
+        return cursor
+
+    def _insert_range(self, fixture_id: int, address_range: AddressRange) -> None:
+        self._ranges[fixture_id] = address_range
+        insort(self._starts.setdefault(address_range.universe, []), (address_range.start, fixture_id))
+        width = address_range.end - address_range.start + 1
+        self._max_width[address_range.universe] = max(self._max_width.get(address_range.universe, 1), width)
+
+    def _remove_range(self, fixture_id: int) -> None:
+        address_range = self._ranges.pop(fixture_id, None)
+        if address_range is None:
+            return
+        entries = self._starts[address_range.universe]
+        index = bisect_left(entries, (address_range.start, fixture_id))
+        if index < len(entries) and entries[index] == (address_range.start, fixture_id):
+            del entries[index]
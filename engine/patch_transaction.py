@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from fixture import Fixture
+
+from .patch_index import DMX_UNIVERSE_SIZE
+
+if TYPE_CHECKING:
+    from .controller import EngineController
+
+
+class PatchConflictError(ValueError):
+    def __init__(self, message: str, conflicts: list[tuple[int, int]]) -> None:
+        super().__init__(message)
+        self.conflicts = conflicts
+
+
+@dataclass(slots=True)
+class FixtureSnapshot:
+    start_address: int
+    num_channels: int
+    universe: int
+    position: tuple[int, int]
+    angle: int
+
+    @classmethod
+    def of(cls, fixture: Fixture) -> "FixtureSnapshot":
+        return cls(fixture.start_address, fixture.num_channels, fixture.universe, fixture.position, fixture.angle)
+
+    def restore(self, fixture: Fixture) -> None:
+        fixture.start_address = self.start_address
+        fixture.num_channels = self.num_channels
+        fixture.universe = self.universe
+        fixture.position = self.position
+        fixture.angle = self.angle
+
+
+@dataclass(slots=True)
+class PatchTransaction:
+    controller: "EngineController"
+    validate: bool = True
+    added: dict[int, Fixture] = field(default_factory=dict)
+    updates: dict[int, dict] = field(default_factory=dict)
+    removed: set[int] = field(default_factory=set)
+    _next_fixture_id: int = 0
+    _committed: bool = False
+
+    def __enter__(self) -> "PatchTransaction":
+        return self
+
+    def __exit__(self, exc_type, _exc, _traceback) -> None:
+        if exc_type is None:
+            self.commit()
+
+    def add(
+        self,
+        *,
+        start_address: int,
+        num_channels: int = 5,
+        position: tuple[int, int] = (0, 0),
+        angle: int = 0,
+        universe: int = 1,
+    ) -> Fixture:
+        fixture_id = max(self._next_fixture_id, self.controller.patch_index.next_fixture_id())
+        self._next_fixture_id = fixture_id + 1
+        fixture = Fixture(
+            fixture_id=fixture_id,
+            start_address=start_address,
+            num_channels=num_channels,
+            position=position,
+            angle=angle,
+            universe=universe,
+        )
+        self.added[fixture_id] = fixture
+        return fixture
+
+    def move(self, fixture_id: int, *, position: tuple[int, int] | None = None, angle: int | None = None) -> None:
+        self._update(fixture_id, position=position, angle=angle)
+
+    def readdress(
+        self,
+        fixture_id: int,
+        *,
+        start_address: int | None = None,
+        num_channels: int | None = None,
+        universe: int | None = None,
+    ) -> None:
+        self._update(fixture_id, start_address=start_address, num_channels=num_channels, universe=universe)
+
+    def remove(self, fixture_id: int) -> None:
+        if fixture_id in self.added:
+            del self.added[fixture_id]
+            return
+        self.controller.patch_index.get(fixture_id)
+        self.updates.pop(fixture_id, None)
+        self.removed.add(fixture_id)
+
+    def commit(self) -> None:
+        if self._committed:
+            raise RuntimeError("Patch transaction already committed.")
+        self._committed = True
+        self.controller.apply_patch_transaction(self)
+
+    def _update(self, fixture_id: int, **changes) -> None:
+        if fixture_id in self.removed:
+            raise KeyError(f"Fixture {fixture_id} is removed in this transaction.")
+        values = {name: value for name, value in changes.items() if value is not None}
+        if fixture_id in self.added:
+            fixture = self.added[fixture_id]
+            for name, value in values.items():
+                setattr(fixture, name, value)
+            return
+        self.controller.patch_index.get(fixture_id)
+        self.updates.setdefault(fixture_id, {}).update(values)
+
+
+def validate_address(fixture: Fixture) -> None:
+    if fixture.start_address < 1 or fixture.start_address > DMX_UNIVERSE_SIZE:
+        raise ValueError(f"Fixture {fixture.fixture_id}: start address must be between 1 and {DMX_UNIVERSE_SIZE}.")
+    if fixture.num_channels < 1 or fixture.start_address + fixture.num_channels - 1 > DMX_UNIVERSE_SIZE:
+        raise ValueError(f"Fixture {fixture.fixture_id} exceeds the {DMX_UNIVERSE_SIZE}-channel DMX universe.")
+    if fixture.universe < 1:
+        raise ValueError(f"Fixture {fixture.fixture_id}: universe must be 1 or higher.")
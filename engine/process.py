@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import pickle
+import queue
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import asdict
+from functools import wraps
+from typing import Any
+
+from fixture import Fixture
+
+from .clock import Clock
+from .controller import EngineController
+from .events import TransportChanged
+from .frame_bus import SharedRing
+from .metrics import MetricsSnapshot, budget_alerts
+from .models import Scene, Sequence, ShowFile, TriggerMode
+from .monitor import DMX_UNIVERSE_SIZE
+from .patch_transaction import PatchTransaction
+from .runner import DEFAULT_TICK_RATE, EngineRunner
+
+FRAME_RING_SLOTS = 64
+SNAPSHOT_SLOT_SIZE = 4096
+MAX_TRANSPORT_ERROR_CHARS = 512
+SNAPSHOT_RING_SLOTS = 8
+STOP_TIMEOUT_SECONDS = 2.0
+METRICS_PUBLISH_SECONDS = 0.25
+
+_FRAME_HEADER = struct.Struct("<H")
+
+# Controller methods the GUI replica mirrors into the engine process by name. Methods that call one another
+# are only forwarded from the outermost call, so the engine runs each user action exactly once.
+FORWARDED_METHODS = (
+    "add_cue_to_sequence",
+    "add_scene",
+    "apply_override",
+    "apply_scene",
+    "clear_override",
+    "create_palette",
+    "create_sequence",
+    "delete_scene",
+    "duplicate_scene",
+    "go_next_cue",
+    "go_previous_cue",
+    "go_to_cue",
+    "go_to_cue_number",
+    "link_scene_palette",
+    "load_sequence",
+    "pause_sequence",
+    "record_override_to_current_scene",
+    "remove_cue_from_sequence",
+    "rename_scene",
+    "rename_sequence",
+    "resume_sequence",
+    "set_blackout",
+    "set_master_dimmer",
+    "set_rhythm_bpm",
+    "set_sequence_cyclic",
+    "set_sequence_tracking",
+    "start_rhythm_play",
+    "stop_rhythm_play",
+    "update_palette",
+    "update_scene_states",
+)
+
+
+def encode_frame(universe: int, frame) -> bytes:
+    return _FRAME_HEADER.pack(universe) + bytes(frame[:DMX_UNIVERSE_SIZE])
+
+
+def decode_frame(payload: bytes) -> tuple[int, bytes]:
+    return _FRAME_HEADER.unpack_from(payload)[0], payload[_FRAME_HEADER.size:]
+
+
+class EngineProcess:
+    def __init__(
+        self,
+        fixtures: list[Fixture],
+        *,
+        update_manager_factory: Callable[[], tuple[object | None, Exception | None]] | None = None,
+        tick_rate: float = DEFAULT_TICK_RATE,
+    ) -> None:
+        context = multiprocessing.get_context("spawn")
+        self.frames = SharedRing(_FRAME_HEADER.size + DMX_UNIVERSE_SIZE, FRAME_RING_SLOTS)
+        self.snapshots = SharedRing(SNAPSHOT_SLOT_SIZE, SNAPSHOT_RING_SLOTS)
+        self.snapshot: dict[str, Any] = {}
+        self._commands = context.Queue()
+        self.sent_messages = 0
+        self._frame_sequence = 0
+        self._snapshot_sequence = 0
+        self._process = context.Process(
+            target=run_engine_process,
+            args=(self._commands, self.frames.name, self.snapshots.name, fixtures, update_manager_factory, tick_rate),
+            name="mydmx-engine",
+            daemon=True,
+        )
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def start(self) -> None:
+        self._process.start()
+
+    def send(self, *message) -> None:
+        # Pickle now rather than in the queue's feeder thread, so later edits to the same objects are not sent early.
+        self._commands.put(pickle.dumps(message, pickle.HIGHEST_PROTOCOL))
+        if message[0] != "stop":
+            self.sent_messages += 1
+
+    def poll_frames(self) -> list[tuple[int, bytes]]:
+        self._frame_sequence, payloads = self.frames.read_since(self._frame_sequence)
+        return [decode_frame(payload) for payload in payloads]
+
+    def poll_snapshot(self) -> dict[str, Any]:
+        sequence, payload = self.snapshots.read_latest()
+        if sequence != self._snapshot_sequence and payload is not None:
+            self._snapshot_sequence = sequence
+            self.snapshot = json.loads(payload)
+        return self.snapshot
+
+    def stop(self, timeout: float = STOP_TIMEOUT_SECONDS) -> None:
+        if self._process.is_alive():
+            self.send("stop")
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout)
+        self._commands.close()
+        self.frames.close()
+        self.snapshots.close()
+
+
+class ProcessEngineController(EngineController):
+    def __init__(self, fixtures: list[Fixture], engine: EngineProcess, *, clock: Clock | None = None) -> None:
+        super().__init__(fixtures, None, clock=clock)
+        self.engine = engine
+        self._forward_depth = 0
+        self._issued_ids: list[str] = []
+
+    @property
+    def is_output_enabled(self) -> bool:
+        return bool(self.engine.snapshot.get("output_enabled"))
+
+    @property
+    def transport_error(self) -> str | None:
+        return self.engine.snapshot.get("transport_error")
+
+    def create_scene(self, name: str, from_live_output: bool = False, fixture_ids: set[int] | None = None) -> Scene:
+        # Captures read the replica's live output, so send the captured scene rather than repeating the capture.
+        had_current_scene = self.state.current_scene_id is not None
+        with self._local_only():
+            scene = super().create_scene(name, from_live_output, fixture_ids)
+        self._forward("add_scene", (self.state.scenes[scene.id],), {})
+        if not had_current_scene:
+            self._forward("apply_scene", (scene.id,), {})
+        return scene
+
+    def record_tracking_cue(
+        self,
+        sequence_id: str,
+        name: str,
+        *,
+        fade_in_ms: int = 0,
+        hold_ms: int = 0,
+        trigger_mode: TriggerMode = TriggerMode.MANUAL,
+    ) -> Sequence:
+        with self._local_only():
+            sequence = super().record_tracking_cue(sequence_id, name, fade_in_ms=fade_in_ms, hold_ms=hold_ms, trigger_mode=trigger_mode)
+        cue = sequence.cues[-1]
+        self._forward("add_scene", (self.state.scenes[cue.scene_id],), {})
+        self._issued_ids = [cue.id]
+        self._forward("add_cue_to_sequence", (sequence_id, cue.scene_id), {"fade_in_ms": fade_in_ms, "hold_ms": hold_ms, "trigger_mode": trigger_mode})
+        return sequence
+
+    def apply_patch_transaction(self, transaction: PatchTransaction) -> None:
+        super().apply_patch_transaction(transaction)
+        self.engine.send("patch", list(transaction.added.values()), transaction.updates, transaction.removed)
+
+    def load_show_file(self, show_file: ShowFile) -> None:
+        super().load_show_file(show_file)
+        self.engine.send("show", self._detached_show_file())
+
+    def metrics_snapshot(self) -> MetricsSnapshot:
+        # Output timing comes from the engine process; only the refresh cost is measured on this side.
+        local = super().metrics_snapshot()
+        remote = self.engine.snapshot.get("metrics")
+        if remote is None:
+            return local
+        snapshot = MetricsSnapshot(**remote)
+        snapshot.refresh_p95_ms = local.refresh_p95_ms
+        snapshot.alerts = budget_alerts(snapshot)
+        return snapshot
+
+    def tick(self) -> tuple[bool, list[int] | None] | None:
+        self.engine.poll_snapshot()
+        result = super().tick()
+        for universe, frame in self.engine.poll_frames():
+            self.monitor.record(universe, frame)
+        return result
+
+    def _poll_sequence(self) -> None:
+        # Auto-follow and rhythm only run in the engine process. Once it has applied everything sent so far,
+        # the replica adopts its cue and scene instead of advancing on its own clock.
+        snapshot = self.engine.snapshot
+        if snapshot.get("applied_messages") != self.engine.sent_messages:
+            return
+        if snapshot.get("loaded_sequence_id") != self._loaded_sequence_id:
+            return
+        with self._local_only():
+            if self.sequence_engine.is_rhythm_enabled and not snapshot.get("rhythm_playing"):
+                self.sequence_engine.stop_rhythm()
+                self.events.publish(TransportChanged("rhythm"))
+            cue_id = snapshot.get("current_cue_id")
+            cue = self.sequence_engine.current_cue
+            if cue_id is not None and (cue is None or cue.id != cue_id):
+                self._jump(self.sequence_engine.goto_cue_id(cue_id), None)
+                return
+            scene_id = snapshot.get("current_scene_id")
+            if (
+                scene_id is not None
+                and scene_id != self.state.current_scene_id
+                and scene_id in self.state.scenes
+                and not self.is_fading
+                and not snapshot.get("fading")
+            ):
+                self.apply_scene(scene_id)
+
+    def _detached_show_file(self) -> ShowFile:
+        # Lazily loaded libraries decode each scene for the engine without keeping it materialised here.
+        peek = getattr(self.state.scenes, "peek", None)
+        if peek is None:
+            return self.build_show_file()
+        return self.build_show_file(scenes=[peek(scene_id) for scene_id in self.state.scenes])
+
+    def _forward(self, name: str, args: tuple, kwargs: dict) -> None:
+        self.engine.send("call", name, args, kwargs, self._issued_ids)
+        self._issued_ids = []
+
+    @contextmanager
+    def _local_only(self) -> Iterator[None]:
+        if self._forward_depth == 0:
+            self._issued_ids = []
+        self._forward_depth += 1
+        try:
+            yield
+        finally:
+            self._forward_depth -= 1
+
+    def _new_id(self, prefix: str) -> str:
+        identifier = super()._new_id(prefix)
+        self._issued_ids.append(identifier)
+        return identifier
+
+
+def _forwarding(name: str) -> Callable[..., Any]:
+    method = getattr(EngineController, name)
+
+    @wraps(method)
+    def forward(self: ProcessEngineController, *args, **kwargs):
+        if self._forward_depth:
+            return method(self, *args, **kwargs)
+        with self._local_only():
+            result = method(self, *args, **kwargs)
+        self._forward(name, args, kwargs)
+        return result
+
+    return forward
+
+
+for _name in FORWARDED_METHODS:
+    setattr(ProcessEngineController, _name, _forwarding(_name))
+del _name
+
+
+class _EngineProcessController(EngineController):
+    def __init__(self, fixtures: list[Fixture], update_manager=None) -> None:
+        super().__init__(fixtures, update_manager)
+        self.supplied_ids: deque[str] = deque()
+        self.applied_messages = 0
+
+    def _new_id(self, prefix: str) -> str:
+        # Reuse the ids the GUI replica generated so later commands can refer to the same scenes, cues and sequences.
+        if self.supplied_ids:
+            return self.supplied_ids.popleft()
+        return super()._new_id(prefix)
+
+
+def run_engine_process(
+    commands,
+    frame_ring_name: str,
+    snapshot_ring_name: str,
+    fixtures: list[Fixture],
+    update_manager_factory: Callable[[], tuple[object | None, Exception | None]] | None,
+    tick_rate: float,
+) -> None:
+    controller = _EngineProcessController(fixtures)
+    runner = EngineRunner(controller, tick_rate=tick_rate)
+    transport: dict[str, Any] = {"update_manager": None, "error": None}
+    frames = SharedRing(name=frame_ring_name)
+    snapshots = SharedRing(name=snapshot_ring_name)
+    published: dict[str, Any] = {"payload": b"", "oversized": False}
+    metrics: dict[str, Any] = {"published_at": 0.0, "values": None}
+
+    def publish_frame(frame: list[int]) -> None:
+        frames.write(encode_frame(controller.output_engine.universe, frame))
+
+    def publish_snapshot() -> None:
+        now = time.monotonic()
+        if now - metrics["published_at"] >= METRICS_PUBLISH_SECONDS:
+            metrics["published_at"] = now
+            metrics["values"] = asdict(controller.metrics_snapshot())
+        description = _describe(controller, transport["error"])
+        description["metrics"] = metrics["values"]
+        payload = json.dumps(description).encode("utf-8")
+        if payload == published["payload"]:
+            return
+        if len(payload) > snapshots.slot_size:
+            # Keep the previous snapshot rather than raise inside the tick listener.
+            if not published["oversized"]:
+                print(f"Engine snapshot of {len(payload)} bytes exceeds the {snapshots.slot_size}-byte slot; skipping.", file=sys.stderr)
+                published["oversized"] = True
+            return
+        snapshots.write(payload)
+        published["payload"] = payload
+        published["oversized"] = False
+
+    runner.add_frame_listener(publish_frame)
+    runner.add_tick_listener(publish_snapshot)
+    runner.start()
+    if update_manager_factory is not None:
+        # Output starts once the interface is found; the engine already accepts commands meanwhile.
+        threading.Thread(
+            target=_discover_transport,
+            args=(runner, controller, update_manager_factory, transport),
+            name="mydmx-usb-discovery",
+            daemon=True,
+        ).start()
+    try:
+        while True:
+            try:
+                message = pickle.loads(commands.get(timeout=1.0))
+            except queue.Empty:
+                continue
+            if message[0] == "stop":
+                break
+            runner.submit(_apply_message, controller, message).add_done_callback(_report_failure)
+    finally:
+        runner.stop()
+        frames.close()
+        snapshots.close()
+        update_manager = transport["update_manager"]
+        if update_manager is not None and getattr(update_manager, "dmx", None) is not None:
+            update_manager.dmx.cleanup()
+
+
+def _discover_transport(
+    runner: EngineRunner,
+    controller: EngineController,
+    update_manager_factory: Callable[[], tuple[object | None, Exception | None]],
+    transport: dict[str, Any],
+) -> None:
+    update_manager, transport["error"] = update_manager_factory()
+    if update_manager is not None:
+        transport["update_manager"] = update_manager
+        runner.submit(controller.attach_output, update_manager).add_done_callback(_report_failure)
+
+
+def _apply_message(controller: _EngineProcessController, message: tuple) -> None:
+    try:
+        _dispatch_message(controller, message)
+    finally:
+        controller.applied_messages += 1
+
+
+def _dispatch_message(controller: _EngineProcessController, message: tuple) -> None:
+    kind = message[0]
+    if kind == "call":
+        _kind, name, args, kwargs, ids = message
+        controller.supplied_ids.extend(ids)
+        try:
+            getattr(controller, name)(*args, **kwargs)
+        finally:
+            controller.supplied_ids.clear()
+    elif kind == "patch":
+        _kind, added, updates, removed = message
+        transaction = PatchTransaction(controller, validate=False, added={fixture.fixture_id: fixture for fixture in added}, updates=updates, removed=removed)
+        transaction.commit()
+    elif kind == "show":
+        controller.load_show_file(message[1])
+    else:
+        raise ValueError(f"Unknown engine message: {kind}")
+
+
+def _describe(controller: _EngineProcessController, transport_error: Exception | None) -> dict[str, Any]:
+    state = controller.state
+    cue = controller.current_cue
+    return {
+        "applied_messages": controller.applied_messages,
+        "output_enabled": controller.is_output_enabled,
+        "transport_error": str(transport_error)[:MAX_TRANSPORT_ERROR_CHARS] if transport_error is not None else None,
+        "current_scene_id": state.current_scene_id,
+        "loaded_sequence_id": controller.loaded_sequence_id,
+        "current_cue_id": cue.id if cue is not None else None,
+        "rhythm_playing": controller.is_rhythm_playing,
+        "master_dimmer": state.master_dimmer,
+        "blackout": state.blackout,
+        "fading": controller.is_fading,
+    }
+
+
+def _report_failure(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Engine command failed: {future.exception()!r}", file=sys.stderr)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from .controller import EngineController
+
+DEFAULT_TICK_RATE = 40.0
+
+
+class EngineRunner:
+    def __init__(self, controller: EngineController, *, tick_rate: float = DEFAULT_TICK_RATE) -> None:
+        if tick_rate <= 0:
+            raise ValueError("Tick rate must be positive.")
+        self.controller = controller
+        self.tick_interval = 1.0 / tick_rate
+        controller.metrics.budget_ms = self.tick_interval * 1000
+        self._commands: queue.SimpleQueue[tuple[Callable[..., Any], tuple, dict, Future]] = queue.SimpleQueue()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._engine_thread_id: int | None = None
+        self._frame_listeners: list[Callable[[list[int]], None]] = []
+        self._tick_listeners: list[Callable[[], None]] = []
+
+    @property
+    def is_running(self) -> bool:
+        return self._engine_thread_id is not None and not self._stop_event.is_set()
+
+    def submit(self, command: Callable[..., Any], *args, **kwargs) -> Future:
+        future: Future = Future()
+        if threading.get_ident() == self._engine_thread_id:
+            self._execute(command, args, kwargs, future)
+        else:
+            self._commands.put((command, args, kwargs, future))
+        return future
+
+    def call(self, command: Callable[..., Any], *args, timeout: float | None = 5.0, **kwargs) -> Any:
+        return self.submit(command, *args, **kwargs).result(timeout)
+
+    def add_frame_listener(self, listener: Callable[[list[int]], None]) -> None:
+        self._frame_listeners.append(listener)
+
+    def remove_frame_listener(self, listener: Callable[[list[int]], None]) -> None:
+        if listener in self._frame_listeners:
+            self._frame_listeners.remove(listener)
+
+    def add_tick_listener(self, listener: Callable[[], None]) -> None:
+        self._tick_listeners.append(listener)
+
+    def remove_tick_listener(self, listener: Callable[[], None]) -> None:
+        if listener in self._tick_listeners:
+            self._tick_listeners.remove(listener)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="mydmx-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def run_forever(self) -> None:
+        self._engine_thread_id = threading.get_ident()
+        try:
+            next_tick_at = time.perf_counter()
+            last_error: str | None = None
+            while not self._stop_event.is_set():
+                try:
+                    self.run_once()
+                    last_error = None
+                except Exception as exc:
+                    # One bad cue or listener must not take the engine thread, and every later command, down with it.
+                    # A fault that repeats every tick is reported once, not forty times a second.
+                    if repr(exc) != last_error:
+                        last_error = repr(exc)
+                        print(f"Engine tick failed: {last_error}", file=sys.stderr)
+                next_tick_at += self.tick_interval
+                remaining = next_tick_at - time.perf_counter()
+                if remaining < -self.tick_interval:
+                    # Fell more than a full tick behind; resynchronise instead of bursting to catch up.
+                    next_tick_at = time.perf_counter()
+                    continue
+                self._wait_until(next_tick_at)
+        finally:
+            self._engine_thread_id = None
+            self._drain_commands(cancel=True)
+
+    def run_once(self) -> None:
+        self.controller.metrics.record_queue_depth(self._commands.qsize())
+        self._drain_commands()
+        result = self.controller.tick()
+        for listener in list(self._tick_listeners):
+            listener()
+        if result is None:
+            return
+        sent, frame = result
+        if sent and frame is not None:
+            for listener in list(self._frame_listeners):
+                listener(frame)
+
+    def _wait_until(self, deadline: float) -> None:
+        # Sleep coarsely, then spin through the last millisecond so ticks land on schedule.
+        remaining = deadline - time.perf_counter()
+        if remaining > 0.002:
+            self._stop_event.wait(remaining - 0.001)
+        while time.perf_counter() < deadline and not self._stop_event.is_set():
+            pass
+
+    def _drain_commands(self, *, cancel: bool = False) -> None:
+        # Each command resolves as soon as it has run; a tick that fails afterwards is the engine's error, not theirs.
+        while True:
+            try:
+                command, args, kwargs, future = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if cancel:
+                future.cancel()
+                continue
+            self._execute(command, args, kwargs, future)
+
+    def _execute(self, command: Callable[..., Any], args: tuple, kwargs: dict, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(command(*args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
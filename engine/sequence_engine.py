@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import time
-
+from .clock import Clock, SystemClock
 from .models import Cue, Sequence, TriggerMode
 
 
 class SequenceEngine:
-    def __init__(self) -> None:
+    def __init__(self, clock: Clock | None = None) -> None:
+        self._clock = clock or SystemClock()
         self._sequence: Sequence | None = None
+        self._cue_positions: dict[str, int] = {}
         self._cue_index = -1
         self._cue_started_at = 0.0
         self._paused = False
@@ -50,9 +51,13 @@ class SequenceEngine:
             return None
         return self._sequence.cues[next_index]
 
+    def index_of(self, cue_id: str) -> int | None:
+        return self._cue_positions.get(cue_id)
+
     def sync(self, sequence: Sequence) -> None:
         current_cue_id = self.current_cue.id if self.current_cue is not None else None
         self._sequence = sequence
+        self._index_cues(sequence)
         if not sequence.cues:
             self._cue_index = -1
             self._cue_started_at = 0.0
@@ -62,14 +67,15 @@ class SequenceEngine:
             if self._cue_index >= len(sequence.cues):
                 self._cue_index = 0 if sequence.cyclic else len(sequence.cues) - 1
             return
-        for index, cue in enumerate(sequence.cues):
-            if cue.id == current_cue_id:
-                self._cue_index = index
-                return
+        index = self._cue_positions.get(current_cue_id)
+        if index is not None:
+            self._cue_index = index
+            return
         self._cue_index = min(self._cue_index, len(sequence.cues) - 1)
 
     def load(self, sequence: Sequence) -> None:
         self._sequence = sequence
+        self._index_cues(sequence)
         self._cue_index = -1
         self._cue_started_at = 0.0
         self._paused = False
@@ -83,7 +89,7 @@ class SequenceEngine:
         if next_index is None:
             return None
         self._cue_index = next_index
-        self._cue_started_at = time.time()
+        self._cue_started_at = self._clock.now()
         if self._rhythm_enabled:
             self._schedule_next_rhythm_tick(self._cue_started_at)
         return self.current_cue
@@ -95,23 +101,41 @@ class SequenceEngine:
         if previous_index is None:
             return None
         self._cue_index = previous_index
-        self._cue_started_at = time.time()
+        self._cue_started_at = self._clock.now()
+        if self._rhythm_enabled:
+            self._schedule_next_rhythm_tick(self._cue_started_at)
+        return self.current_cue
+
+    def goto(self, index: int) -> Cue | None:
+        if self._sequence is None or not 0 <= index < len(self._sequence.cues):
+            return None
+        self._cue_index = index
+        self._cue_started_at = self._clock.now()
         if self._rhythm_enabled:
             self._schedule_next_rhythm_tick(self._cue_started_at)
         return self.current_cue
 
+    def goto_cue_id(self, cue_id: str) -> Cue | None:
+        index = self._cue_positions.get(cue_id)
+        if index is None:
+            return None
+        return self.goto(index)
+
+    def goto_cue_number(self, cue_number: int) -> Cue | None:
+        return self.goto(cue_number - 1)
+
     def pause(self) -> None:
         self._paused = True
 
     def resume(self) -> None:
         self._paused = False
         if self._rhythm_enabled and self.current_cue is not None:
-            self._schedule_next_rhythm_tick(time.time())
+            self._schedule_next_rhythm_tick(self._clock.now())
 
     def set_rhythm_bpm(self, bpm: float) -> None:
         self._rhythm_bpm = max(1.0, min(300.0, float(bpm)))
         if self._rhythm_enabled and self.current_cue is not None:
-            self._schedule_next_rhythm_tick(time.time())
+            self._schedule_next_rhythm_tick(self._clock.now())
 
     def start_rhythm(self) -> Cue | None:
         self._rhythm_enabled = True
@@ -122,7 +146,7 @@ class SequenceEngine:
             self._cue_index = -1
             cue = self.go()
         elif not self._paused:
-            self._schedule_next_rhythm_tick(time.time())
+            self._schedule_next_rhythm_tick(self._clock.now())
         return cue
 
     def stop_rhythm(self) -> None:
@@ -135,9 +159,9 @@ class SequenceEngine:
             return None
         if self._rhythm_enabled:
             if self._next_rhythm_at <= 0.0:
-                self._schedule_next_rhythm_tick(self._cue_started_at or time.time())
+                self._schedule_next_rhythm_tick(self._cue_started_at or self._clock.now())
                 return None
-            if time.time() >= self._next_rhythm_at:
+            if self._clock.now() >= self._next_rhythm_at:
                 advanced_cue = self.go()
                 if advanced_cue is None:
                     self.stop_rhythm()
@@ -145,11 +169,25 @@ class SequenceEngine:
             return None
         if cue.trigger_mode != TriggerMode.AUTO:
             return None
-        elapsed_ms = (time.time() - self._cue_started_at) * 1000
+        elapsed_ms = (self._clock.now() - self._cue_started_at) * 1000
         if elapsed_ms >= cue.transition.hold_ms:
             return self.go()
         return None
 
+    def next_advance_at(self) -> float | None:
+        cue = self.current_cue
+        if cue is None or self._paused:
+            return None
+        if self._rhythm_enabled:
+            # An unscheduled rhythm tick is scheduled on the next poll, so that poll is due now.
+            return self._next_rhythm_at if self._next_rhythm_at > 0.0 else self._clock.now()
+        if cue.trigger_mode != TriggerMode.AUTO:
+            return None
+        return self._cue_started_at + cue.transition.hold_ms / 1000.0
+
+    def _index_cues(self, sequence: Sequence) -> None:
+        self._cue_positions = {cue.id: index for index, cue in enumerate(sequence.cues)}
+
     def _schedule_next_rhythm_tick(self, start_time: float) -> None:
         self._next_rhythm_at = start_time + (60.0 / self._rhythm_bpm)
 
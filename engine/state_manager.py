@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, MutableMapping
 from dataclasses import dataclass, field
 
-from .models import FixtureState, LiveOverride, Scene, Sequence
+from .events import EventBus, OutputChanged, OverrideToggled, PalettesChanged, SceneChanged, ScenesChanged, SequencesChanged, TransportChanged
+from .models import FixtureState, LiveOverride, Palette, Scene, Sequence
+from .palettes import PaletteStore
 
 
 @dataclass(slots=True)
 class EngineState:
-    scenes: dict[str, Scene] = field(default_factory=dict)
+    scenes: MutableMapping[str, Scene] = field(default_factory=dict)
     sequences: dict[str, Sequence] = field(default_factory=dict)
+    palettes: PaletteStore = field(default_factory=PaletteStore)
     current_scene_id: str | None = None
     preview_scene_id: str | None = None
     live_override: LiveOverride = field(default_factory=LiveOverride)
@@ -20,41 +24,138 @@ class EngineState:
 
 
 class EngineStateManager:
-    def __init__(self) -> None:
+    def __init__(self, events: EventBus | None = None) -> None:
         self.state = EngineState()
+        self.events = events or EventBus()
 
     def add_scene(self, scene: Scene) -> None:
-        self.state.scenes[scene.id] = scene
+        self.state.scenes[scene.id] = self.state.palettes.link_scene(scene)
+        self.events.publish(ScenesChanged(frozenset((scene.id,))))
+
+    def remove_scene(self, scene_id: str) -> None:
+        if self.state.scenes.pop(scene_id, None) is not None:
+            self.events.publish(ScenesChanged(frozenset((scene_id,))))
+
+    def replace_scenes(self, scenes: MutableMapping[str, Scene], palettes: PaletteStore | None = None) -> None:
+        scene_ids = frozenset(self.state.scenes) | frozenset(scenes)
+        self.state.palettes = palettes or PaletteStore()
+        if getattr(scenes, "is_materialized", None) is None:
+            for scene_id, scene in scenes.items():
+                linked = self.state.palettes.link_scene(scene)
+                if linked is not scene:
+                    scenes[scene_id] = linked
+        self.state.scenes = scenes
+        if scene_ids:
+            self.events.publish(ScenesChanged(scene_ids))
+
+    def clear_library(self) -> None:
+        scene_ids = frozenset(self.state.scenes)
+        sequence_ids = frozenset(self.state.sequences)
+        self.state.scenes = {}
+        self.state.palettes = PaletteStore()
+        self.state.sequences.clear()
+        if scene_ids:
+            self.events.publish(ScenesChanged(scene_ids))
+        if sequence_ids:
+            self.events.publish(SequencesChanged(sequence_ids))
+
+    def add_palette(self, palette: Palette) -> Palette:
+        self.state.palettes.add(palette)
+        self.events.publish(PalettesChanged(frozenset((palette.id,))))
+        return palette
+
+    def update_palette(self, palette_id: str, fixture_states: dict[int, FixtureState], *, name: str | None = None) -> Palette:
+        palette = self.state.palettes.update(palette_id, fixture_states, name=name)
+        self.events.publish(PalettesChanged(frozenset((palette_id,))))
+        return palette
 
     def set_sequence(self, sequence: Sequence) -> None:
         self.state.sequences[sequence.id] = sequence
+        self.events.publish(SequencesChanged(frozenset((sequence.id,))))
 
     def set_current_scene(self, scene_id: str | None) -> None:
+        changed = scene_id != self.state.current_scene_id
         self.state.current_scene_id = scene_id
-        self.state.dirty = False
+        self._set_dirty(False)
+        if changed:
+            self.events.publish(SceneChanged(scene_id))
 
     def set_preview_scene(self, scene_id: str | None) -> None:
         self.state.preview_scene_id = scene_id
 
-    def set_base_output(self, fixture_states: dict[int, FixtureState], *, dirty: bool = False) -> None:
+    def set_base_output(
+        self,
+        fixture_states: dict[int, FixtureState],
+        *,
+        dirty: bool = False,
+        changed_ids: Iterable[int] | None = None,
+    ) -> None:
+        previous = self.state.current_output
         self.state.base_output = fixture_states
         self.state.current_output = fixture_states
-        self.state.dirty = dirty
-
-    def set_output(self, fixture_states: dict[int, FixtureState], *, dirty: bool = False) -> None:
+        self._set_dirty(dirty)
+        self._publish_output_change(previous, fixture_states, changed_ids)
+
+    def set_output(
+        self,
+        fixture_states: dict[int, FixtureState],
+        *,
+        dirty: bool = False,
+        changed_ids: Iterable[int] | None = None,
+    ) -> None:
+        previous = self.state.current_output
         self.state.current_output = fixture_states
-        self.state.dirty = dirty
+        self._set_dirty(dirty)
+        self._publish_output_change(previous, fixture_states, changed_ids)
 
     def set_master_dimmer(self, value: float) -> None:
-        self.state.master_dimmer = max(0.0, min(1.0, value))
+        clamped = max(0.0, min(1.0, value))
+        if clamped != self.state.master_dimmer:
+            self.state.master_dimmer = clamped
+            self.events.publish(TransportChanged("master"))
 
     def set_blackout(self, enabled: bool) -> None:
-        self.state.blackout = enabled
+        if enabled != self.state.blackout:
+            self.state.blackout = enabled
+            self.events.publish(TransportChanged("blackout"))
 
     def apply_override(self, states: list[FixtureState]) -> None:
+        was_active = self.state.live_override.active
         self.state.live_override.set_states(states)
-        self.state.dirty = True
+        self._set_dirty(True)
+        if self.state.live_override.active != was_active:
+            self.events.publish(OverrideToggled(self.state.live_override.active))
 
     def clear_override(self) -> None:
+        was_active = self.state.live_override.active
         self.state.live_override.clear()
-        self.state.dirty = False
\ No newline at end of file
+        self._set_dirty(False)
+        if was_active:
+            self.events.publish(OverrideToggled(False))
+
+    def _set_dirty(self, dirty: bool) -> None:
+        if dirty != self.state.dirty:
+            self.state.dirty = dirty
+            self.events.publish(TransportChanged("dirty"))
+
+    def _publish_output_change(
+        self,
+        previous: dict[int, FixtureState],
+        current: dict[int, FixtureState],
+        changed_ids: Iterable[int] | None = None,
+    ) -> None:
+        if previous is current:
+            return
+        if changed_ids is not None:
+            changed_ids = frozenset(changed_ids)
+            if changed_ids:
+                self.events.publish(OutputChanged(changed_ids))
+            return
+        changed = {
+            fixture_id
+            for fixture_id, state in current.items()
+            if previous.get(fixture_id) != state
+        }
+        changed.update(fixture_id for fixture_id in previous if fixture_id not in current)
+        if changed:
+            self.events.publish(OutputChanged(frozenset(changed)))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from .models import FixtureState, Scene, Sequence
+
+CHECKPOINT_INTERVAL = 32
+
+
+class TrackingEngine:
+    def __init__(self, checkpoint_interval: int = CHECKPOINT_INTERVAL) -> None:
+        self._checkpoint_interval = max(1, checkpoint_interval)
+        self._sequence: Sequence | None = None
+        self._moves: list[dict[int, FixtureState]] = []
+        self._checkpoints: list[dict[int, FixtureState]] = []
+        self._cursor_index = -1
+        self._cursor_state: dict[int, FixtureState] = {}
+
+    @property
+    def sequence(self) -> Sequence | None:
+        return self._sequence
+
+    def build(self, sequence: Sequence, scenes: dict[str, Scene]) -> None:
+        self._sequence = sequence
+        self._moves = []
+        self._checkpoints = []
+        deltas = [self.cue_delta(scenes.get(cue.scene_id)) for cue in sequence.cues]
+        tracked: dict[int, FixtureState] = {
+            fixture_id: FixtureState(fixture_id=fixture_id)
+            for delta in deltas
+            for fixture_id in delta
+        }
+        for index, delta in enumerate(deltas):
+            moved = {fixture_id: state for fixture_id, state in delta.items() if tracked[fixture_id] != state}
+            tracked.update(moved)
+            self._moves.append(moved)
+            if index % self._checkpoint_interval == 0:
+                self._checkpoints.append(dict(tracked))
+        self._cursor_index = -1
+        self._cursor_state = {}
+
+    def tracked_state(self, cue_index: int) -> dict[int, FixtureState]:
+        if not 0 <= cue_index < len(self._moves):
+            raise IndexError(cue_index)
+        if self._cursor_index >= 0 and self._cursor_index <= cue_index < self._cursor_index + self._checkpoint_interval:
+            start_index = self._cursor_index
+            state = dict(self._cursor_state)
+        else:
+            start_index = cue_index - cue_index % self._checkpoint_interval
+            state = dict(self._checkpoints[start_index // self._checkpoint_interval])
+        for index in range(start_index + 1, cue_index + 1):
+            state.update(self._moves[index])
+        self._cursor_index = cue_index
+        self._cursor_state = state
+        return dict(state)
+
+    def moves(self, cue_index: int) -> frozenset[int]:
+        return frozenset(self._moves[cue_index])
+
+    def final_state(self) -> dict[int, FixtureState]:
+        return self.tracked_state(len(self._moves) - 1) if self._moves else {}
+
+    def cue_delta(self, scene: Scene | None) -> dict[int, FixtureState]:
+        if scene is None:
+            return {}
+        return {fixture_id: state.normalized() for fixture_id, state in scene.fixture_states.items()}
+
+    def diff(self, previous: dict[int, FixtureState], current: dict[int, FixtureState]) -> dict[int, FixtureState]:
+        return {
+            fixture_id: state.normalized()
+            for fixture_id, state in current.items()
+            if previous.get(fixture_id, FixtureState(fixture_id=fixture_id)) != state.normalized()
+        }
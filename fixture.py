@@ -11,12 +11,13 @@ class Fixture:
         BLUE = 3
         WHITE = 4
 
-    def __init__(self, fixture_id : int, start_address : int, num_channels : int, position: tuple[int, int] = (0, 0), angle: int = 0):
+    def __init__(self, fixture_id : int, start_address : int, num_channels : int, position: tuple[int, int] = (0, 0), angle: int = 0, universe: int = 1):
         self.fixture_id = fixture_id  # Unique identifier for the fixture
         self.start_address = start_address  # DMX start address (1-512)
         self.num_channels = num_channels  # Number of DMX channels used
         self.position = position  # (x, y) tuple for layout position
         self.angle = angle  # Direction in degrees (0-359)
+        self.universe = universe  # DMX universe the fixture is patched into (1-based)
         
     def get_channel_address(self, channel: "int | Fixture.Channels") -> int:
         """Get the DMX address for a specific channel (0-based)"""
@@ -1,13 +1,34 @@
 from __future__ import annotations
 
+import base64
 import math
+import queue
+import struct
 import time
 import tkinter as tk
+import zlib
+from collections.abc import Callable
+from concurrent.futures import Future
+from difflib import SequenceMatcher
 from tkinter import filedialog, messagebox, simpledialog, ttk
 
-from engine import EngineController, FixtureState, TriggerMode
+from engine import (
+    CueAdvanced,
+    EngineController,
+    FixtureState,
+    OutputChanged,
+    OverrideToggled,
+    PalettesChanged,
+    PatchChanged,
+    SceneChanged,
+    ScenesChanged,
+    SequencesChanged,
+    TransportChanged,
+    TriggerMode,
+)
+from engine.monitor import DMX_UNIVERSE_SIZE, channel_owners, compose_frame
 from fixture import Fixture
-from storage import ShowRepository
+from storage import ShowJournal, ShowRepository
 
 
 STAGE_REFERENCE_WIDTH = 620
@@ -15,6 +36,51 @@ STAGE_REFERENCE_HEIGHT = 360
 RHYTHM_MIN_BPM = 40
 RHYTHM_MAX_BPM = 240
 RHYTHM_TAP_RESET_SECONDS = 2.0
+VIEW_STATUS = "status"
+VIEW_LIVE_STAGE = "live_stage"
+VIEW_SETUP_STAGE = "setup_stage"
+VIEW_SCENE_STAGE = "scene_stage"
+VIEW_SHOW_STAGE = "show_stage"
+VIEW_MONITOR = "monitor"
+VIEW_PERFORMANCE = "performance"
+ALL_VIEWS = frozenset((VIEW_STATUS, VIEW_LIVE_STAGE, VIEW_SETUP_STAGE, VIEW_SCENE_STAGE, VIEW_SHOW_STAGE, VIEW_MONITOR, VIEW_PERFORMANCE))
+VIEW_MIN_INTERVAL_MS = {
+    VIEW_STATUS: 200,
+    VIEW_LIVE_STAGE: 0,
+    VIEW_SETUP_STAGE: 100,
+    VIEW_SCENE_STAGE: 100,
+    VIEW_SHOW_STAGE: 0,
+    VIEW_MONITOR: 0,
+    VIEW_PERFORMANCE: 500,
+}
+TICK_INTERVAL_MS = 50
+SAVE_POLL_INTERVAL_MS = 100
+PERFORMANCE_OK_COLOR = "#cfe3f5"
+PERFORMANCE_ALERT_COLOR = "#ff6b5e"
+MONITOR_COLUMNS = 32
+MONITOR_CELL_SIZE = (22, 18)
+CHANNEL_UNPATCHED = 0
+CHANNEL_PATCHED = 1
+CHANNEL_CONFLICT = 2
+
+WHEEL_BACKGROUND_RGBA = bytes((0x0D, 0x14, 0x1B, 0xFF))
+
+_wheel_images: dict[int, tk.PhotoImage] = {}
+
+
+def _encode_png_rgba(width: int, height: int, rows: list[bytes]) -> bytes:
+    def chunk(tag: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload))
+
+    raw = b"".join(b"\x00" + row for row in rows)
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+            chunk(b"IDAT", zlib.compress(raw, 6)),
+            chunk(b"IEND", b""),
+        ]
+    )
 
 
 class ColorWheel(tk.Canvas):
@@ -31,21 +97,8 @@ class ColorWheel(tk.Canvas):
 
     def _draw_wheel(self) -> None:
         self.delete("all")
-        self.create_oval(0, 0, self.size, self.size, fill="#0d141b", outline="")
-        for angle in range(360):
-            red, green, blue = self._hsv_to_rgb(angle / 360.0, 1.0, 1.0)
-            color = f"#{red:02x}{green:02x}{blue:02x}"
-            self.create_arc(
-                self.center - self.radius,
-                self.center - self.radius,
-                self.center + self.radius,
-                self.center + self.radius,
-                start=angle,
-                extent=1.5,
-                style=tk.PIESLICE,
-                outline=color,
-                fill=color,
-            )
+        self._marker = None
+        self.create_image(0, 0, image=self._wheel_image(), anchor="nw")
         inner_radius = int(self.radius * 0.45)
         self.create_oval(
             self.center - inner_radius,
@@ -57,6 +110,38 @@ class ColorWheel(tk.Canvas):
             width=2,
         )
 
+    def _wheel_image(self) -> tk.PhotoImage:
+        # Every wheel of the same size shares one rendered image instead of drawing hundreds of arc items.
+        image = _wheel_images.get(self.size)
+        if image is None:
+            png = _encode_png_rgba(self.size, self.size, self._render_wheel_rows(self.size, self.radius))
+            image = _wheel_images[self.size] = tk.PhotoImage(master=self, data=base64.b64encode(png), format="png")
+        return image
+
+    @staticmethod
+    def _render_wheel_rows(size: int, radius: int) -> list[bytes]:
+        center = size // 2
+        hues = [bytes((*ColorWheel._hsv_to_rgb(angle / 360.0, 1.0, 1.0), 0xFF)) for angle in range(360)]
+        transparent = bytes(4)
+        outer_squared = (size / 2) ** 2
+        radius_squared = radius ** 2
+        rows = []
+        for y in range(size):
+            dy = center - y
+            dy_squared = dy * dy
+            row = bytearray()
+            for x in range(size):
+                dx = x - center
+                distance_squared = dx * dx + dy_squared
+                if distance_squared <= radius_squared:
+                    row += hues[int(math.degrees(math.atan2(dy, dx))) % 360]
+                elif distance_squared <= outer_squared:
+                    row += WHEEL_BACKGROUND_RGBA
+                else:
+                    row += transparent
+            rows.append(bytes(row))
+        return rows
+
     def _handle_pick(self, event) -> None:
         dx = event.x - self.center
         dy = event.y - self.center
@@ -66,7 +151,7 @@ class ColorWheel(tk.Canvas):
         if distance < self.radius * 0.1:
             red = green = blue = 255
         else:
-            # Canvas arc angles are measured from the right and increase counterclockwise.
+            # Hue is measured from the right and increases counterclockwise, as in the rendered wheel.
             # Screen Y grows downward, so negate dy to map pointer position back to the same hue.
             hue = math.degrees(math.atan2(-dy, dx)) % 360
             saturation = min(1.0, max(0.0, distance / self.radius))
@@ -77,11 +162,13 @@ class ColorWheel(tk.Canvas):
             self.callback(red, green, blue)
 
     def _set_marker(self, x: int, y: int) -> None:
-        if self._marker is not None:
-            self.delete(self._marker)
-        self._marker = self.create_oval(x - 6, y - 6, x + 6, y + 6, outline="#ffffff", width=2)
+        if self._marker is None:
+            self._marker = self.create_oval(x - 6, y - 6, x + 6, y + 6, outline="#ffffff", width=2)
+        else:
+            self.coords(self._marker, x - 6, y - 6, x + 6, y + 6)
 
-    def _hsv_to_rgb(self, hue: float, saturation: float, value: float) -> tuple[int, int, int]:
+    @staticmethod
+    def _hsv_to_rgb(hue: float, saturation: float, value: float) -> tuple[int, int, int]:
         if saturation == 0.0:
             gray = int(value * 255)
             return gray, gray, gray
@@ -109,6 +196,67 @@ class ColorWheel(tk.Canvas):
         return int(red * 255), int(green * 255), int(blue * 255)
 
 
+def _format_ms(value: float | None) -> str:
+    return "--" if value is None else f"{value:.1f} ms"
+
+
+def _color_ramp(start: tuple[int, int, int], end: tuple[int, int, int]) -> list[str]:
+    return [
+        "#%02x%02x%02x" % tuple(round(low + (high - low) * value / 255) for low, high in zip(start, end))
+        for value in range(256)
+    ]
+
+
+class UniverseMonitorView(tk.Canvas):
+    RAMPS = {
+        CHANNEL_UNPATCHED: _color_ramp((0x16, 0x1E, 0x27), (0x9A, 0xA5, 0xB1)),
+        CHANNEL_PATCHED: _color_ramp((0x1F, 0x2B, 0x38), (0xFF, 0xB7, 0x03)),
+        CHANNEL_CONFLICT: _color_ramp((0x4A, 0x10, 0x16), (0xFF, 0x4D, 0x4D)),
+    }
+
+    def __init__(self, parent, *, on_hover=None, columns: int = MONITOR_COLUMNS, cell_size: tuple[int, int] = MONITOR_CELL_SIZE, **kwargs):
+        self.columns = columns
+        self.rows = DMX_UNIVERSE_SIZE // columns
+        self.cell_width, self.cell_height = cell_size
+        width = columns * self.cell_width
+        height = self.rows * self.cell_height
+        super().__init__(parent, width=width, height=height, highlightthickness=0, bg="#0d141b", **kwargs)
+        self._on_hover = on_hover
+        # One pixel per channel, zoomed into the displayed image by Tk, so a frame costs two image calls.
+        self._frame_image = tk.PhotoImage(master=self, width=columns, height=self.rows)
+        self._display_image = tk.PhotoImage(master=self, width=width, height=height)
+        self._drawn: tuple[bytes, bytes] | None = None
+        self.create_image(0, 0, image=self._display_image, anchor="nw")
+        for column in range(1, columns):
+            self.create_line(column * self.cell_width, 0, column * self.cell_width, height, fill="#0d141b" if column % 8 else "#3e4c59")
+        for row in range(1, self.rows):
+            self.create_line(0, row * self.cell_height, width, row * self.cell_height, fill="#0d141b")
+        self.bind("<Motion>", self._handle_motion)
+        self.bind("<Leave>", lambda _event: self._on_hover(None) if self._on_hover is not None else None)
+
+    def set_frame(self, frame: bytes, categories: bytes) -> None:
+        if self._drawn == (frame, categories):
+            return
+        self._drawn = (frame, categories)
+        ramps = self.RAMPS
+        rows = []
+        for start in range(0, DMX_UNIVERSE_SIZE, self.columns):
+            rows.append("{" + " ".join(ramps[categories[channel]][frame[channel]] for channel in range(start, start + self.columns)) + "}")
+        self._frame_image.put(" ".join(rows))
+        self._display_image.tk.call(self._display_image, "copy", self._frame_image, "-zoom", self.cell_width, self.cell_height)
+
+    def channel_at(self, x: int, y: int) -> int | None:
+        column = x // self.cell_width
+        row = y // self.cell_height
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return None
+        return row * self.columns + column
+
+    def _handle_motion(self, event) -> None:
+        if self._on_hover is not None:
+            self._on_hover(self.channel_at(event.x, event.y))
+
+
 class StagePlot(tk.Canvas):
     def __init__(self, parent, *, on_select=None, on_move=None, reference_size: tuple[int, int] | None = None, marker_scale: float = 1.0, show_address: bool = True, show_fixture_id: bool = True, normalize_positions: bool = False, draggable: bool = False, **kwargs):
         super().__init__(parent, highlightthickness=0, **kwargs)
@@ -125,6 +273,9 @@ class StagePlot(tk.Canvas):
         self._draggable = draggable
         self._drag_fixture_id: int | None = None
         self._fixture_positions: dict[int, tuple[int, int]] = {}
+        self._layout_key: tuple | None = None
+        self._marker_items: dict[int, tuple[int, int]] = {}
+        self._drawn_appearance: dict[int, tuple[str, str, str]] = {}
         self.bind("<Button-1>", self._handle_click)
         self.bind("<B1-Motion>", self._handle_drag)
         self.bind("<ButtonRelease-1>", self._handle_release)
@@ -139,16 +290,25 @@ class StagePlot(tk.Canvas):
         self._fixtures = fixtures
         self._states = states
         self._selected_ids = selected_ids or set()
-        self.redraw()
+        if self._current_layout_key() != self._layout_key:
+            self.redraw()
+            return
+        for fixture in self._fixtures:
+            appearance = self._fixture_appearance(fixture.fixture_id)
+            if self._drawn_appearance.get(fixture.fixture_id) == appearance:
+                continue
+            outer_item, inner_item = self._marker_items[fixture.fixture_id]
+            outer_fill, inner_fill, outline = appearance
+            self.itemconfigure(outer_item, fill=outer_fill, outline=outline)
+            self.itemconfigure(inner_item, fill=inner_fill)
+            self._drawn_appearance[fixture.fixture_id] = appearance
 
     def redraw(self) -> None:
         self.delete("all")
-        width = self.winfo_width()
-        height = self.winfo_height()
-        if width <= 1:
-            width = int(self.cget("width"))
-        if height <= 1:
-            height = int(self.cget("height"))
+        self._layout_key = self._current_layout_key()
+        self._marker_items = {}
+        self._drawn_appearance = {}
+        width, height = self._canvas_size()
         outer_radius = max(4, round(18 * self._marker_scale))
         inner_radius = max(2, round(10 * self._marker_scale))
         outline_width = max(1, round(3 * self._marker_scale))
@@ -173,11 +333,12 @@ class StagePlot(tk.Canvas):
         for index, fixture in enumerate(self._fixtures):
             x, y = self._display_position(index, fixture, width, height, outer_radius, normalized_bounds)
             self._fixture_positions[fixture.fixture_id] = (x, y)
-            state = self._states.get(fixture.fixture_id, FixtureState(fixture_id=fixture.fixture_id))
-            outer_fill, inner_fill = self._fixture_colors(state)
-            outline = "#ffb703" if fixture.fixture_id in self._selected_ids else "#bfc7d5"
-            self.create_oval(x - outer_radius, y - outer_radius, x + outer_radius, y + outer_radius, fill=outer_fill, outline=outline, width=outline_width, tags=(f"fixture-{fixture.fixture_id}", "fixture"))
-            self.create_oval(x - inner_radius, y - inner_radius, x + inner_radius, y + inner_radius, fill=inner_fill, outline="", tags=(f"fixture-{fixture.fixture_id}", "fixture"))
+            appearance = self._fixture_appearance(fixture.fixture_id)
+            outer_fill, inner_fill, outline = appearance
+            outer_item = self.create_oval(x - outer_radius, y - outer_radius, x + outer_radius, y + outer_radius, fill=outer_fill, outline=outline, width=outline_width, tags=(f"fixture-{fixture.fixture_id}", "fixture"))
+            inner_item = self.create_oval(x - inner_radius, y - inner_radius, x + inner_radius, y + inner_radius, fill=inner_fill, outline="", tags=(f"fixture-{fixture.fixture_id}", "fixture"))
+            self._marker_items[fixture.fixture_id] = (outer_item, inner_item)
+            self._drawn_appearance[fixture.fixture_id] = appearance
             if self._show_fixture_id:
                 self.create_text(x, y, text=str(fixture.fixture_id), fill="#0b1118", font=("Segoe UI", fixture_font_size, "bold"), tags=(f"fixture-{fixture.fixture_id}", "fixture"))
             if self._show_address:
@@ -230,6 +391,28 @@ class StagePlot(tk.Canvas):
         y = 40 + int((row + 0.5) * usable_height / rows)
         return x, y
 
+    def _canvas_size(self) -> tuple[int, int]:
+        width = self.winfo_width()
+        height = self.winfo_height()
+        if width <= 1:
+            width = int(self.cget("width"))
+        if height <= 1:
+            height = int(self.cget("height"))
+        return width, height
+
+    def _current_layout_key(self) -> tuple:
+        # Colours and selection are patched in place; anything that moves or relabels a marker rebuilds the canvas.
+        return (
+            self._canvas_size(),
+            tuple((fixture.fixture_id, fixture.position, fixture.start_address) for fixture in self._fixtures),
+        )
+
+    def _fixture_appearance(self, fixture_id: int) -> tuple[str, str, str]:
+        state = self._states.get(fixture_id)
+        outer_fill, inner_fill = self._fixture_colors(state if state is not None else FixtureState(fixture_id=fixture_id))
+        outline = "#ffb703" if fixture_id in self._selected_ids else "#bfc7d5"
+        return outer_fill, inner_fill, outline
+
     def _fixture_colors(self, state: FixtureState) -> tuple[str, str]:
         dimmer = state.intensity / 255 if state.intensity else 0
         red = int(state.red * dimmer)
@@ -260,12 +443,7 @@ class StagePlot(tk.Canvas):
     def _handle_drag(self, event) -> None:
         if self._drag_fixture_id is None or self._on_move is None:
             return
-        width = self.winfo_width()
-        height = self.winfo_height()
-        if width <= 1:
-            width = int(self.cget("width"))
-        if height <= 1:
-            height = int(self.cget("height"))
+        width, height = self._canvas_size()
         outer_radius = max(4, round(18 * self._marker_scale))
         clamped_x, clamped_y = self._clamp_display_position(event.x, event.y, width, height, outer_radius)
         position = self._display_to_position(clamped_x, clamped_y, width, height)
@@ -309,7 +487,69 @@ class StagePlot(tk.Canvas):
         )
 
     def _on_resize(self, _event=None) -> None:
-        self.redraw()
+        if self._current_layout_key() != self._layout_key:
+            self.redraw()
+
+
+class KeyedListbox(tk.Listbox):
+    def __init__(self, parent, **kwargs):
+        kwargs.setdefault("exportselection", False)
+        super().__init__(parent, **kwargs)
+        self._items: list[tuple[str, str]] = []
+        self._rows: list[tuple[str, str]] = []
+        self._row_index: dict[str, int] = {}
+        self._filter_text = ""
+
+    @property
+    def keys(self) -> list[str]:
+        return [key for key, _label in self._rows]
+
+    def set_items(self, items: list[tuple[str, str]]) -> None:
+        self._items = items
+        self._apply()
+
+    def set_filter(self, text: str) -> None:
+        text = text.strip().lower()
+        if text != self._filter_text:
+            self._filter_text = text
+            self._apply()
+
+    def key_at(self, index: int) -> str | None:
+        return self._rows[index][0] if 0 <= index < len(self._rows) else None
+
+    def selected_key(self) -> str | None:
+        selection = self.curselection()
+        return self.key_at(selection[0]) if selection else None
+
+    def select_key(self, key: str | None) -> bool:
+        index = self._row_index.get(key) if key is not None else None
+        if index is None:
+            self.selection_clear(0, tk.END)
+            return False
+        if self.curselection() != (index,):
+            self.selection_clear(0, tk.END)
+            self.selection_set(index)
+            self.see(index)
+        return True
+
+    def _apply(self) -> None:
+        needle = self._filter_text
+        rows = [item for item in self._items if needle in item[1].lower()] if needle else list(self._items)
+        if rows == self._rows:
+            return
+        selected = self.selected_key()
+        # Rows are keyed by (id, label), so a rename or reorder only touches the rows that moved.
+        matcher = SequenceMatcher(None, self._rows, rows, autojunk=False)
+        for tag, first, last, new_first, new_last in reversed(matcher.get_opcodes()):
+            if tag == "equal":
+                continue
+            if last > first:
+                self.delete(first, last - 1)
+            if new_last > new_first:
+                self.insert(first, *(label for _key, label in rows[new_first:new_last]))
+        self._rows = rows
+        self._row_index = {key: index for index, (key, _label) in enumerate(rows)}
+        self.select_key(selected)
 
 
 class MainApplication(ttk.Frame):
@@ -320,6 +560,8 @@ class MainApplication(ttk.Frame):
         self.repository = repository
         self.transport_error = transport_error
         self.show_file_path: str | None = None
+        self.journal: ShowJournal | None = None
+        self._journal_errors: queue.SimpleQueue[Exception] = queue.SimpleQueue()
         self.scene_selected_fixture_ids: set[int] = set()
         self.show_selected_fixture_ids: set[int] = set()
         self.setup_selected_fixture_id: int | None = None
@@ -327,9 +569,10 @@ class MainApplication(ttk.Frame):
         self.selected_sequence_id: str | None = None
         self.sequence_paused = False
         self._rhythm_tap_times: list[float] = []
-        self.scene_order: list[str] = []
-        self.sequence_order: list[str] = []
-        self.cue_order: list[str] = []
+        self.scene_name_to_id: dict[str, str] = {}
+        self._fixture_rows: dict[str, tuple] = {}
+        self._sorted_scenes_key: dict[str, str] | None = None
+        self._sorted_scenes: list[tuple[str, str]] = []
 
         self.output_status_var = tk.StringVar()
         self.current_scene_var = tk.StringVar()
@@ -340,18 +583,38 @@ class MainApplication(ttk.Frame):
         self.transport_status_var = tk.StringVar()
         self.override_status_var = tk.StringVar()
         self.sequence_cyclic_var = tk.BooleanVar(value=False)
+        self.sequence_tracking_var = tk.BooleanVar(value=False)
         self.scene_auto_apply_var = tk.BooleanVar(value=False)
         self.override_auto_apply_var = tk.BooleanVar(value=False)
         self.rhythm_bpm_var = tk.IntVar(value=int(round(self.controller.rhythm_bpm)))
         self._suspend_editor_callbacks = False
+        self._pending_editors: set[str] = set()
+        self._editor_flush_job: str | None = None
+        self._stale_views: set[str] = set(ALL_VIEWS)
+        self._view_refreshed_at: dict[str, float] = {}
+        self.scene_filter_var = tk.StringVar()
+        self.cue_filter_var = tk.StringVar()
+        self.performance_overlay_var = tk.BooleanVar(value=False)
+        self.monitor_universe_var = tk.StringVar(value="1")
+        self.monitor_source_var = tk.StringVar()
+        self.monitor_channel_var = tk.StringVar(value="Hover a channel to inspect it.")
+        self._monitor_frame: bytes = bytes(DMX_UNIVERSE_SIZE)
+        self._monitor_frame_count = -1
+        self._monitor_patch_key: tuple | None = None
+        self._monitor_owners: list[list[int]] = [[] for _ in range(DMX_UNIVERSE_SIZE)]
+        self._monitor_categories: bytes = bytes(DMX_UNIVERSE_SIZE)
+        self._view_tabs: dict[str, ttk.Frame] = {}
+        self._tab_builders: dict[str, Callable[[], None]] = {}
 
         self.scene_editor_vars = self._create_level_vars()
         self.override_editor_vars = self._create_level_vars()
         self._bind_level_var_traces(self.scene_editor_vars, "scene")
         self._bind_level_var_traces(self.override_editor_vars, "override")
 
+        self.controller.metrics.budget_ms = TICK_INTERVAL_MS
         self._bootstrap_defaults()
         self._build_ui()
+        self._subscribe_engine_events()
         self._refresh_lists()
         self._refresh_views()
         self._schedule_tick()
@@ -409,11 +672,35 @@ class MainApplication(ttk.Frame):
         self.notebook.add(self.scene_tab, text="Scene Editor")
         self.notebook.add(self.sequence_tab, text="Sequences")
         self.notebook.add(self.show_tab, text="Show Mode")
+        self.monitor_tab = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(self.monitor_tab, text="DMX Monitor")
 
-        self._build_setup_tab()
-        self._build_scene_tab()
-        self._build_sequence_tab()
+        # Show Mode is what an operator needs first, especially when restarting mid-show; the other tabs are built on first visit.
         self._build_show_tab()
+        self._tab_builders = {
+            str(self.setup_tab): self._build_setup_tab,
+            str(self.scene_tab): self._build_scene_tab,
+            str(self.sequence_tab): self._build_sequence_tab,
+            str(self.monitor_tab): self._build_monitor_tab,
+        }
+        self._view_tabs = {
+            VIEW_SETUP_STAGE: self.setup_tab,
+            VIEW_SCENE_STAGE: self.scene_tab,
+            VIEW_SHOW_STAGE: self.show_tab,
+            VIEW_MONITOR: self.monitor_tab,
+        }
+        self.notebook.select(self.show_tab)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+    def _on_tab_changed(self, _event=None) -> None:
+        build = self._tab_builders.pop(self.notebook.select(), None)
+        if build is not None:
+            build()
+            self._refresh_lists()
+        self._flush_stale_views(force=True)
+
+    def _is_tab_built(self, tab: ttk.Frame) -> bool:
+        return str(tab) not in self._tab_builders
 
     def _build_top_bar(self, parent) -> None:
         panel = ttk.LabelFrame(parent, text="Show Control", padding=10)
@@ -469,6 +756,22 @@ class MainApplication(ttk.Frame):
             normalize_positions=True,
         )
         self.live_fixture_stage.place(x=0, y=0, width=STAGE_REFERENCE_WIDTH, height=STAGE_REFERENCE_HEIGHT)
+        self.performance_overlay = tk.Label(
+            self.live_fixture_stage_host,
+            justify="left",
+            anchor="nw",
+            font=("Consolas", 9),
+            bg="#0d141b",
+            fg=PERFORMANCE_OK_COLOR,
+            padx=6,
+            pady=4,
+        )
+        ttk.Checkbutton(
+            panel,
+            text="Performance overlay",
+            variable=self.performance_overlay_var,
+            command=self._on_performance_overlay_toggled,
+        ).grid(row=1, column=0, sticky="w", pady=(8, 0))
 
     def _build_setup_tab(self) -> None:
         self.setup_tab.grid_columnconfigure(1, weight=1)
@@ -538,12 +841,18 @@ class MainApplication(ttk.Frame):
         center.grid_columnconfigure(0, weight=1)
 
         ttk.Label(left, text="Scenes", font=("Segoe UI", 11, "bold")).grid(row=0, column=0, sticky="w")
-        self.scene_listbox = tk.Listbox(left, height=12, exportselection=False)
-        self.scene_listbox.grid(row=1, column=0, sticky="nsew", pady=(8, 8))
+        scene_filter = ttk.Frame(left)
+        scene_filter.grid(row=1, column=0, sticky="ew", pady=(8, 0))
+        scene_filter.grid_columnconfigure(1, weight=1)
+        ttk.Label(scene_filter, text="Filter").grid(row=0, column=0, sticky="w", padx=(0, 6))
+        ttk.Entry(scene_filter, textvariable=self.scene_filter_var).grid(row=0, column=1, sticky="ew")
+        self.scene_filter_var.trace_add("write", lambda *_args: self.scene_listbox.set_filter(self.scene_filter_var.get()))
+        self.scene_listbox = KeyedListbox(left, height=12)
+        self.scene_listbox.grid(row=2, column=0, sticky="nsew", pady=(8, 8))
         self.scene_listbox.bind("<<ListboxSelect>>", self._on_scene_selected)
 
         scene_buttons = ttk.Frame(left)
-        scene_buttons.grid(row=2, column=0, sticky="ew")
+        scene_buttons.grid(row=3, column=0, sticky="ew")
         ttk.Button(scene_buttons, text="New", command=self._create_scene).grid(row=0, column=0, padx=(0, 6))
         ttk.Button(scene_buttons, text="Duplicate", command=self._duplicate_scene).grid(row=0, column=1, padx=(0, 6))
         ttk.Button(scene_buttons, text="Rename", command=self._rename_scene).grid(row=0, column=2, padx=(0, 6))
@@ -583,7 +892,7 @@ class MainApplication(ttk.Frame):
         right.grid(row=0, column=2, sticky="nse")
 
         ttk.Label(left, text="Sequences", font=("Segoe UI", 11, "bold")).grid(row=0, column=0, sticky="w")
-        self.sequence_listbox = tk.Listbox(left, height=10, exportselection=False)
+        self.sequence_listbox = KeyedListbox(left, height=10)
         self.sequence_listbox.grid(row=1, column=0, pady=(8, 8), sticky="nsew")
         self.sequence_listbox.bind("<<ListboxSelect>>", self._on_sequence_selected)
         seq_buttons = ttk.Frame(left)
@@ -592,8 +901,14 @@ class MainApplication(ttk.Frame):
         ttk.Button(seq_buttons, text="Load To Show", command=self._load_selected_sequence).grid(row=0, column=1)
 
         ttk.Label(center, text="Cue Stack", font=("Segoe UI", 11, "bold")).grid(row=0, column=0, sticky="w")
-        self.cue_listbox = tk.Listbox(center, height=16, exportselection=False)
+        cue_filter = ttk.Frame(center)
+        cue_filter.grid(row=0, column=0, sticky="e")
+        ttk.Label(cue_filter, text="Filter").pack(side="left", padx=(0, 6))
+        ttk.Entry(cue_filter, textvariable=self.cue_filter_var, width=18).pack(side="left")
+        self.cue_filter_var.trace_add("write", lambda *_args: self.cue_listbox.set_filter(self.cue_filter_var.get()))
+        self.cue_listbox = KeyedListbox(center, height=16)
         self.cue_listbox.grid(row=1, column=0, sticky="nsew", pady=(8, 0))
+        self.cue_listbox.bind("<Double-Button-1>", self._go_to_selected_cue)
 
         form = ttk.LabelFrame(right, text="Cue")
         form.grid(row=0, column=0, sticky="ne")
@@ -602,7 +917,10 @@ class MainApplication(ttk.Frame):
         self.sequence_fade_ms_var = tk.IntVar(value=1500)
         self.sequence_hold_ms_var = tk.IntVar(value=2000)
         self.sequence_trigger_var = tk.StringVar(value=TriggerMode.MANUAL.value)
-        ttk.Checkbutton(form, text="Cyclic sequence", variable=self.sequence_cyclic_var, command=self._toggle_selected_sequence_cyclic).grid(row=0, column=0, sticky="w", padx=8, pady=(8, 6))
+        toggles = ttk.Frame(form)
+        toggles.grid(row=0, column=0, sticky="w", padx=8, pady=(8, 6))
+        ttk.Checkbutton(toggles, text="Cyclic sequence", variable=self.sequence_cyclic_var, command=self._toggle_selected_sequence_cyclic).pack(side="left")
+        ttk.Checkbutton(toggles, text="Tracking", variable=self.sequence_tracking_var, command=self._toggle_selected_sequence_tracking).pack(side="left", padx=(12, 0))
         ttk.Label(form, text="Scene").grid(row=1, column=0, sticky="w")
         self.sequence_scene_combo = ttk.Combobox(form, textvariable=self.sequence_scene_var, state="readonly", width=22)
         self.sequence_scene_combo.grid(row=2, column=0, sticky="ew", pady=(0, 6), padx=8)
@@ -675,6 +993,25 @@ class MainApplication(ttk.Frame):
         self.override_color_wheel = ColorWheel(override_color_frame, callback=self._on_override_color_picked, bg="#111821")
         self.override_color_wheel.grid(row=0, column=0, padx=8, pady=8)
 
+    def _build_monitor_tab(self) -> None:
+        self.monitor_tab.grid_columnconfigure(0, weight=1)
+
+        header = ttk.Frame(self.monitor_tab)
+        header.grid(row=0, column=0, sticky="ew")
+        ttk.Label(header, text="Universe").grid(row=0, column=0, padx=(0, 6))
+        self.monitor_universe_combo = ttk.Combobox(header, textvariable=self.monitor_universe_var, values=["1"], width=6, state="readonly")
+        self.monitor_universe_combo.grid(row=0, column=1, padx=(0, 16))
+        self.monitor_universe_combo.bind("<<ComboboxSelected>>", lambda _event: self._refresh_views())
+        ttk.Label(header, textvariable=self.monitor_source_var).grid(row=0, column=2, sticky="w")
+
+        self.universe_monitor = UniverseMonitorView(self.monitor_tab, on_hover=self._on_monitor_hover)
+        self.universe_monitor.grid(row=1, column=0, sticky="nw", pady=(10, 6))
+        ttk.Label(self.monitor_tab, textvariable=self.monitor_channel_var).grid(row=2, column=0, sticky="w")
+        ttk.Label(
+            self.monitor_tab,
+            text="Amber: patched channels. Grey: unpatched. Red: channels claimed by more than one fixture.",
+        ).grid(row=3, column=0, sticky="w", pady=(4, 0))
+
     def _build_level_editor(self, parent, variables: dict[str, tk.IntVar]) -> None:
         for row_index, label in enumerate(["Intensity", "Red", "Green", "Blue", "White"]):
             key = label.lower()
@@ -705,10 +1042,160 @@ class MainApplication(ttk.Frame):
 
     def _schedule_tick(self) -> None:
         self.controller.tick()
-        self._refresh_views()
-        self.root.after(50, self._schedule_tick)
+        while not self._journal_errors.empty():
+            self.root.after_idle(messagebox.showerror, "Save Error", str(self._journal_errors.get()))
+        if self.controller.monitor.frame_count(self._monitor_universe()) != self._monitor_frame_count:
+            self._mark_views_stale((VIEW_MONITOR,))
+        if self.performance_overlay_var.get():
+            self._mark_views_stale((VIEW_PERFORMANCE,))
+        self._flush_stale_views()
+        self.root.after(TICK_INTERVAL_MS, self._schedule_tick)
+
+    def _subscribe_engine_events(self) -> None:
+        events = self.controller.events
+        events.subscribe(OutputChanged, self._on_output_changed)
+        events.subscribe(TransportChanged, self._on_transport_changed)
+        events.subscribe(ScenesChanged, self._on_scenes_changed)
+        events.subscribe(PalettesChanged, self._on_palettes_changed)
+        events.subscribe(PatchChanged, lambda _event: self._mark_views_stale(ALL_VIEWS))
+        for event_type in (SceneChanged, CueAdvanced, OverrideToggled, SequencesChanged):
+            events.subscribe(event_type, lambda _event: self._mark_views_stale((VIEW_STATUS,)))
+
+    def _on_output_changed(self, _event: OutputChanged) -> None:
+        self._mark_views_stale((VIEW_LIVE_STAGE, VIEW_SETUP_STAGE, VIEW_SHOW_STAGE, VIEW_MONITOR))
+        if self.selected_scene_id is None:
+            self._mark_views_stale((VIEW_SCENE_STAGE,))
+
+    def _on_transport_changed(self, event: TransportChanged) -> None:
+        self._mark_views_stale((VIEW_STATUS,))
+        if event.reason in ("master", "blackout"):
+            self._mark_views_stale((VIEW_LIVE_STAGE, VIEW_SETUP_STAGE, VIEW_MONITOR))
+
+    def _on_scenes_changed(self, event: ScenesChanged) -> None:
+        self._mark_views_stale((VIEW_STATUS,))
+        if self.selected_scene_id in event.scene_ids:
+            self._mark_views_stale((VIEW_SCENE_STAGE,))
+
+    def _on_palettes_changed(self, event: PalettesChanged) -> None:
+        scenes = self.controller.state.scenes
+        if self.selected_scene_id in scenes and scenes[self.selected_scene_id].palette_id in event.palette_ids:
+            self._mark_views_stale((VIEW_SCENE_STAGE,))
+
+    def _mark_views_stale(self, views) -> None:
+        self._stale_views.update(views)
 
     def _refresh_views(self) -> None:
+        self._mark_views_stale(ALL_VIEWS)
+        self._flush_stale_views(force=True)
+
+    def _visible_views(self) -> set[str]:
+        if self.root.state() in ("iconic", "withdrawn"):
+            return set()
+        selected_tab = self.notebook.select()
+        return {view for view in ALL_VIEWS if view not in self._view_tabs or str(self._view_tabs[view]) == selected_tab}
+
+    def _flush_stale_views(self, *, force: bool = False) -> None:
+        if not self._stale_views:
+            return
+        # Hidden views stay stale until their tab is shown; visible ones refresh no faster than their interval.
+        now = time.monotonic()
+        stale_views = {
+            view
+            for view in self._stale_views & self._visible_views()
+            if force or (now - self._view_refreshed_at.get(view, 0.0)) * 1000 >= VIEW_MIN_INTERVAL_MS[view]
+        }
+        if not stale_views:
+            return
+        self._stale_views -= stale_views
+        for view in stale_views:
+            self._view_refreshed_at[view] = now
+        started = time.perf_counter()
+        if VIEW_STATUS in stale_views:
+            self._refresh_status()
+        if stale_views & {VIEW_LIVE_STAGE, VIEW_SETUP_STAGE}:
+            live_states = self._live_fixture_display_states()
+            if VIEW_LIVE_STAGE in stale_views:
+                self.live_fixture_stage.set_content(self.controller.fixtures, live_states, set())
+            if VIEW_SETUP_STAGE in stale_views:
+                setup_selected_ids = {self.setup_selected_fixture_id} if self.setup_selected_fixture_id is not None else set()
+                self.setup_stage.set_content(self.controller.fixtures, live_states, setup_selected_ids)
+        if VIEW_SCENE_STAGE in stale_views:
+            self.scene_stage.set_content(self.controller.fixtures, self._scene_preview_states(), self.scene_selected_fixture_ids)
+        if VIEW_SHOW_STAGE in stale_views:
+            self.show_stage.set_content(self.controller.fixtures, self._show_preview_states(), self.show_selected_fixture_ids)
+        if VIEW_MONITOR in stale_views:
+            self._refresh_monitor()
+        if VIEW_PERFORMANCE in stale_views and self.performance_overlay_var.get():
+            self._refresh_performance_overlay()
+        self.controller.metrics.record_refresh(time.perf_counter() - started)
+
+    def _on_performance_overlay_toggled(self) -> None:
+        if self.performance_overlay_var.get():
+            self.performance_overlay.place(relx=1.0, x=-6, y=6, anchor="ne")
+            self.performance_overlay.lift()
+            self._mark_views_stale((VIEW_PERFORMANCE,))
+            self._flush_stale_views(force=True)
+        else:
+            self.performance_overlay.place_forget()
+
+    def _refresh_performance_overlay(self) -> None:
+        snapshot = self.controller.metrics_snapshot()
+        lines = [
+            f"Output   {snapshot.output_fps:.1f} fps",
+            f"Tick     p50 {_format_ms(snapshot.tick_p50_ms)}  p95 {_format_ms(snapshot.tick_p95_ms)}  max {_format_ms(snapshot.tick_max_ms)}",
+            f"Send     p95 {_format_ms(snapshot.send_p95_ms)}",
+            f"Refresh  p95 {_format_ms(snapshot.refresh_p95_ms)}",
+            f"Queue    {snapshot.queue_depth}",
+            f"Budget   {snapshot.budget_ms:.0f} ms",
+            *(f"! {alert}" for alert in snapshot.alerts),
+        ]
+        self.performance_overlay.configure(
+            text="\n".join(lines),
+            fg=PERFORMANCE_ALERT_COLOR if snapshot.alerts else PERFORMANCE_OK_COLOR,
+        )
+
+    def _monitor_universe(self) -> int:
+        try:
+            return int(self.monitor_universe_var.get())
+        except ValueError:
+            return 1
+
+    def _refresh_monitor(self) -> None:
+        fixtures = self.controller.fixtures
+        universe = self._monitor_universe()
+        # Only universes with an attached output, or frames already recorded, have live data to show.
+        universes = sorted({*self.controller.output_universes, *self.controller.monitor.universes()}) or [1]
+        if list(self.monitor_universe_combo.cget("values")) != [str(value) for value in universes]:
+            self.monitor_universe_combo.configure(values=[str(value) for value in universes])
+        if universe not in universes:
+            universe = universes[0]
+            self.monitor_universe_var.set(str(universe))
+
+        patch_key = (universe, tuple((fixture.fixture_id, fixture.universe, fixture.start_address, fixture.num_channels) for fixture in fixtures))
+        if patch_key != self._monitor_patch_key:
+            self._monitor_patch_key = patch_key
+            self._monitor_owners = channel_owners(fixtures, universe)
+            self._monitor_categories = bytes(min(len(owners), CHANNEL_CONFLICT) for owners in self._monitor_owners)
+
+        self._monitor_frame_count = self.controller.monitor.frame_count(universe)
+        frame = self.controller.monitor.frame(universe)
+        if frame is None:
+            frame = compose_frame(fixtures, self._live_fixture_display_states(), universe)
+            self.monitor_source_var.set("Preview from fixture states: no frames have been sent on this universe.")
+        else:
+            self.monitor_source_var.set(f"Output: {self._monitor_frame_count} frames sent")
+        self._monitor_frame = frame
+        self.universe_monitor.set_frame(frame, self._monitor_categories)
+
+    def _on_monitor_hover(self, channel: int | None) -> None:
+        if channel is None:
+            self.monitor_channel_var.set("Hover a channel to inspect it.")
+            return
+        owners = self._monitor_owners[channel]
+        owner_text = ", ".join(f"fixture {fixture_id}" for fixture_id in owners) if owners else "unpatched"
+        self.monitor_channel_var.set(f"Channel {channel + 1}: {self._monitor_frame[channel]} ({owner_text})")
+
+    def _refresh_status(self) -> None:
         self.output_status_var.set(self._output_status_text())
         current_scene = self.controller.state.scenes.get(self.controller.state.current_scene_id) if self.controller.state.current_scene_id else None
         self.current_scene_var.set(current_scene.name if current_scene is not None else "None")
@@ -738,85 +1225,92 @@ class MainApplication(ttk.Frame):
         self.pause_button.configure(text="Resume" if self.controller.is_sequence_paused else "Pause")
         self.rhythm_button.configure(text="Stop Rhythm" if self.controller.is_rhythm_playing else "Start Rhythm")
 
-        live_states = self._live_fixture_display_states()
-        self.live_fixture_stage.set_content(self.controller.fixtures, live_states, set())
-
-        scene_states = self._scene_preview_states()
-        show_states = self._show_preview_states()
-        self.scene_stage.set_content(self.controller.fixtures, scene_states, self.scene_selected_fixture_ids)
-        self.show_stage.set_content(self.controller.fixtures, show_states, self.show_selected_fixture_ids)
-        setup_selected_ids = {self.setup_selected_fixture_id} if self.setup_selected_fixture_id is not None else set()
-        self.setup_stage.set_content(self.controller.fixtures, live_states, setup_selected_ids)
-
     def _refresh_lists(self) -> None:
-        self._refresh_fixture_tree()
-        self._refresh_scene_list()
-        self._refresh_sequence_list()
-        self._refresh_scene_combo()
+        if self._is_tab_built(self.setup_tab):
+            self._refresh_fixture_tree()
+        if self._is_tab_built(self.scene_tab):
+            self._refresh_scene_list()
+        if self._is_tab_built(self.sequence_tab):
+            self._refresh_sequence_list()
+            self._refresh_scene_combo()
 
     def _refresh_fixture_tree(self) -> None:
-        for item in self.fixture_tree.get_children():
-            self.fixture_tree.delete(item)
-        for fixture in self.controller.fixtures:
-            values = (
+        rows = {
+            str(fixture.fixture_id): (
                 fixture.start_address,
                 fixture.num_channels,
                 f"{fixture.position[0]}, {fixture.position[1]}",
             )
-            self.fixture_tree.insert("", "end", iid=str(fixture.fixture_id), values=values, text=str(fixture.fixture_id))
+            for fixture in self.controller.fixtures
+        }
+        for item in [item for item in self._fixture_rows if item not in rows]:
+            self.fixture_tree.delete(item)
+        for item, values in rows.items():
+            if item not in self._fixture_rows:
+                self.fixture_tree.insert("", "end", iid=item, values=values, text=item)
+            elif self._fixture_rows[item] != values:
+                self.fixture_tree.item(item, values=values)
+        if list(self.fixture_tree.get_children()) != list(rows):
+            for index, item in enumerate(rows):
+                self.fixture_tree.move(item, "", index)
+        self._fixture_rows = rows
         if self.setup_selected_fixture_id is not None:
             fixture_item = str(self.setup_selected_fixture_id)
             if self.fixture_tree.exists(fixture_item):
                 self.fixture_tree.selection_set(fixture_item)
                 self.fixture_tree.focus(fixture_item)
 
+    def _sorted_scene_names(self) -> list[tuple[str, str]]:
+        names = self.controller.scene_names()
+        if names != self._sorted_scenes_key:
+            self._sorted_scenes_key = names
+            self._sorted_scenes = sorted(names.items(), key=lambda item: item[1].lower())
+        return self._sorted_scenes
+
     def _refresh_scene_list(self) -> None:
-        self.scene_listbox.delete(0, tk.END)
-        scenes = sorted(self.controller.state.scenes.values(), key=lambda scene: scene.name.lower())
-        self.scene_order = [scene.id for scene in scenes]
-        for scene in scenes:
-            self.scene_listbox.insert(tk.END, scene.name)
-        if self.selected_scene_id in self.scene_order:
-            self.scene_listbox.selection_set(self.scene_order.index(self.selected_scene_id))
-        elif self.scene_order:
-            self.selected_scene_id = self.scene_order[0]
-            self.scene_listbox.selection_set(0)
+        scenes = self._sorted_scene_names()
+        self.scene_listbox.set_items(scenes)
+        if self.scene_listbox.select_key(self.selected_scene_id):
+            return
+        if self.selected_scene_id not in self._sorted_scenes_key and self.scene_listbox.keys:
+            self.selected_scene_id = self.scene_listbox.keys[0]
+            self.scene_listbox.select_key(self.selected_scene_id)
 
     def _refresh_sequence_list(self) -> None:
-        self.sequence_listbox.delete(0, tk.END)
         sequences = sorted(self.controller.state.sequences.values(), key=lambda sequence: sequence.name.lower())
-        self.sequence_order = [sequence.id for sequence in sequences]
-        for sequence in sequences:
-            label = f"{sequence.name} (cyclic)" if sequence.cyclic else sequence.name
-            self.sequence_listbox.insert(tk.END, label)
-        if self.selected_sequence_id in self.sequence_order:
-            self.sequence_listbox.selection_set(self.sequence_order.index(self.selected_sequence_id))
-        elif self.sequence_order:
-            self.selected_sequence_id = self.sequence_order[0]
-            self.sequence_listbox.selection_set(0)
+        self.sequence_listbox.set_items(
+            [(sequence.id, f"{sequence.name} (cyclic)" if sequence.cyclic else sequence.name) for sequence in sequences]
+        )
+        if not self.sequence_listbox.select_key(self.selected_sequence_id) and sequences:
+            self.selected_sequence_id = sequences[0].id
+            self.sequence_listbox.select_key(self.selected_sequence_id)
         self._refresh_cue_list()
 
     def _refresh_cue_list(self) -> None:
-        self.cue_listbox.delete(0, tk.END)
-        self.cue_order = []
         if self.selected_sequence_id is None or self.selected_sequence_id not in self.controller.state.sequences:
+            self.cue_listbox.set_items([])
             self.sequence_cyclic_var.set(False)
+            self.sequence_tracking_var.set(False)
             return
         sequence = self.controller.state.sequences[self.selected_sequence_id]
         self.sequence_cyclic_var.set(sequence.cyclic)
+        self.sequence_tracking_var.set(sequence.tracking)
+        scene_names = self.controller.scene_names()
+        rows = []
         for index, cue in enumerate(sequence.cues, start=1):
-            scene = self.controller.state.scenes.get(cue.scene_id)
             trigger = cue.trigger_mode.value.upper()
-            line = f"{index}. {(scene.name if scene is not None else cue.scene_id)} | {cue.transition.fade_in_ms}ms | {trigger}"
-            self.cue_listbox.insert(tk.END, line)
-            self.cue_order.append(cue.id)
+            line = f"{index}. {scene_names.get(cue.scene_id, cue.scene_id)} | {cue.transition.fade_in_ms}ms | {trigger}"
+            rows.append((cue.id, line))
+        self.cue_listbox.set_items(rows)
 
     def _refresh_scene_combo(self) -> None:
-        scenes = sorted(self.controller.state.scenes.values(), key=lambda scene: scene.name.lower())
-        self.scene_name_to_id = {scene.name: scene.id for scene in scenes}
-        self.sequence_scene_combo.configure(values=[scene.name for scene in scenes])
+        scenes = self._sorted_scene_names()
+        scene_name_to_id = {name: scene_id for scene_id, name in scenes}
+        if scene_name_to_id != self.scene_name_to_id:
+            self.scene_name_to_id = scene_name_to_id
+            self.sequence_scene_combo.configure(values=[name for _scene_id, name in scenes])
         if scenes and not self.sequence_scene_var.get():
-            self.sequence_scene_var.set(scenes[0].name)
+            self.sequence_scene_var.set(scenes[0][1])
 
     def _selected_scene_states(self) -> dict[int, FixtureState]:
         if self.selected_scene_id and self.selected_scene_id in self.controller.state.scenes:
@@ -886,7 +1380,8 @@ class MainApplication(ttk.Frame):
         self._refresh_views()
 
     def _add_fixture(self) -> None:
-        start_address = simpledialog.askinteger("Add Fixture", "Start address", initialvalue=max((fixture.start_address + fixture.num_channels for fixture in self.controller.fixtures), default=1))
+        free_block = self.controller.find_free_address(5, universe=1)
+        start_address = simpledialog.askinteger("Add Fixture", "Start address", initialvalue=free_block[1] if free_block is not None else 1)
         if start_address is None:
             return
         num_channels = simpledialog.askinteger("Add Fixture", "Number of channels", initialvalue=5, minvalue=1, maxvalue=32)
@@ -908,21 +1403,18 @@ class MainApplication(ttk.Frame):
         if num_channels < 1 or start_address + num_channels - 1 > 512:
             messagebox.showerror("Fixture Error", "Fixture exceeds the 512-channel DMX universe.")
             return False
-        end_address = start_address + num_channels - 1
-        for fixture in self.controller.fixtures:
-            if fixture_id is not None and fixture.fixture_id == fixture_id:
-                continue
-            existing_end = fixture.start_address + fixture.num_channels - 1
-            if start_address <= existing_end and end_address >= fixture.start_address:
-                messagebox.showerror("Fixture Error", f"Fixture overlaps fixture {fixture.fixture_id}.")
-                return False
+        universe = self._fixture_by_id(fixture_id).universe if fixture_id is not None else 1
+        conflicts = self.controller.find_patch_conflicts(start_address, num_channels, universe=universe, exclude_fixture_id=fixture_id)
+        if conflicts:
+            messagebox.showerror("Fixture Error", f"Fixture overlaps fixture {conflicts[0]}.")
+            return False
         return True
 
     def _on_scene_selected(self, _event=None) -> None:
-        selection = self.scene_listbox.curselection()
-        if not selection:
+        scene_id = self.scene_listbox.selected_key()
+        if scene_id is None:
             return
-        self.selected_scene_id = self.scene_order[selection[0]]
+        self.selected_scene_id = scene_id
         self.scene_selected_fixture_ids = set(self._selected_scene_states())
         self._populate_editor_from_states(self.scene_editor_vars, self._selected_scene_states(), self.scene_selected_fixture_ids)
         self._refresh_views()
@@ -1038,10 +1530,10 @@ class MainApplication(ttk.Frame):
         self._refresh_lists()
 
     def _on_sequence_selected(self, _event=None) -> None:
-        selection = self.sequence_listbox.curselection()
-        if not selection:
+        sequence_id = self.sequence_listbox.selected_key()
+        if sequence_id is None:
             return
-        self.selected_sequence_id = self.sequence_order[selection[0]]
+        self.selected_sequence_id = sequence_id
         self._refresh_cue_list()
 
     def _load_selected_sequence(self) -> None:
@@ -1059,6 +1551,13 @@ class MainApplication(ttk.Frame):
         self.controller.set_sequence_cyclic(self.selected_sequence_id, self.sequence_cyclic_var.get())
         self._refresh_sequence_list()
 
+    def _toggle_selected_sequence_tracking(self) -> None:
+        if self.selected_sequence_id is None:
+            self.sequence_tracking_var.set(False)
+            return
+        self.controller.set_sequence_tracking(self.selected_sequence_id, self.sequence_tracking_var.get())
+        self._refresh_sequence_list()
+
     def _add_cue_to_sequence(self) -> None:
         if self.selected_sequence_id is None:
             return
@@ -1078,13 +1577,20 @@ class MainApplication(ttk.Frame):
     def _remove_selected_cue(self) -> None:
         if self.selected_sequence_id is None:
             return
-        selection = self.cue_listbox.curselection()
-        if not selection:
+        cue_id = self.cue_listbox.selected_key()
+        if cue_id is None:
             return
-        cue_id = self.cue_order[selection[0]]
         self.controller.remove_cue_from_sequence(self.selected_sequence_id, cue_id)
         self._refresh_cue_list()
 
+    def _go_to_selected_cue(self, _event=None) -> None:
+        cue_id = self.cue_listbox.selected_key()
+        if self.selected_sequence_id is None or cue_id is None:
+            return
+        if self.controller.loaded_sequence_id != self.selected_sequence_id:
+            self._load_selected_sequence()
+        self.controller.go_to_cue(cue_id)
+
     def _go_next_cue(self) -> None:
         self.controller.go_next_cue()
 
@@ -1234,11 +1740,19 @@ class MainApplication(ttk.Frame):
     def _on_level_preview_changed(self, editor_name: str) -> None:
         if self._suspend_editor_callbacks:
             return
-        if editor_name == "scene":
+        # A colour pick writes several variables and a drag writes them continuously; apply once per idle pass.
+        self._pending_editors.add(editor_name)
+        if self._editor_flush_job is None:
+            self._editor_flush_job = self.root.after_idle(self._flush_editor_changes)
+
+    def _flush_editor_changes(self) -> None:
+        self._editor_flush_job = None
+        pending, self._pending_editors = self._pending_editors, set()
+        if "scene" in pending:
             self._auto_apply_scene_editor()
-        else:
+        if "override" in pending:
             self._auto_apply_show_override()
-        if hasattr(self, "scene_stage"):
+        if pending and hasattr(self, "notebook"):
             self._refresh_views()
 
     def _populate_editor_from_states(
@@ -1264,15 +1778,21 @@ class MainApplication(ttk.Frame):
             self._suspend_editor_callbacks = False
 
     def _load_show(self) -> None:
-        path = filedialog.askopenfilename(filetypes=[("Show Files", "*.json"), ("JSON Files", "*.json")])
+        path = filedialog.askopenfilename(filetypes=[("Show Files", "*.json *.dmxshow *.dmxdb"), ("JSON Files", "*.json"), ("Binary Show Files", "*.dmxshow"), ("Show Libraries", "*.dmxdb")])
         if not path:
             return
+        journal = ShowJournal(path, self.repository, on_error=self._journal_errors.put)
         try:
-            show_file = self.repository.load(path)
+            show_file = self.repository.load(path, lazy=True)
+            journal.replay(show_file)
+            self._close_journal()
             self.controller.load_show_file(show_file)
         except Exception as exc:
+            journal.close(compact=False, wait=False)
             messagebox.showerror("Load Error", str(exc))
             return
+        journal.attach(self.controller)
+        self.journal = journal
         self.show_file_path = path
         self.selected_scene_id = next(iter(self.controller.state.scenes), None)
         self.selected_sequence_id = next(iter(self.controller.state.sequences), None)
@@ -1282,21 +1802,52 @@ class MainApplication(ttk.Frame):
         self._refresh_views()
 
     def _save_show(self) -> None:
-        path = self.show_file_path or filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Show Files", "*.json"), ("JSON Files", "*.json")])
+        path = self.show_file_path or filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Files", "*.json"), ("Binary Show Files", "*.dmxshow"), ("Show Libraries", "*.dmxdb")])
         if not path:
             return
         try:
-            self.repository.save(path, self.controller.build_show_file())
+            show_file = self.controller.build_show_file()
         except Exception as exc:
             messagebox.showerror("Save Error", str(exc))
             return
+        if self.journal is not None and path == self.show_file_path:
+            self._watch_save(self.journal.compact(show_file))
+            return
+        self._close_journal()
+        self.journal = ShowJournal(path, self.repository, on_error=self._journal_errors.put)
+        future = self.journal.write_snapshot(show_file)
+        self.journal.attach(self.controller)
         self.show_file_path = path
+        self._watch_save(future)
+
+    def _watch_save(self, future: Future[None]) -> None:
+        if not future.done():
+            self.root.after(SAVE_POLL_INTERVAL_MS, self._watch_save, future)
+            return
+        error = future.exception()
+        if error is not None:
+            messagebox.showerror("Save Error", str(error))
+
+    def set_transport_error(self, error: Exception | None) -> None:
+        self.transport_error = error
+        self._mark_views_stale((VIEW_STATUS,))
+
+    def shutdown(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def _close_journal(self) -> None:
+        if self.journal is not None:
+            self.journal.close(wait=False)
+            self.journal = None
 
     def _output_status_text(self) -> str:
         if self.controller.is_output_enabled:
             return "Live DMX"
-        if self.transport_error is not None:
-            return f"Simulation ({self.transport_error})"
+        transport_error = self.transport_error or getattr(self.controller, "transport_error", None)
+        if transport_error is not None:
+            return f"Simulation ({transport_error})"
         return "Simulation"
 
     def _transport_status_text(self) -> str:
@@ -1362,7 +1913,4 @@ class MainApplication(ttk.Frame):
         self.controller.set_master_dimmer(float(value))
 
     def _fixture_by_id(self, fixture_id: int) -> Fixture:
-        for fixture in self.controller.fixtures:
-            if fixture.fixture_id == fixture_id:
-                return fixture
-        raise KeyError(fixture_id)
\ No newline at end of file
+        return self.controller.patch_index.get(fixture_id)
\ No newline at end of file
@@ -3,21 +3,16 @@
 #%%
 from __future__ import annotations
 
-import tkinter as tk
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import Future
 
-from engine import EngineController
 from fixture import Fixture
-from gui import MainApplication
-from storage import ShowRepository
 
-try:
-    from communication import DMXUpdateManager, UDMX
-except Exception as exc:  # pragma: no cover - environment dependent import
-    DMXUpdateManager = None
-    UDMX = None
-    COMMUNICATION_ERROR = exc
-else:
-    COMMUNICATION_ERROR = None
+_STARTED_AT = time.perf_counter()
+TRANSPORT_POLL_MS = 100
 
 
 def create_default_fixtures() -> list[Fixture]:
@@ -38,26 +33,112 @@ def create_default_fixtures() -> list[Fixture]:
 
 
 def create_update_manager() -> tuple[object | None, Exception | None]:
-    if DMXUpdateManager is None or UDMX is None:
-        return None, COMMUNICATION_ERROR
+    # pyudmx pulls in pyusb, so the transport is only imported when a device is actually opened.
+    try:
+        from communication import DMXUpdateManager, UDMX
+    except Exception as exc:  # pragma: no cover - environment dependent import
+        return None, exc
     try:
         return DMXUpdateManager(UDMX()), None
     except Exception as exc:  # pragma: no cover - hardware dependent
         return None, exc
 
+
+def discover_update_manager() -> Future:
+    future: Future = Future()
+    threading.Thread(target=lambda: future.set_result(create_update_manager()), name="mydmx-usb-discovery", daemon=True).start()
+    return future
+
+
+class StartupProfile:
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.phases: list[tuple[str, float]] = []
+        self._last = _STARTED_AT
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self) -> str:
+        lines = [f"{phase:<22}{seconds * 1000:9.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"{'total':<22}{(self._last - _STARTED_AT) * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the MyDMX lighting console.")
+    parser.add_argument("--in-process", action="store_true", help="Run the engine on the GUI thread instead of in its own process.")
+    parser.add_argument("--profile-startup", action="store_true", help="Print how long each startup phase took.")
+    return parser
+
+
 #%%
-def main() -> None:
-    update_manager, transport_error = create_update_manager()
-    controller = EngineController(create_default_fixtures(), update_manager)
-    repository = ShowRepository()
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    profile = StartupProfile(args.profile_startup)
+    profile.mark("arguments")
+
+    engine_process = None
+    discovery = None
+    if args.in_process:
+        from engine import EngineController
+
+        discovery = discover_update_manager()
+        controller = EngineController(create_default_fixtures())
+    else:
+        from engine.process import EngineProcess, ProcessEngineController
+
+        # Started first so the engine interpreter boots while Tk and the GUI load.
+        # The engine process owns the DMX transport; the GUI edits a replica that mirrors each change into it.
+        engine_process = EngineProcess(create_default_fixtures(), update_manager_factory=create_update_manager)
+        engine_process.start()
+        controller = ProcessEngineController(create_default_fixtures(), engine_process)
+    profile.mark("engine")
+
+    # Tk and the GUI are imported here so that headless entry points can reuse the helpers above.
+    import tkinter as tk
 
+    from gui import MainApplication
+    from storage import ShowCache, ShowRepository
+
+    profile.mark("gui imports")
     root = tk.Tk()
     root.title("MyDMX")
     root.geometry("1400x860")
+    profile.mark("tk")
+
+    app = MainApplication(root, controller, ShowRepository(cache=ShowCache()))
+    profile.mark("main window")
+    update_manager = None
+
+    def poll_discovery() -> None:
+        nonlocal update_manager
+        if not discovery.done():
+            root.after(TRANSPORT_POLL_MS, poll_discovery)
+            return
+        update_manager, transport_error = discovery.result()
+        if update_manager is not None:
+            controller.attach_output(update_manager)
+        else:
+            app.set_transport_error(transport_error)
+        if profile.enabled:
+            print(f"{'usb discovery':<22}{(time.perf_counter() - _STARTED_AT) * 1000:9.1f} ms after launch", file=sys.stderr)
+
+    def report_startup() -> None:
+        profile.mark("first frame")
+        if profile.enabled:
+            print(profile.report(), file=sys.stderr)
 
-    app = MainApplication(root, controller, repository, transport_error=transport_error)
+    if discovery is not None:
+        root.after(TRANSPORT_POLL_MS, poll_discovery)
+    root.after_idle(report_startup)
 
     def handle_close() -> None:
+        app.shutdown()
+        if engine_process is not None:
+            engine_process.stop()
         if update_manager is not None and getattr(update_manager, "dmx", None) is not None:
             update_manager.dmx.cleanup()
         root.destroy()
@@ -67,4 +148,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import signal
+import threading
+
+from engine import EngineController
+from engine.runner import DEFAULT_TICK_RATE, EngineRunner
+from mydmx import create_default_fixtures, create_update_manager
+from remote import ControlServer, OscServer, RemoteApiServer
+from remote.control_server import DEFAULT_CONTROL_HOST, DEFAULT_CONTROL_PORT
+from storage import ShowCache, ShowRepository
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the MyDMX engine headless, controlled over a local socket.")
+    parser.add_argument("--show", help="Show file to load on startup.")
+    parser.add_argument("--sequence", help="Sequence id to load; defaults to the first sequence in the show.")
+    parser.add_argument("--host", default=DEFAULT_CONTROL_HOST, help="Control socket host.")
+    parser.add_argument("--port", type=int, default=DEFAULT_CONTROL_PORT, help="Control socket TCP port.")
+    parser.add_argument("--unix-socket", help="Listen on a Unix domain socket path instead of TCP.")
+    parser.add_argument("--http-port", type=int, help="Also serve the HTTP/WebSocket remote API on this port.")
+    parser.add_argument("--osc-port", type=int, help="Listen for OSC messages on this UDP port.")
+    parser.add_argument("--tick-rate", type=float, default=DEFAULT_TICK_RATE, help="Engine ticks per second.")
+    parser.add_argument("--simulate", action="store_true", help="Run without opening the DMX transport.")
+    return parser
+
+
+def create_controller(args: argparse.Namespace) -> tuple[EngineController, object | None]:
+    if args.simulate:
+        update_manager = None
+    else:
+        update_manager, transport_error = create_update_manager()
+        if transport_error is not None:
+            print(f"DMX transport unavailable, running in simulation: {transport_error}")
+    controller = EngineController(create_default_fixtures(), update_manager)
+    if args.show:
+        controller.load_show_file(ShowRepository(cache=ShowCache()).load(args.show, lazy=True))
+    sequence_id = args.sequence or next(iter(controller.state.sequences), None)
+    if sequence_id is not None:
+        controller.load_sequence(sequence_id)
+    return controller, update_manager
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    controller, update_manager = create_controller(args)
+    runner = EngineRunner(controller, tick_rate=args.tick_rate)
+    server = ControlServer(runner, host=args.host, port=args.port, unix_path=args.unix_socket)
+    server.start()
+    print(f"MyDMX engine listening on {server.address}")
+    api_server = None
+    if args.http_port is not None:
+        api_server = RemoteApiServer(runner, host=args.host, port=args.http_port)
+        api_server.start()
+        print(f"MyDMX remote API listening on {api_server.address}")
+    osc_server = None
+    if args.osc_port is not None:
+        osc_server = OscServer(runner, port=args.osc_port)
+        osc_server.start()
+        print(f"MyDMX OSC input listening on {osc_server.address}")
+
+    stop_requested = threading.Event()
+
+    def request_stop(_signum=None, _frame=None) -> None:
+        stop_requested.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    try:
+        runner.start()
+        while not stop_requested.wait(0.5):
+            pass
+    finally:
+        runner.stop()
+        if osc_server is not None:
+            osc_server.stop()
+        if api_server is not None:
+            api_server.stop()
+        server.stop()
+        if update_manager is not None and getattr(update_manager, "dmx", None) is not None:
+            update_manager.dmx.cleanup()
+
+
+if __name__ == "__main__":
+    main()
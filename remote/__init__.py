@@ -0,0 +1,15 @@
+from .commands import COMMANDS, describe_state, execute_command
+from .control_server import ControlServer
+from .osc_server import OscServer
+from .websocket_server import RemoteApiServer, decode_frame_delta, encode_frame_delta
+
+__all__ = [
+    "COMMANDS",
+    "ControlServer",
+    "OscServer",
+    "RemoteApiServer",
+    "decode_frame_delta",
+    "describe_state",
+    "encode_frame_delta",
+    "execute_command",
+]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from engine import Cue, EngineController, FixtureState
+
+
+def describe_cue(cue: Cue | None) -> dict | None:
+    if cue is None:
+        return None
+    return {"id": cue.id, "scene_id": cue.scene_id, "trigger_mode": cue.trigger_mode.value}
+
+
+def describe_state(controller: EngineController) -> dict:
+    state = controller.state
+    return {
+        "current_scene_id": state.current_scene_id,
+        "loaded_sequence_id": controller.loaded_sequence_id,
+        "current_cue": describe_cue(controller.current_cue),
+        "current_cue_number": controller.current_cue_number,
+        "next_cue": describe_cue(controller.next_cue),
+        "master_dimmer": state.master_dimmer,
+        "blackout": state.blackout,
+        "override_active": state.live_override.active,
+        "fading": controller.is_fading,
+        "paused": controller.is_sequence_paused,
+        "rhythm_playing": controller.is_rhythm_playing,
+        "rhythm_bpm": controller.rhythm_bpm,
+        "dirty": state.dirty,
+    }
+
+
+def parse_fixture_state(payload: dict) -> FixtureState:
+    return FixtureState(
+        fixture_id=int(payload["fixture_id"]),
+        intensity=int(payload.get("intensity", 0)),
+        red=int(payload.get("red", 0)),
+        green=int(payload.get("green", 0)),
+        blue=int(payload.get("blue", 0)),
+        white=int(payload.get("white", 0)),
+    )
+
+
+def _go(controller: EngineController, _params: dict) -> dict | None:
+    return describe_cue(controller.go_next_cue())
+
+
+def _back(controller: EngineController, _params: dict) -> dict | None:
+    return describe_cue(controller.go_previous_cue())
+
+
+def _goto(controller: EngineController, params: dict) -> dict | None:
+    fade_ms = int(params["fade_ms"]) if "fade_ms" in params else None
+    if "cue_id" in params:
+        return describe_cue(controller.go_to_cue(str(params["cue_id"]), fade_ms=fade_ms))
+    return describe_cue(controller.go_to_cue_number(int(params["cue_number"]), fade_ms=fade_ms))
+
+
+def _apply_scene(controller: EngineController, params: dict) -> None:
+    controller.apply_scene(str(params["scene_id"]), fade_ms=max(0, int(params.get("fade_ms", 0))))
+
+
+def _set_master(controller: EngineController, params: dict) -> float:
+    controller.set_master_dimmer(float(params["value"]))
+    return controller.state.master_dimmer
+
+
+def _set_blackout(controller: EngineController, params: dict) -> bool:
+    enabled = params.get("enabled")
+    controller.set_blackout(not controller.state.blackout if enabled is None else bool(enabled))
+    return controller.state.blackout
+
+
+def _apply_override(controller: EngineController, params: dict) -> None:
+    controller.apply_override([parse_fixture_state(item) for item in params.get("states", [])])
+
+
+def _clear_override(controller: EngineController, _params: dict) -> None:
+    controller.clear_override()
+
+
+def _load_sequence(controller: EngineController, params: dict) -> None:
+    controller.load_sequence(str(params["sequence_id"]))
+
+
+def _pause(controller: EngineController, _params: dict) -> None:
+    controller.pause_sequence()
+
+
+def _resume(controller: EngineController, _params: dict) -> None:
+    controller.resume_sequence()
+
+
+def _start_rhythm(controller: EngineController, params: dict) -> dict | None:
+    if "bpm" in params:
+        controller.set_rhythm_bpm(float(params["bpm"]))
+    return describe_cue(controller.start_rhythm_play())
+
+
+def _stop_rhythm(controller: EngineController, _params: dict) -> None:
+    controller.stop_rhythm_play()
+
+
+def _status(controller: EngineController, _params: dict) -> dict:
+    return describe_state(controller)
+
+
+def _list_scenes(controller: EngineController, _params: dict) -> list[dict]:
+    return [{"id": scene_id, "name": name} for scene_id, name in controller.scene_names().items()]
+
+
+def _list_sequences(controller: EngineController, _params: dict) -> list[dict]:
+    return [
+        {"id": sequence.id, "name": sequence.name, "cues": len(sequence.cues), "cyclic": sequence.cyclic}
+        for sequence in controller.state.sequences.values()
+    ]
+
+
+COMMANDS: dict[str, Callable[[EngineController, dict], Any]] = {
+    "go": _go,
+    "back": _back,
+    "goto": _goto,
+    "apply_scene": _apply_scene,
+    "master": _set_master,
+    "blackout": _set_blackout,
+    "override": _apply_override,
+    "clear_override": _clear_override,
+    "load_sequence": _load_sequence,
+    "pause": _pause,
+    "resume": _resume,
+    "start_rhythm": _start_rhythm,
+    "stop_rhythm": _stop_rhythm,
+    "status": _status,
+    "scenes": _list_scenes,
+    "sequences": _list_sequences,
+    # Aliases matching the EngineController method names.
+    "go_next_cue": _go,
+    "go_previous_cue": _back,
+    "set_master_dimmer": _set_master,
+    "set_blackout": _set_blackout,
+    "apply_override": _apply_override,
+}
+
+
+def execute_command(controller: EngineController, name: str, params: dict | None = None) -> Any:
+    handler = COMMANDS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown command: {name}")
+    return handler(controller, params or {})
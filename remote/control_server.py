@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from engine.runner import EngineRunner
+
+from .commands import execute_command
+
+DEFAULT_CONTROL_HOST = "127.0.0.1"
+DEFAULT_CONTROL_PORT = 7770
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    server: "_ThreadingTCPControlServer | _ThreadingUnixControlServer"
+
+    def handle(self) -> None:
+        for raw_line in self.rfile:
+            line = raw_line.strip()
+            if not line:
+                continue
+            response = self.server.control.handle_line(line)
+            self.wfile.write(response + b"\n")
+            self.wfile.flush()
+
+
+class _ThreadingTCPControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _ThreadingUnixControlServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:  # pragma: no cover - platform dependent
+    _ThreadingUnixControlServer = None
+
+
+class ControlServer:
+    def __init__(
+        self,
+        runner: EngineRunner,
+        *,
+        host: str = DEFAULT_CONTROL_HOST,
+        port: int = DEFAULT_CONTROL_PORT,
+        unix_path: str | None = None,
+    ) -> None:
+        self.runner = runner
+        if unix_path is not None:
+            if _ThreadingUnixControlServer is None:
+                raise OSError("Unix domain sockets are not supported on this platform.")
+            self._server = _ThreadingUnixControlServer(unix_path, _ControlHandler)
+        else:
+            self._server = _ThreadingTCPControlServer((host, port), _ControlHandler)
+        self._server.control = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self):
+        return self._server.server_address
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mydmx-control", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._server.address_family == getattr(socket, "AF_UNIX", None):
+            try:
+                os.unlink(self._server.server_address)
+            except OSError:
+                pass
+        self._thread = None
+
+    def handle_line(self, line: bytes) -> bytes:
+        try:
+            request = json.loads(line)
+            if isinstance(request, str):
+                request = {"command": request}
+            name = request["command"]
+            params = request.get("params", {})
+            result = self.runner.call(execute_command, self.runner.controller, name, params)
+        except Exception as exc:
+            return json.dumps({"ok": False, "error": str(exc)}).encode("utf-8")
+        return json.dumps({"ok": True, "result": result}).encode("utf-8")
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import re
+import socket
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable
+
+from engine import EngineController, FixtureState
+from engine.runner import EngineRunner
+
+DEFAULT_OSC_HOST = "0.0.0.0"
+DEFAULT_OSC_PORT = 8000
+OSC_BUNDLE_TAG = b"#bundle\x00"
+FIXTURE_CHANNELS = ("intensity", "red", "green", "blue", "white")
+
+
+def _read_padded_string(data: bytes, offset: int) -> tuple[str, int]:
+    end = data.index(b"\x00", offset)
+    text = data[offset:end].decode("utf-8", errors="replace")
+    return text, (end + 4) & ~3
+
+
+def parse_osc_message(data: bytes) -> tuple[str, list[Any]]:
+    address, offset = _read_padded_string(data, 0)
+    if offset >= len(data):
+        return address, []
+    type_tags, offset = _read_padded_string(data, offset)
+    arguments: list[Any] = []
+    for tag in type_tags.lstrip(","):
+        if tag == "i":
+            arguments.append(struct.unpack_from("!i", data, offset)[0])
+            offset += 4
+        elif tag == "f":
+            arguments.append(struct.unpack_from("!f", data, offset)[0])
+            offset += 4
+        elif tag == "h":
+            arguments.append(struct.unpack_from("!q", data, offset)[0])
+            offset += 8
+        elif tag == "d":
+            arguments.append(struct.unpack_from("!d", data, offset)[0])
+            offset += 8
+        elif tag == "s":
+            value, offset = _read_padded_string(data, offset)
+            arguments.append(value)
+        elif tag == "b":
+            (size,) = struct.unpack_from("!i", data, offset)
+            arguments.append(data[offset + 4:offset + 4 + size])
+            offset += 4 + ((size + 3) & ~3)
+        elif tag == "T":
+            arguments.append(True)
+        elif tag == "F":
+            arguments.append(False)
+        elif tag in "NI":
+            arguments.append(None)
+        else:
+            raise ValueError(f"Unsupported OSC type tag: {tag}")
+    return address, arguments
+
+
+def iter_osc_packet(data: bytes):
+    if data.startswith(OSC_BUNDLE_TAG):
+        offset = 16
+        while offset + 4 <= len(data):
+            (size,) = struct.unpack_from("!i", data, offset)
+            offset += 4
+            yield from iter_osc_packet(data[offset:offset + size])
+            offset += size
+        return
+    yield parse_osc_message(data)
+
+
+def encode_osc_message(address: str, *arguments: Any) -> bytes:
+    def padded(raw: bytes) -> bytes:
+        return raw + b"\x00" * (4 - len(raw) % 4)
+
+    tags = ","
+    payload = b""
+    for argument in arguments:
+        if isinstance(argument, bool):
+            tags += "T" if argument else "F"
+        elif isinstance(argument, int):
+            tags += "i"
+            payload += struct.pack("!i", argument)
+        elif isinstance(argument, float):
+            tags += "f"
+            payload += struct.pack("!f", argument)
+        else:
+            tags += "s"
+            payload += padded(str(argument).encode("utf-8"))
+    return padded(address.encode("utf-8")) + padded(tags.encode("ascii")) + payload
+
+
+def _to_dmx(value: Any) -> int:
+    # Faders send 0.0-1.0 floats; integer arguments are taken as raw DMX levels.
+    if isinstance(value, float):
+        return max(0, min(255, round(value * 255)))
+    return max(0, min(255, int(value)))
+
+
+def _is_press(arguments: list[Any]) -> bool:
+    # Buttons send 1 on press and 0 on release; only the press should trigger.
+    return not arguments or bool(arguments[0])
+
+
+@dataclass(slots=True)
+class _Route:
+    pattern: re.Pattern[str]
+    handler: Callable[["OscServer", dict[str, str], list[Any]], None]
+
+
+class OscServer:
+    def __init__(self, runner: EngineRunner, *, host: str = DEFAULT_OSC_HOST, port: int = DEFAULT_OSC_PORT) -> None:
+        self.runner = runner
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Touch surfaces send fader bursts; a larger receive buffer keeps them from being dropped.
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._socket.bind((host, port))
+        self._socket.settimeout(0.25)
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._commands: list[Callable[[EngineController], Any]] = []
+        self._master: float | None = None
+        self._fixture_levels: dict[int, dict[str, int]] = {}
+        self._flush_scheduled = False
+        self._exact_routes, self._pattern_routes = self._compile_routes()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._socket.getsockname()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._serve, name="mydmx-osc", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+        self._thread = None
+        self._socket.close()
+
+    def handle_packet(self, data: bytes) -> None:
+        try:
+            messages = list(iter_osc_packet(data))
+        except (ValueError, struct.error, IndexError):
+            return
+        for address, arguments in messages:
+            try:
+                self.dispatch(address, arguments)
+            except Exception as exc:
+                # A malformed argument must not end the receive thread.
+                print(f"OSC message {address} failed: {exc!r}", file=sys.stderr)
+
+    def dispatch(self, address: str, arguments: list[Any]) -> bool:
+        handler = self._exact_routes.get(address)
+        if handler is not None:
+            handler(self, {}, arguments)
+            return True
+        for route in self._pattern_routes:
+            match = route.pattern.fullmatch(address)
+            if match is not None:
+                route.handler(self, match.groupdict(), arguments)
+                return True
+        return False
+
+    # Route handlers run on the OSC thread and only record intent; _flush applies it on the engine thread.
+
+    def _queue_command(self, command: Callable[[EngineController], Any]) -> None:
+        with self._lock:
+            # Levels coalesced so far arrived before this command (say /override/clear) and must apply before it.
+            self._close_levels()
+            self._commands.append(command)
+            self._schedule_flush()
+
+    def _set_master(self, _params: dict[str, str], arguments: list[Any]) -> None:
+        if not arguments:
+            return
+        value = arguments[0]
+        level = float(value) if isinstance(value, float) else int(value) / 255
+        with self._lock:
+            self._master = max(0.0, min(1.0, level))
+            self._schedule_flush()
+
+    def _set_fixture_rgb(self, params: dict[str, str], arguments: list[Any]) -> None:
+        if len(arguments) < 3:
+            return
+        self._set_fixture_levels(int(params["fixture_id"]), dict(zip(("red", "green", "blue"), map(_to_dmx, arguments[:3]))))
+
+    def _set_fixture_channel(self, params: dict[str, str], arguments: list[Any]) -> None:
+        if not arguments:
+            return
+        self._set_fixture_levels(int(params["fixture_id"]), {params["channel"]: _to_dmx(arguments[0])})
+
+    def _set_fixture_levels(self, fixture_id: int, levels: dict[str, int]) -> None:
+        with self._lock:
+            self._fixture_levels.setdefault(fixture_id, {}).update(levels)
+            self._schedule_flush()
+
+    def _close_levels(self) -> None:
+        if self._master is not None or self._fixture_levels:
+            self._commands.append(partial(self._apply_levels, self._master, self._fixture_levels))
+            self._master = None
+            self._fixture_levels = {}
+
+    def _schedule_flush(self) -> None:
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.runner.submit(self._flush)
+
+    def _flush(self) -> None:
+        with self._lock:
+            self._close_levels()
+            commands, self._commands = self._commands, []
+            self._flush_scheduled = False
+
+        controller = self.runner.controller
+        for command in commands:
+            try:
+                command(controller)
+            except Exception as exc:
+                # One failing command must not drop the rest of the batch.
+                print(f"OSC command failed: {exc!r}", file=sys.stderr)
+
+    @staticmethod
+    def _apply_levels(master: float | None, fixture_levels: dict[int, dict[str, int]], controller: EngineController) -> None:
+        if master is not None:
+            controller.set_master_dimmer(master)
+        if fixture_levels:
+            known_ids = {fixture.fixture_id for fixture in controller.fixtures}
+            overrides = controller.state.live_override.fixture_states
+            live_states = controller.get_live_output_states()
+            states: list[FixtureState] = []
+            for fixture_id, levels in fixture_levels.items():
+                if fixture_id not in known_ids:
+                    continue
+                base = overrides.get(fixture_id) or live_states.get(fixture_id) or FixtureState(fixture_id=fixture_id)
+                values = {channel: getattr(base, channel) for channel in FIXTURE_CHANNELS}
+                values.update(levels)
+                states.append(FixtureState(fixture_id=fixture_id, **values))
+            if states:
+                controller.apply_override(states)
+
+    def _serve(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                data, _address = self._socket.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.handle_packet(data)
+
+    @classmethod
+    def _compile_routes(cls) -> tuple[dict[str, Callable], list[_Route]]:
+        def command(action: Callable[[EngineController, list[Any]], Any], *, press_only: bool = True):
+            def handler(server: "OscServer", _params: dict[str, str], arguments: list[Any]) -> None:
+                if press_only and not _is_press(arguments):
+                    return
+                server._queue_command(lambda controller: action(controller, arguments))
+
+            return handler
+
+        def apply_scene(server: "OscServer", params: dict[str, str], arguments: list[Any]) -> None:
+            if not _is_press(arguments):
+                return
+            fade_ms = int(arguments[1]) if len(arguments) > 1 else 0
+            server._queue_command(lambda controller: controller.apply_scene(params["scene_id"], fade_ms=fade_ms))
+
+        exact_routes: dict[str, Callable] = {
+            "/cue/go": command(lambda controller, _args: controller.go_next_cue()),
+            "/cue/back": command(lambda controller, _args: controller.go_previous_cue()),
+            "/cue/goto": command(lambda controller, args: controller.go_to_cue_number(int(args[0])) if args else None, press_only=False),
+            "/sequence/pause": command(lambda controller, _args: controller.pause_sequence()),
+            "/sequence/resume": command(lambda controller, _args: controller.resume_sequence()),
+            "/rhythm/start": command(lambda controller, _args: controller.start_rhythm_play()),
+            "/rhythm/stop": command(lambda controller, _args: controller.stop_rhythm_play()),
+            "/rhythm/bpm": command(lambda controller, args: controller.set_rhythm_bpm(float(args[0])) if args else None, press_only=False),
+            "/blackout": command(
+                lambda controller, args: controller.set_blackout(bool(args[0]) if args else not controller.state.blackout),
+                press_only=False,
+            ),
+            "/override/clear": command(lambda controller, _args: controller.clear_override()),
+            "/master": cls._set_master,
+        }
+        channels = "|".join(FIXTURE_CHANNELS)
+        pattern_routes = [
+            _Route(re.compile(r"/scene/(?P<scene_id>[^/]+)/apply"), apply_scene),
+            _Route(re.compile(r"/fixture/(?P<fixture_id>\d+)/rgb"), cls._set_fixture_rgb),
+            _Route(re.compile(rf"/fixture/(?P<fixture_id>\d+)/(?P<channel>{channels})"), cls._set_fixture_channel),
+        ]
+        return exact_routes, pattern_routes
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+from concurrent.futures import Future
+from urllib.parse import unquote, urlsplit
+
+from engine import EngineEvent, OutputChanged
+from engine.runner import EngineRunner
+
+from .commands import describe_state, execute_command
+
+DEFAULT_HTTP_HOST = "127.0.0.1"
+DEFAULT_HTTP_PORT = 7771
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_REQUEST_BODY = 1 << 20
+
+FRAME_FULL = b"F"
+FRAME_DELTA = b"D"
+
+_OPCODE_CONTINUATION = 0x0
+_OPCODE_TEXT = 0x1
+_OPCODE_BINARY = 0x2
+_OPCODE_CLOSE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+
+
+def encode_frame_delta(sequence: int, previous: bytes | None, frame: bytes) -> bytes:
+    if previous is None or len(previous) != len(frame):
+        return FRAME_FULL + struct.pack("!IH", sequence, len(frame)) + frame
+    runs: list[bytes] = []
+    index = 0
+    length = len(frame)
+    while index < length:
+        if frame[index] == previous[index]:
+            index += 1
+            continue
+        start = index
+        while index < length and frame[index] != previous[index]:
+            index += 1
+        runs.append(struct.pack("!HH", start, index - start) + frame[start:index])
+    return FRAME_DELTA + struct.pack("!IH", sequence, len(runs)) + b"".join(runs)
+
+
+def decode_frame_delta(message: bytes, previous: bytes | None) -> tuple[int, bytes]:
+    kind = message[:1]
+    sequence, count = struct.unpack_from("!IH", message, 1)
+    offset = 7
+    if kind == FRAME_FULL:
+        return sequence, bytes(message[offset:offset + count])
+    if previous is None:
+        raise ValueError("A delta frame needs a previous full frame.")
+    frame = bytearray(previous)
+    for _ in range(count):
+        start, run_length = struct.unpack_from("!HH", message, offset)
+        offset += 4
+        frame[start:start + run_length] = message[offset:offset + run_length]
+        offset += run_length
+    return sequence, bytes(frame)
+
+
+class _WebSocketClient:
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.topics: set[str] = set()
+        self.last_frame: bytes | None = None
+        self.frame_ready = asyncio.Event()
+        self.state_ready = asyncio.Event()
+        self.closed = False
+
+    async def send(self, opcode: int, payload: bytes) -> None:
+        header = bytearray([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header.append(length)
+        elif length < 1 << 16:
+            header.append(126)
+            header += struct.pack("!H", length)
+        else:
+            header.append(127)
+            header += struct.pack("!Q", length)
+        self.writer.write(bytes(header) + payload)
+        await self.writer.drain()
+
+    async def send_json(self, payload: dict) -> None:
+        await self.send(_OPCODE_TEXT, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+class RemoteApiServer:
+    def __init__(self, runner: EngineRunner, *, host: str = DEFAULT_HTTP_HOST, port: int = DEFAULT_HTTP_PORT) -> None:
+        self.runner = runner
+        self.host = host
+        self.port = port
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._clients: set[_WebSocketClient] = set()
+        self._frame: bytes | None = None
+        self._frame_sequence = 0
+        self._state: dict | None = None
+        self._state_stale = True
+        self._unsubscribe_events = None
+        self._startup_error: BaseException | None = None
+
+    @property
+    def address(self) -> tuple[str, int] | None:
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[:2]
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run_loop, name="mydmx-remote-api", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+        self._unsubscribe_events = self.runner.controller.events.subscribe(EngineEvent, self._on_engine_event)
+        self.runner.add_frame_listener(self._on_engine_frame)
+        self.runner.add_tick_listener(self._on_engine_tick)
+
+    def stop(self) -> None:
+        self.runner.remove_frame_listener(self._on_engine_frame)
+        self.runner.remove_tick_listener(self._on_engine_tick)
+        if self._unsubscribe_events is not None:
+            self._unsubscribe_events()
+            self._unsubscribe_events = None
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(2.0)
+        self._thread = None
+
+    def _run_loop(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        try:
+            self._server = loop.run_until_complete(asyncio.start_server(self._handle_connection, self.host, self.port))
+        except BaseException as exc:
+            self._startup_error = exc
+            self._ready.set()
+            loop.close()
+            return
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            for client in list(self._clients):
+                client.writer.close()
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+    # Engine thread -> event loop
+
+    def _on_engine_frame(self, frame: list[int]) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._publish_frame, bytes(frame))
+
+    def _on_engine_event(self, event: EngineEvent) -> None:
+        if not isinstance(event, OutputChanged):
+            self._state_stale = True
+
+    def _on_engine_tick(self) -> None:
+        if self._loop is None or not self._clients or not self._state_stale:
+            return
+        self._state_stale = False
+        snapshot = describe_state(self.runner.controller)
+        if snapshot != self._state:
+            self._state = snapshot
+            self._loop.call_soon_threadsafe(self._publish_state)
+
+    def _publish_frame(self, frame: bytes) -> None:
+        self._frame = frame
+        self._frame_sequence = (self._frame_sequence + 1) & 0xFFFFFFFF
+        for client in self._clients:
+            if "frames" in client.topics:
+                client.frame_ready.set()
+
+    def _publish_state(self) -> None:
+        for client in self._clients:
+            if "state" in client.topics:
+                client.state_ready.set()
+
+    # HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _version = request_line.decode("latin-1").split(" ", 2)
+            headers: dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            path = unquote(urlsplit(target).path)
+            if headers.get("upgrade", "").lower() == "websocket" and path == "/ws":
+                await self._serve_websocket(reader, writer, headers)
+                return
+            await self._serve_http(reader, writer, method.upper(), path, headers)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutdown; the connection is closed below.
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+    ) -> None:
+        length = int(headers.get("content-length", "0") or 0)
+        if length > MAX_REQUEST_BODY:
+            await self._write_http(writer, 413, {"ok": False, "error": "Request body too large."})
+            return
+        body = await reader.readexactly(length) if length else b""
+        if method == "GET" and path == "/state":
+            status, payload = await self._run_command("status", {})
+        elif method == "POST" and path.startswith("/command/"):
+            try:
+                params = json.loads(body) if body else {}
+            except json.JSONDecodeError as exc:
+                await self._write_http(writer, 400, {"ok": False, "error": str(exc)})
+                return
+            status, payload = await self._run_command(path[len("/command/"):], params)
+        else:
+            status, payload = 404, {"ok": False, "error": f"No route for {method} {path}"}
+        await self._write_http(writer, status, payload)
+
+    async def _write_http(self, writer: asyncio.StreamWriter, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large"}.get(status, "Error")
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+    async def _run_command(self, name: str, params: dict) -> tuple[int, dict]:
+        future: Future = self.runner.submit(execute_command, self.runner.controller, name, params)
+        try:
+            result = await asyncio.wrap_future(future)
+        except Exception as exc:
+            return 400, {"ok": False, "error": str(exc)}
+        return 200, {"ok": True, "result": result}
+
+    # WebSocket
+
+    async def _serve_websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: dict[str, str]) -> None:
+        key = headers.get("sec-websocket-key")
+        if not key:
+            await self._write_http(writer, 400, {"ok": False, "error": "Missing Sec-WebSocket-Key."})
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        client = _WebSocketClient(writer)
+        self._clients.add(client)
+        pump = asyncio.ensure_future(self._pump_updates(client))
+        try:
+            await self._read_messages(reader, client)
+        finally:
+            client.closed = True
+            self._clients.discard(client)
+            client.frame_ready.set()
+            pump.cancel()
+
+    async def _read_messages(self, reader: asyncio.StreamReader, client: _WebSocketClient) -> None:
+        fragments: list[bytes] = []
+        fragment_opcode = _OPCODE_TEXT
+        while True:
+            first, second = await reader.readexactly(2)
+            final = bool(first & 0x80)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                (length,) = struct.unpack("!H", await reader.readexactly(2))
+            elif length == 127:
+                (length,) = struct.unpack("!Q", await reader.readexactly(8))
+            if length > MAX_REQUEST_BODY:
+                await client.send(_OPCODE_CLOSE, struct.pack("!H", 1009))
+                return
+            mask = await reader.readexactly(4) if second & 0x80 else None
+            payload = await reader.readexactly(length)
+            if mask is not None:
+                payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+
+            if opcode == _OPCODE_CLOSE:
+                await client.send(_OPCODE_CLOSE, payload[:2])
+                return
+            if opcode == _OPCODE_PING:
+                await client.send(_OPCODE_PONG, payload)
+                continue
+            if opcode == _OPCODE_PONG:
+                continue
+            if opcode != _OPCODE_CONTINUATION:
+                fragment_opcode = opcode
+                fragments = []
+            fragments.append(payload)
+            if not final:
+                continue
+            message = b"".join(fragments)
+            fragments = []
+            if fragment_opcode == _OPCODE_TEXT:
+                await self._handle_ws_message(client, message)
+
+    async def _handle_ws_message(self, client: _WebSocketClient, message: bytes) -> None:
+        try:
+            request = json.loads(message)
+            name = request["command"]
+            params = request.get("params", {})
+        except (json.JSONDecodeError, KeyError, TypeError) as exc:
+            await client.send_json({"ok": False, "error": f"Malformed command: {exc}"})
+            return
+        request_id = request.get("id")
+        if not isinstance(params, dict):
+            await client.send_json({"id": request_id, "ok": False, "error": "Command params must be a JSON object."})
+            return
+        if name == "subscribe":
+            topics = params.get("topics", ["state", "frames"])
+            if not isinstance(topics, list):
+                await client.send_json({"id": request_id, "ok": False, "error": "Subscribe topics must be a list."})
+                return
+            client.topics = {str(topic) for topic in topics}
+            self._state_stale = True
+            client.last_frame = None
+            if "state" in client.topics:
+                client.state_ready.set()
+            if "frames" in client.topics and self._frame is not None:
+                client.frame_ready.set()
+            await client.send_json({"id": request_id, "ok": True, "result": sorted(client.topics)})
+            return
+        _status, payload = await self._run_command(name, params)
+        payload["id"] = request_id
+        await client.send_json(payload)
+
+    async def _pump_updates(self, client: _WebSocketClient) -> None:
+        # Each client gets the latest frame diffed against what it last received,
+        # so a slow client skips intermediate frames instead of queueing them.
+        waiters = {
+            "frame": asyncio.ensure_future(client.frame_ready.wait()),
+            "state": asyncio.ensure_future(client.state_ready.wait()),
+        }
+        try:
+            while not client.closed:
+                await asyncio.wait(waiters.values(), return_when=asyncio.FIRST_COMPLETED)
+                if client.closed:
+                    return
+                if client.state_ready.is_set():
+                    client.state_ready.clear()
+                    waiters["state"] = asyncio.ensure_future(client.state_ready.wait())
+                    if self._state is not None:
+                        await client.send_json({"event": "state", "state": self._state})
+                if client.frame_ready.is_set():
+                    client.frame_ready.clear()
+                    waiters["frame"] = asyncio.ensure_future(client.frame_ready.wait())
+                    frame = self._frame
+                    if frame is not None and frame != client.last_frame:
+                        await client.send(_OPCODE_BINARY, encode_frame_delta(self._frame_sequence, client.last_frame, frame))
+                        client.last_frame = frame
+        finally:
+            for waiter in waiters.values():
+                waiter.cancel()
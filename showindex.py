@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from storage.library_index import ShowSummary, index_library, read_index, search_index, write_index
+
+DEFAULT_INDEX_NAME = "show-index.json"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Index, validate and search a library of MyDMX show files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("index", help="Scan a directory tree and write a searchable index.")
+    index_parser.add_argument("root", help="Directory to scan for .json, .dmxshow and .dmxdb shows.")
+    index_parser.add_argument("-o", "--output", help=f"Index file to write; defaults to ROOT/{DEFAULT_INDEX_NAME}.")
+    index_parser.add_argument("-j", "--jobs", type=int, help="Worker processes; defaults to the CPU count.")
+    index_parser.add_argument("--full", action="store_true", help="Rescan every file instead of reusing unchanged entries.")
+
+    validate_parser = subparsers.add_parser("validate", help="Check every show for patch overlaps and dangling references.")
+    validate_parser.add_argument("root", help="Directory to scan.")
+    validate_parser.add_argument("-j", "--jobs", type=int, help="Worker processes; defaults to the CPU count.")
+
+    search_parser = subparsers.add_parser("search", help="Query an index written by the index command.")
+    search_parser.add_argument("index", help="Index file to search.")
+    search_parser.add_argument("text", nargs="?", help="Match against paths, scene names and sequence names.")
+    search_parser.add_argument("--universe", type=int, help="Only shows that patch this universe.")
+    search_parser.add_argument("--min-fixtures", type=int, help="Only shows with at least this many fixtures.")
+    search_parser.add_argument("--schema-version", type=int, help="Only shows with this schema version.")
+    search_parser.add_argument("--invalid", action="store_true", help="Only shows with validation problems.")
+    return parser
+
+
+def format_summary(summary: ShowSummary) -> str:
+    if summary.error is not None:
+        return f"{summary.path}: unreadable ({summary.error})"
+    ranges = ", ".join(f"U{universe} {first}-{last}" for universe, first, last in summary.address_ranges) or "no patch"
+    return (
+        f"{summary.path}: {summary.fixture_count} fixtures, {summary.scene_count} scenes, "
+        f"{summary.sequence_count} sequences ({summary.cue_count} cues), schema {summary.schema_version}, {ranges}"
+    )
+
+
+def print_problems(summaries: list[ShowSummary]) -> int:
+    invalid = 0
+    for summary in summaries:
+        if summary.is_valid:
+            continue
+        invalid += 1
+        print(format_summary(summary) if summary.error is not None else f"{summary.path}:")
+        for problem in summary.problems:
+            print(f"  - {problem}")
+    return invalid
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "index":
+        output = Path(args.output) if args.output else Path(args.root) / DEFAULT_INDEX_NAME
+        previous = read_index(output) if output.exists() and not args.full else None
+        summaries = index_library(args.root, jobs=args.jobs, previous=previous, exclude={output})
+        write_index(output, summaries)
+        invalid = sum(1 for summary in summaries if not summary.is_valid)
+        print(f"Indexed {len(summaries)} shows into {output} ({invalid} with problems).")
+        return 0
+    if args.command == "validate":
+        summaries = index_library(args.root, jobs=args.jobs)
+        invalid = print_problems(summaries)
+        print(f"Checked {len(summaries)} shows, {invalid} with problems.")
+        return 1 if invalid else 0
+    matches = search_index(
+        read_index(args.index),
+        text=args.text,
+        universe=args.universe,
+        min_fixtures=args.min_fixtures,
+        schema_version=args.schema_version,
+        invalid_only=args.invalid,
+    )
+    for summary in matches:
+        print(format_summary(summary))
+        for problem in summary.problems:
+            print(f"  - {problem}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,18 @@
+from .binary_show import BINARY_SUFFIX, BinaryShowCodec, is_binary_show
+from .journal import ShowJournal
+from .lazy_scenes import LazySceneLibrary
+from .show_cache import ShowCache
 from .show_repository import ShowRepository
+from .sqlite_repository import SQLITE_SUFFIX, SqliteShowRepository
 
-__all__ = ["ShowRepository"]
\ No newline at end of file
+__all__ = [
+    "BINARY_SUFFIX",
+    "BinaryShowCodec",
+    "LazySceneLibrary",
+    "SQLITE_SUFFIX",
+    "ShowCache",
+    "ShowJournal",
+    "ShowRepository",
+    "SqliteShowRepository",
+    "is_binary_show",
+]
\ No newline at end of file
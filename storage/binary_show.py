@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import lzma
+import struct
+import zlib
+from collections.abc import Iterable, Mapping
+from functools import partial
+
+from engine.models import Cue, FixtureGroup, FixturePatch, FixtureState, Palette, Scene, Sequence, ShowFile, Transition, TriggerMode
+from engine.palettes import share_state_blocks
+
+from .lazy_scenes import LazySceneLibrary
+
+MAGIC = b"MYDMXSHW"
+FORMAT_VERSION = 2
+BINARY_SUFFIX = ".dmxshow"
+
+_HEADER = struct.Struct("<8sHBxII")
+_SECTION = struct.Struct("<4sQQQ")
+_COUNT = struct.Struct("<I")
+_FIXTURE = struct.Struct("<iHHiiiH")
+_NAMED = struct.Struct("<III")
+_SCENE_TAIL = struct.Struct("<II")
+_SEQUENCE = struct.Struct("<IIIBI")
+_CUE = struct.Struct("<IIIBIII")
+
+_COMPRESSION_CODES = {None: 0, "zlib": 1, "lzma": 2}
+_TRIGGER_MODES = list(TriggerMode)
+_CHANNELS = ("intensity", "red", "green", "blue", "white")
+_STATE_STRIDE = 4 + len(_CHANNELS)
+_SECTION_ORDER = (b"FIXT", b"GRPS", b"PALS", b"SCNS", b"SEQS")
+
+
+def is_binary_show(data: bytes) -> bool:
+    return data[: len(MAGIC)] == MAGIC
+
+
+class BinaryShowCodec:
+    def dumps(self, show_file: ShowFile, *, compression: str | None = "zlib") -> bytes:
+        if compression not in _COMPRESSION_CODES:
+            raise ValueError(f"Unsupported compression: {compression}")
+        strings = _StringTable()
+        scenes = list(show_file.scenes.values()) if isinstance(show_file.scenes, Mapping) else show_file.scenes
+        palettes, scenes = share_state_blocks(show_file.palettes, scenes)
+        sections = {
+            b"FIXT": self._encode_fixtures(show_file.fixtures),
+            b"GRPS": self._encode_groups(show_file.groups, strings),
+            b"PALS": self._encode_palettes(palettes, strings),
+            b"SCNS": self._encode_scenes(scenes, {palette.id for palette in palettes}, strings),
+            b"SEQS": self._encode_sequences(show_file.sequences, strings),
+        }
+        ordered = [(b"STRS", strings.encode()), *((tag, sections[tag]) for tag in _SECTION_ORDER)]
+
+        offset = _HEADER.size + _SECTION.size * len(ordered)
+        table = []
+        bodies = []
+        for tag, raw in ordered:
+            body = _compress(raw, compression)
+            table.append(_SECTION.pack(tag, offset, len(body), len(raw)))
+            bodies.append(body)
+            offset += len(body)
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, _COMPRESSION_CODES[compression], show_file.schema_version, len(ordered))
+        return b"".join([header, *table, *bodies])
+
+    def loads(self, data: bytes, *, lazy: bool = False) -> ShowFile:
+        if not is_binary_show(data):
+            raise ValueError("Not a binary show file")
+        _magic, version, compression_code, schema_version, section_count = _HEADER.unpack_from(data, 0)
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary show format version: {version}")
+        compression = next((name for name, code in _COMPRESSION_CODES.items() if code == compression_code), "")
+        if compression == "":
+            raise ValueError(f"Unsupported compression code: {compression_code}")
+
+        sections: dict[bytes, memoryview] = {}
+        for index in range(section_count):
+            tag, offset, length, raw_length = _SECTION.unpack_from(data, _HEADER.size + index * _SECTION.size)
+            raw = _decompress(data[offset:offset + length], compression)
+            if len(raw) != raw_length:
+                raise ValueError(f"Corrupt section {tag.decode('ascii', 'replace')}")
+            sections[tag] = memoryview(raw)
+
+        strings = _StringTable.decode(sections[b"STRS"])
+        palettes = self._decode_palettes(sections[b"PALS"], strings) if b"PALS" in sections else {}
+        return ShowFile(
+            fixtures=self._decode_fixtures(sections[b"FIXT"]),
+            groups=self._decode_groups(sections[b"GRPS"], strings),
+            scenes=self._decode_scenes(sections[b"SCNS"], strings, palettes, version, lazy=lazy),
+            sequences=self._decode_sequences(sections[b"SEQS"], strings),
+            schema_version=schema_version,
+            palettes=list(palettes.values()),
+        )
+
+    def _encode_fixtures(self, fixtures: list[FixturePatch]) -> bytes:
+        parts = [_COUNT.pack(len(fixtures))]
+        for patch in fixtures:
+            parts.append(
+                _FIXTURE.pack(
+                    patch.fixture_id,
+                    patch.start_address,
+                    patch.num_channels,
+                    patch.position[0],
+                    patch.position[1],
+                    patch.angle,
+                    patch.universe,
+                )
+            )
+        return b"".join(parts)
+
+    def _decode_fixtures(self, view: memoryview) -> list[FixturePatch]:
+        (count,) = _COUNT.unpack_from(view, 0)
+        return [
+            FixturePatch(
+                fixture_id=fixture_id,
+                start_address=start_address,
+                num_channels=num_channels,
+                position=(x, y),
+                angle=angle,
+                universe=universe,
+            )
+            for fixture_id, start_address, num_channels, x, y, angle, universe in _FIXTURE.iter_unpack(view[_COUNT.size:_COUNT.size + count * _FIXTURE.size])
+        ]
+
+    def _encode_groups(self, groups: list[FixtureGroup], strings: _StringTable) -> bytes:
+        parts = [_COUNT.pack(len(groups))]
+        for group in groups:
+            parts.append(_NAMED.pack(strings.add(group.id), strings.add(group.name), len(group.fixture_ids)))
+            parts.append(struct.pack(f"<{len(group.fixture_ids)}i", *group.fixture_ids))
+        return b"".join(parts)
+
+    def _decode_groups(self, view: memoryview, strings: list[str]) -> list[FixtureGroup]:
+        (count,) = _COUNT.unpack_from(view, 0)
+        position = _COUNT.size
+        groups = []
+        for _ in range(count):
+            id_index, name_index, fixture_count = _NAMED.unpack_from(view, position)
+            position += _NAMED.size
+            fixture_ids = list(struct.unpack_from(f"<{fixture_count}i", view, position))
+            position += 4 * fixture_count
+            groups.append(FixtureGroup(id=strings[id_index], name=strings[name_index], fixture_ids=fixture_ids))
+        return groups
+
+    def _encode_palettes(self, palettes: list[Palette], strings: _StringTable) -> bytes:
+        parts = [_COUNT.pack(len(palettes))]
+        for palette in palettes:
+            states = [state.normalized() for state in palette.fixture_states.values()]
+            parts.append(_NAMED.pack(strings.add(palette.id), strings.add(palette.name), len(states)))
+            parts.extend(_encode_states(states))
+        return b"".join(parts)
+
+    def _decode_palettes(self, view: memoryview, strings: list[str]) -> dict[str, Palette]:
+        (count,) = _COUNT.unpack_from(view, 0)
+        position = _COUNT.size
+        palettes = {}
+        for _ in range(count):
+            id_index, name_index, state_count = _NAMED.unpack_from(view, position)
+            fixture_states = _decode_states(view, position + _NAMED.size, state_count)
+            palettes[strings[id_index]] = Palette(id=strings[id_index], name=strings[name_index], fixture_states=fixture_states)
+            position += _NAMED.size + _STATE_STRIDE * state_count
+        return palettes
+
+    def _encode_scenes(self, scenes: Iterable[Scene], palette_ids: set[str], strings: _StringTable) -> bytes:
+        scenes = list(scenes)
+        parts = [_COUNT.pack(len(scenes))]
+        for scene in scenes:
+            # Scenes whose palette is written once in PALS carry only the reference.
+            shared = scene.palette_id in palette_ids
+            states = [] if shared else [state.normalized() for state in scene.fixture_states.values()]
+            palette_ref = strings.add(scene.palette_id) + 1 if scene.palette_id is not None else 0
+            parts.append(_NAMED.pack(strings.add(scene.id), strings.add(scene.name), len(states)))
+            parts.append(_SCENE_TAIL.pack(strings.add(scene.notes), palette_ref))
+            parts.extend(_encode_states(states))
+        return b"".join(parts)
+
+    def _decode_scenes(
+        self,
+        view: memoryview,
+        strings: list[str],
+        palettes: dict[str, Palette],
+        version: int,
+        *,
+        lazy: bool,
+    ) -> list[Scene] | LazySceneLibrary:
+        (count,) = _COUNT.unpack_from(view, 0)
+        position = _COUNT.size
+        tail_size = _SCENE_TAIL.size if version >= 2 else _COUNT.size
+        entries: dict[str, tuple[str, int]] = {}
+        for _ in range(count):
+            id_index, name_index, state_count = _NAMED.unpack_from(view, position)
+            entries[strings[id_index]] = (strings[name_index], position)
+            position += _NAMED.size + tail_size + _STATE_STRIDE * state_count
+        materialize = partial(self._decode_scene, view, strings, palettes, version)
+        if lazy:
+            return LazySceneLibrary(entries, materialize)
+        return [materialize(position) for _name, position in entries.values()]
+
+    def _decode_scene(self, view: memoryview, strings: list[str], palettes: dict[str, Palette], version: int, position: int) -> Scene:
+        id_index, name_index, state_count = _NAMED.unpack_from(view, position)
+        position += _NAMED.size
+        if version >= 2:
+            notes_index, palette_ref = _SCENE_TAIL.unpack_from(view, position)
+            position += _SCENE_TAIL.size
+        else:
+            (notes_index,) = _COUNT.unpack_from(view, position)
+            palette_ref = 0
+            position += _COUNT.size
+        palette_id = strings[palette_ref - 1] if palette_ref else None
+        palette = palettes.get(palette_id) if palette_id is not None else None
+        if palette is not None and state_count == 0:
+            fixture_states = palette.fixture_states
+        else:
+            fixture_states = _decode_states(view, position, state_count)
+        return Scene(
+            id=strings[id_index],
+            name=strings[name_index],
+            fixture_states=fixture_states,
+            notes=strings[notes_index],
+            palette_id=palette_id,
+        )
+
+    def _encode_sequences(self, sequences: list[Sequence], strings: _StringTable) -> bytes:
+        parts = [_COUNT.pack(len(sequences))]
+        for sequence in sequences:
+            flags = int(sequence.cyclic) | int(sequence.tracking) << 1
+            parts.append(
+                _SEQUENCE.pack(strings.add(sequence.id), strings.add(sequence.name), strings.add(sequence.notes), flags, len(sequence.cues))
+            )
+            for cue in sequence.cues:
+                parts.append(
+                    _CUE.pack(
+                        strings.add(cue.id),
+                        strings.add(cue.scene_id),
+                        strings.add(cue.notes),
+                        _TRIGGER_MODES.index(cue.trigger_mode),
+                        cue.transition.fade_in_ms,
+                        cue.transition.fade_out_ms,
+                        cue.transition.hold_ms,
+                    )
+                )
+        return b"".join(parts)
+
+    def _decode_sequences(self, view: memoryview, strings: list[str]) -> list[Sequence]:
+        (count,) = _COUNT.unpack_from(view, 0)
+        position = _COUNT.size
+        sequences = []
+        for _ in range(count):
+            id_index, name_index, notes_index, flags, cue_count = _SEQUENCE.unpack_from(view, position)
+            position += _SEQUENCE.size
+            cues = []
+            for cue_id, scene_id, cue_notes, trigger, fade_in_ms, fade_out_ms, hold_ms in _CUE.iter_unpack(view[position:position + cue_count * _CUE.size]):
+                cues.append(
+                    Cue(
+                        id=strings[cue_id],
+                        scene_id=strings[scene_id],
+                        notes=strings[cue_notes],
+                        trigger_mode=_TRIGGER_MODES[trigger],
+                        transition=Transition(fade_in_ms=fade_in_ms, fade_out_ms=fade_out_ms, hold_ms=hold_ms),
+                    )
+                )
+            position += cue_count * _CUE.size
+            sequences.append(
+                Sequence(
+                    id=strings[id_index],
+                    name=strings[name_index],
+                    cues=cues,
+                    notes=strings[notes_index],
+                    cyclic=bool(flags & 1),
+                    tracking=bool(flags & 2),
+                )
+            )
+        return sequences
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self._indexes: dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        index = self._indexes.get(value)
+        if index is None:
+            index = self._indexes[value] = len(self._indexes)
+        return index
+
+    def encode(self) -> bytes:
+        parts = [_COUNT.pack(len(self._indexes))]
+        for value in self._indexes:
+            encoded = value.encode("utf-8")
+            parts.append(_COUNT.pack(len(encoded)))
+            parts.append(encoded)
+        return b"".join(parts)
+
+    @staticmethod
+    def decode(view: memoryview) -> list[str]:
+        (count,) = _COUNT.unpack_from(view, 0)
+        position = _COUNT.size
+        strings = []
+        for _ in range(count):
+            (length,) = _COUNT.unpack_from(view, position)
+            position += _COUNT.size
+            strings.append(str(view[position:position + length], "utf-8"))
+            position += length
+        return strings
+
+
+def _encode_states(states: list[FixtureState]) -> list[bytes]:
+    return [
+        struct.pack(f"<{len(states)}i", *(state.fixture_id for state in states)),
+        bytes(getattr(state, channel) for state in states for channel in _CHANNELS),
+    ]
+
+
+def _decode_states(view: memoryview, position: int, count: int) -> dict[int, FixtureState]:
+    fixture_ids = struct.unpack_from(f"<{count}i", view, position)
+    position += 4 * count
+    values = iter(view[position:position + len(_CHANNELS) * count])
+    return {
+        fixture_id: FixtureState(fixture_id, intensity, red, green, blue, white)
+        for fixture_id, intensity, red, green, blue, white in zip(fixture_ids, values, values, values, values, values)
+    }
+
+
+def _compress(raw: bytes, compression: str | None) -> bytes:
+    if compression == "zlib":
+        return zlib.compress(raw, 6)
+    if compression == "lzma":
+        return lzma.compress(raw)
+    return raw
+
+
+def _decompress(body: bytes, compression: str | None) -> bytes:
+    if compression == "zlib":
+        return zlib.decompress(body)
+    if compression == "lzma":
+        return lzma.decompress(body)
+    return bytes(body)
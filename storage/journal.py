@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import sys
+import threading
+from collections.abc import Callable, MutableMapping
+from concurrent.futures import Future
+from pathlib import Path
+
+from engine import EngineController, PalettesChanged, PatchChanged, ScenesChanged, SequencesChanged
+from engine.models import FixturePatch, Palette, ShowFile
+
+from .binary_show import BINARY_SUFFIX
+from .show_repository import ShowRepository
+from .sqlite_repository import SQLITE_SUFFIX
+
+JOURNAL_SUFFIX = ".journal"
+DEFAULT_COMPACT_AFTER = 500
+
+_STOP = object()
+
+
+class _Compaction:
+    __slots__ = ("show_file", "future")
+
+    def __init__(self, show_file: ShowFile | None) -> None:
+        self.show_file = show_file
+        self.future: Future[None] = Future()
+
+
+class ShowJournal:
+    def __init__(
+        self,
+        snapshot_path: str | Path,
+        repository: ShowRepository | None = None,
+        *,
+        compact_after: int = DEFAULT_COMPACT_AFTER,
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> None:
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(self.snapshot_path.name + JOURNAL_SUFFIX)
+        self.repository = repository or ShowRepository()
+        self.compact_after = compact_after
+        self.on_error = on_error
+        self._controller: EngineController | None = None
+        self._unsubscribers: list[Callable[[], None]] = []
+        self._queue: queue.Queue = queue.Queue()
+        self._records_since_compaction = 0
+        self._thread = threading.Thread(target=self._run, name="mydmx-journal", daemon=True)
+        self._thread.start()
+
+    def attach(self, controller: EngineController) -> None:
+        self.detach()
+        self._controller = controller
+        self._unsubscribers = [
+            controller.events.subscribe(ScenesChanged, self._on_scenes_changed),
+            controller.events.subscribe(PalettesChanged, self._on_palettes_changed),
+            controller.events.subscribe(SequencesChanged, self._on_sequences_changed),
+            controller.events.subscribe(PatchChanged, self._on_patch_changed),
+        ]
+
+    def detach(self) -> None:
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+        self._controller = None
+
+    def replay(self, show_file: ShowFile) -> int:
+        records = self.read_records()
+        if not records:
+            return 0
+        scenes = show_file.scenes if isinstance(show_file.scenes, MutableMapping) else {scene.id: scene for scene in show_file.scenes}
+        sequences = {sequence.id: sequence for sequence in show_file.sequences}
+        fixtures = {patch.fixture_id: patch for patch in show_file.fixtures}
+        palettes = {palette.id: palette for palette in show_file.palettes}
+        for record in records:
+            op = record.get("op")
+            if op == "scene":
+                scene = self.repository._deserialize_scene(record["scene"])
+                if scene.palette_id is not None:
+                    palette = palettes.setdefault(scene.palette_id, Palette(id=scene.palette_id, fixture_states=scene.fixture_states))
+                    scene.fixture_states = palette.fixture_states
+                scenes[scene.id] = scene
+            elif op == "palette":
+                palette = self.repository._deserialize_palette(record["palette"])
+                if palette.id in palettes:
+                    palettes[palette.id].name = palette.name
+                    palettes[palette.id].fixture_states.clear()
+                    palettes[palette.id].fixture_states.update(palette.fixture_states)
+                else:
+                    palettes[palette.id] = palette
+            elif op == "remove_scene":
+                scenes.pop(record["id"], None)
+            elif op == "sequence":
+                sequence = self.repository._deserialize_sequence(record["sequence"])
+                sequences[sequence.id] = sequence
+            elif op == "remove_sequence":
+                sequences.pop(record["id"], None)
+            elif op == "fixture":
+                patch = self.repository._deserialize_fixture_patch(record["fixture"])
+                fixtures[patch.fixture_id] = patch
+            elif op == "remove_fixture":
+                fixtures.pop(record["fixture_id"], None)
+        if not isinstance(show_file.scenes, MutableMapping):
+            show_file.scenes = list(scenes.values())
+        show_file.sequences = list(sequences.values())
+        show_file.fixtures = list(fixtures.values())
+        show_file.palettes = list(palettes.values())
+        return len(records)
+
+    def read_records(self) -> list[dict]:
+        try:
+            lines = self.journal_path.read_bytes().splitlines()
+        except FileNotFoundError:
+            return []
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # A crash can leave the final record half written.
+                break
+        return records
+
+    def append(self, record: dict) -> None:
+        self._queue.put(record)
+
+    def compact(self, show_file: ShowFile | None = None) -> Future[None]:
+        # With a show file the snapshot is rewritten from it; without one the journal is replayed over the snapshot.
+        return self._request(_Compaction(show_file))
+
+    def write_snapshot(self, show_file: ShowFile) -> Future[None]:
+        return self._request(_Compaction(show_file))
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self, *, compact: bool = True, wait: bool = True, timeout: float | None = 10.0) -> None:
+        self.detach()
+        if compact:
+            self.compact()
+        self._queue.put(_STOP)
+        if wait:
+            self._thread.join(timeout)
+
+    def _request(self, compaction: _Compaction) -> Future[None]:
+        self._queue.put(compaction)
+        return compaction.future
+
+    def _on_scenes_changed(self, event: ScenesChanged) -> None:
+        scenes = self._controller.state.scenes
+        is_materialized = getattr(scenes, "is_materialized", None)
+        for scene_id in sorted(event.scene_ids):
+            if scene_id not in scenes:
+                self.append({"op": "remove_scene", "id": scene_id})
+            elif is_materialized is None or is_materialized(scene_id):
+                self.append({"op": "scene", "scene": self.repository._serialize_scene(scenes[scene_id])})
+
+    def _on_palettes_changed(self, event: PalettesChanged) -> None:
+        palettes = self._controller.state.palettes
+        for palette_id in sorted(event.palette_ids):
+            palette = palettes.get(palette_id)
+            if palette is not None:
+                self.append({"op": "palette", "palette": self.repository._serialize_palette(palette)})
+
+    def _on_sequences_changed(self, event: SequencesChanged) -> None:
+        sequences = self._controller.state.sequences
+        for sequence_id in sorted(event.sequence_ids):
+            sequence = sequences.get(sequence_id)
+            if sequence is None:
+                self.append({"op": "remove_sequence", "id": sequence_id})
+            else:
+                self.append({"op": "sequence", "sequence": self.repository._serialize_sequence(sequence)})
+
+    def _on_patch_changed(self, event: PatchChanged) -> None:
+        patch_index = self._controller.patch_index
+        for fixture_id in sorted(event.fixture_ids):
+            if fixture_id not in patch_index:
+                self.append({"op": "remove_fixture", "fixture_id": fixture_id})
+                continue
+            fixture = patch_index.get(fixture_id)
+            patch = FixturePatch(
+                fixture_id=fixture.fixture_id,
+                start_address=fixture.start_address,
+                num_channels=fixture.num_channels,
+                position=fixture.position,
+                angle=fixture.angle,
+                universe=fixture.universe,
+            )
+            self.append({"op": "fixture", "fixture": self.repository._serialize_fixture_patch(patch)})
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            records: list[dict] = []
+            for item in items:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _Compaction):
+                    self._write_records(records)
+                    records = []
+                    error = self._compact(item.show_file)
+                    if error is None:
+                        item.future.set_result(None)
+                    else:
+                        item.future.set_exception(error)
+                else:
+                    records.append(item)
+            self._write_records(records)
+            if self._records_since_compaction >= self.compact_after:
+                error = self._compact(None)
+                if error is not None:
+                    # Wait for another batch of records rather than failing again on every write.
+                    self._records_since_compaction = 0
+                    self._report(error)
+            for _item in items:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_records(self, records: list[dict]) -> None:
+        if not records:
+            return
+        try:
+            with self.journal_path.open("ab") as handle:
+                handle.write(b"".join(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n" for record in records))
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._records_since_compaction += len(records)
+        except OSError as exc:
+            self._report(exc)
+
+    def _report(self, error: Exception) -> None:
+        if self.on_error is not None:
+            self.on_error(error)
+        else:
+            print(f"Show journal {self.journal_path} failed: {error!r}", file=sys.stderr)
+
+    def _compact(self, show_file: ShowFile | None) -> Exception | None:
+        try:
+            if show_file is None:
+                if not self.journal_path.exists():
+                    return None
+                # A database snapshot is loaded lazily so compaction only rewrites the scenes the journal touched.
+                show_file = self.repository.load(self.snapshot_path, lazy=self.snapshot_path.suffix.lower() == SQLITE_SUFFIX)
+                self.replay(show_file)
+            suffix = self.snapshot_path.suffix.lower()
+            if suffix == SQLITE_SUFFIX:
+                self.repository.save(self.snapshot_path, show_file)
+            else:
+                temporary_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+                self.repository.save(temporary_path, show_file, binary=suffix == BINARY_SUFFIX)
+                os.replace(temporary_path, self.snapshot_path)
+            self.journal_path.unlink(missing_ok=True)
+            self._records_since_compaction = 0
+            return None
+        except Exception as exc:
+            return exc
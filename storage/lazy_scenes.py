@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+from collections.abc import Callable, Iterator, MutableMapping
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from engine.models import Scene
+
+_STRING = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+_FLAT = rb'[^{}\[\]"]*+(?:' + _STRING + rb'[^{}\[\]"]*+)*+'
+
+
+def _nest(inner: bytes) -> bytes:
+    return _FLAT + rb'(?:(?:\{' + inner + rb'\}|\[' + inner + rb'\])' + _FLAT + rb')*+'
+
+
+def _bounded(depth: int) -> bytes:
+    inner = _FLAT
+    for _level in range(depth - 1):
+        inner = _nest(inner)
+    return rb'\{' + inner + rb'\}|\[' + inner + rb'\]|' + _STRING + rb'|[^{}\[\]",\s]++'
+
+
+# Show files nest at most five levels deep (sequences, sequence, cues, cue, transition), so one bounded
+# pattern skips a whole value in C. Anything deeper falls back to _scan_value.
+_BOUNDED_VALUE = re.compile(_bounded(5), re.DOTALL)
+_STRING_TOKEN = re.compile(_STRING, re.DOTALL)
+_STRUCTURAL = re.compile(rb'[{}\[\]"]')
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_SCENE_HEAD = re.compile(rb'\{[ \t\n\r]*"id"[ \t\n\r]*:[ \t\n\r]*(' + _STRING + rb')[ \t\n\r]*,[ \t\n\r]*"name"[ \t\n\r]*:[ \t\n\r]*(' + _STRING + rb')', re.DOTALL)
+
+
+class LazySceneLibrary(MutableMapping[str, Scene]):
+    def __init__(self, entries: dict[str, tuple[str, Any]], materialize: Callable[[Any], Scene]) -> None:
+        self._materialize = materialize
+        self._names = {scene_id: name for scene_id, (name, _location) in entries.items()}
+        self._slots: dict[str, Scene | _Unloaded] = {
+            scene_id: _Unloaded(location) for scene_id, (_name, location) in entries.items()
+        }
+
+    @property
+    def reader(self) -> Callable[[Any], Scene]:
+        return self._materialize
+
+    @property
+    def materialized_count(self) -> int:
+        return sum(1 for slot in self._slots.values() if isinstance(slot, Scene))
+
+    def snapshot(self) -> LazySceneLibrary:
+        # A shallow copy that another thread can read while this library keeps changing.
+        copy = LazySceneLibrary({}, self._materialize)
+        copy._names = dict(self._names)
+        copy._slots = dict(self._slots)
+        return copy
+
+    def names(self) -> dict[str, str]:
+        return {
+            scene_id: slot.name if isinstance(slot, Scene) else self._names[scene_id]
+            for scene_id, slot in self._slots.items()
+        }
+
+    def is_materialized(self, scene_id: str) -> bool:
+        return isinstance(self._slots[scene_id], Scene)
+
+    def peek(self, scene_id: str) -> Scene:
+        slot = self._slots[scene_id]
+        return slot if isinstance(slot, Scene) else self._materialize(slot.location)
+
+    def __getitem__(self, scene_id: str) -> Scene:
+        slot = self._slots[scene_id]
+        if isinstance(slot, Scene):
+            return slot
+        scene = self._materialize(slot.location)
+        self._slots[scene_id] = scene
+        return scene
+
+    def __setitem__(self, scene_id: str, scene: Scene) -> None:
+        self._slots[scene_id] = scene
+
+    def __delitem__(self, scene_id: str) -> None:
+        del self._slots[scene_id]
+        self._names.pop(scene_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, scene_id: object) -> bool:
+        return scene_id in self._slots
+
+
+class JsonSceneReader:
+    def __init__(self, path: str | Path, deserialize: Callable[[dict], Scene]) -> None:
+        self._path = Path(path)
+        self._deserialize = deserialize
+        self._signature = _signature(os.stat(self._path))
+        self._relocated: dict[str, tuple[str, tuple[str, int, int]]] | None = None
+
+    def __call__(self, location: tuple[str, int, int]) -> Scene:
+        # Opened per read: a handle held open would stop journal compaction from replacing the file on Windows.
+        scene_id, offset, length = location
+        with self._path.open("rb") as handle:
+            signature = _signature(os.fstat(handle.fileno()))
+            if signature != self._signature:
+                # Compaction rewrote the snapshot. Scenes that were never materialised are carried over unchanged,
+                # so they are found again by id.
+                _header, self._relocated = _index_handle(handle)
+                self._signature = signature
+            if self._relocated is not None:
+                _name, (_scene_id, offset, length) = self._relocated[scene_id]
+            handle.seek(offset)
+            return self._deserialize(json.loads(handle.read(length)))
+
+
+def index_show_file(path: str | Path) -> tuple[dict, dict[str, tuple[str, tuple[str, int, int]]]]:
+    with Path(path).open("rb") as handle:
+        return _index_handle(handle)
+
+
+def _index_handle(handle: BinaryIO) -> tuple[dict, dict[str, tuple[str, tuple[str, int, int]]]]:
+    # Scene bodies are skipped over a memory map without being decoded; only their id, name and byte range are kept.
+    try:
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        raise ValueError("Malformed show file: the file is empty") from None
+    try:
+        return _index_buffer(buffer)
+    finally:
+        buffer.close()
+
+
+def _index_buffer(buffer: mmap.mmap) -> tuple[dict, dict[str, tuple[str, tuple[str, int, int]]]]:
+    header: dict = {}
+    entries: dict[str, tuple[str, tuple[str, int, int]]] = {}
+    position = _skip(buffer, _expect(buffer, _skip(buffer, 0), b"{"))
+    if buffer[position:position + 1] == b"}":
+        return header, entries
+    while True:
+        key_match = _STRING_TOKEN.match(buffer, position)
+        if key_match is None:
+            raise ValueError(f"Malformed show file: expected a key at offset {position}")
+        key = json.loads(key_match.group())
+        position = _skip(buffer, _expect(buffer, _skip(buffer, key_match.end()), b":"))
+        if key == "scenes":
+            position = _index_scenes(buffer, position, entries)
+        else:
+            end = _skip_value(buffer, position)
+            header[key] = json.loads(buffer[position:end])
+            position = end
+        position = _skip(buffer, position)
+        if buffer[position:position + 1] == b"}":
+            return header, entries
+        position = _skip(buffer, _expect(buffer, position, b","))
+
+
+def _index_scenes(buffer: mmap.mmap, position: int, entries: dict[str, tuple[str, tuple[str, int, int]]]) -> int:
+    position = _skip(buffer, _expect(buffer, position, b"["))
+    if buffer[position:position + 1] == b"]":
+        return position + 1
+    while True:
+        end = _skip_value(buffer, position)
+        head = _SCENE_HEAD.match(buffer, position, end)
+        if head is not None:
+            scene_id, name = json.loads(head.group(1)), json.loads(head.group(2))
+        else:
+            scene = json.loads(buffer[position:end])
+            scene_id, name = scene["id"], scene["name"]
+        entries[scene_id] = (name, (scene_id, position, end - position))
+        position = _skip(buffer, end)
+        if buffer[position:position + 1] == b"]":
+            return position + 1
+        position = _skip(buffer, _expect(buffer, position, b","))
+
+
+class _Unloaded:
+    __slots__ = ("location",)
+
+    def __init__(self, location: Any) -> None:
+        self.location = location
+
+
+def _signature(stat: os.stat_result) -> tuple[int, int, int]:
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _skip_value(buffer: mmap.mmap, position: int) -> int:
+    match = _BOUNDED_VALUE.match(buffer, position)
+    if match is not None:
+        return match.end()
+    return _scan_value(buffer, position)
+
+
+def _scan_value(buffer: mmap.mmap, position: int) -> int:
+    depth = 0
+    while True:
+        match = _STRUCTURAL.search(buffer, position)
+        if match is None:
+            raise ValueError(f"Malformed show file: unterminated value at offset {position}")
+        token = match.group()
+        if token == b'"':
+            string = _STRING_TOKEN.match(buffer, match.start())
+            if string is None:
+                raise ValueError(f"Malformed show file: unterminated string at offset {match.start()}")
+            position = string.end()
+            continue
+        position = match.end()
+        depth += 1 if token in b"{[" else -1
+        if depth == 0:
+            return position
+
+
+def _skip(buffer: mmap.mmap, position: int) -> int:
+    return _WHITESPACE.match(buffer, position).end()
+
+
+def _expect(buffer: mmap.mmap, position: int, token: bytes) -> int:
+    if buffer[position:position + len(token)] != token:
+        raise ValueError(f"Malformed show file: expected {token.decode()!r} at offset {position}")
+    return position + len(token)
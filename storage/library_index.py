@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from engine.models import FixturePatch, ShowFile
+from engine.patch_index import PatchIndex
+from engine.patch_transaction import validate_address
+
+from .binary_show import BINARY_SUFFIX
+from .show_repository import ShowRepository
+from .sqlite_repository import SQLITE_SUFFIX
+
+SHOW_SUFFIXES = (".json", BINARY_SUFFIX, SQLITE_SUFFIX)
+# A JSON file is only taken for a show if one of these top-level keys appears near its start.
+SHOW_JSON_KEYS = (b'"fixtures"', b'"scenes"', b'"sequences"')
+SNIFF_BYTES = 64 * 1024
+INDEX_VERSION = 1
+
+
+@dataclass(slots=True)
+class ShowSummary:
+    path: str
+    mtime_ns: int
+    size: int
+    schema_version: int | None = None
+    fixture_count: int = 0
+    group_count: int = 0
+    scene_count: int = 0
+    sequence_count: int = 0
+    cue_count: int = 0
+    universes: list[int] = field(default_factory=list)
+    address_ranges: list[tuple[int, int, int]] = field(default_factory=list)
+    scene_names: list[str] = field(default_factory=list)
+    sequence_names: list[str] = field(default_factory=list)
+    problems: list[str] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None and not self.problems
+
+
+def find_show_files(root: str | Path, *, exclude: set[Path] | None = None) -> list[Path]:
+    excluded = {path.resolve() for path in exclude or ()}
+    paths = []
+    for directory, _subdirectories, file_names in os.walk(root):
+        for file_name in file_names:
+            path = Path(directory, file_name)
+            if path.suffix.lower() in SHOW_SUFFIXES and path.resolve() not in excluded and _looks_like_show(path):
+                paths.append(path)
+    return sorted(paths)
+
+
+def validate_show(show_file: ShowFile) -> list[str]:
+    problems = []
+    seen_ids: set[int] = set()
+    for patch in show_file.fixtures:
+        if patch.fixture_id in seen_ids:
+            problems.append(f"Duplicate fixture id {patch.fixture_id}.")
+        seen_ids.add(patch.fixture_id)
+        try:
+            validate_address(patch)
+        except ValueError as exc:
+            problems.append(str(exc))
+    patch_index = PatchIndex(_unique_fixtures(show_file))
+    for first_id, second_id in patch_index.conflicts():
+        problems.append(f"Fixtures {first_id} and {second_id} overlap in universe {patch_index.get(first_id).universe}.")
+    for group in show_file.groups:
+        missing = [fixture_id for fixture_id in group.fixture_ids if fixture_id not in seen_ids]
+        if missing:
+            problems.append(f"Group {group.name!r} references missing fixtures {missing}.")
+    scene_ids = set(show_file.scenes) if isinstance(show_file.scenes, Mapping) else {scene.id for scene in show_file.scenes}
+    for sequence in show_file.sequences:
+        for number, cue in enumerate(sequence.cues, start=1):
+            if cue.scene_id not in scene_ids:
+                problems.append(f"Sequence {sequence.name!r} cue {number} references missing scene {cue.scene_id!r}.")
+    return problems
+
+
+def summarize_show(path: str | Path) -> ShowSummary:
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError as exc:
+        return ShowSummary(path=str(path), mtime_ns=0, size=0, error=f"{type(exc).__name__}: {exc}")
+    summary = ShowSummary(path=str(path), mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+    try:
+        show_file = ShowRepository().load(path)
+    except Exception as exc:
+        summary.error = f"{type(exc).__name__}: {exc}"
+        return summary
+    ranges: dict[int, tuple[int, int]] = {}
+    for patch in show_file.fixtures:
+        first, last = ranges.get(patch.universe, (patch.start_address, patch.start_address + patch.num_channels - 1))
+        ranges[patch.universe] = (min(first, patch.start_address), max(last, patch.start_address + patch.num_channels - 1))
+    summary.schema_version = show_file.schema_version
+    summary.fixture_count = len(show_file.fixtures)
+    summary.group_count = len(show_file.groups)
+    summary.scene_count = len(show_file.scenes)
+    summary.sequence_count = len(show_file.sequences)
+    summary.cue_count = sum(len(sequence.cues) for sequence in show_file.sequences)
+    summary.universes = sorted(ranges)
+    summary.address_ranges = [(universe, *ranges[universe]) for universe in sorted(ranges)]
+    summary.scene_names = [scene.name for scene in show_file.scenes]
+    summary.sequence_names = [sequence.name for sequence in show_file.sequences]
+    summary.problems = validate_show(show_file)
+    return summary
+
+
+def index_library(
+    root: str | Path,
+    *,
+    jobs: int | None = None,
+    previous: list[ShowSummary] | None = None,
+    exclude: set[Path] | None = None,
+) -> list[ShowSummary]:
+    reusable = {summary.path: summary for summary in previous or ()}
+    summaries: dict[str, ShowSummary] = {}
+    pending = []
+    for path in find_show_files(root, exclude=exclude):
+        try:
+            stat = path.stat()
+        except OSError:
+            # summarize_show records the failure against this file.
+            pending.append(str(path))
+            continue
+        cached = reusable.get(str(path))
+        if cached is not None and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+            summaries[str(path)] = cached
+        else:
+            pending.append(str(path))
+    if len(pending) > 1 and jobs != 1:
+        chunksize = max(1, len(pending) // (4 * (jobs or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(summarize_show, pending, chunksize=chunksize))
+    else:
+        results = [summarize_show(path) for path in pending]
+    for summary in results:
+        summaries[summary.path] = summary
+    return [summaries[path] for path in sorted(summaries)]
+
+
+def write_index(path: str | Path, summaries: list[ShowSummary]) -> None:
+    payload = {"index_version": INDEX_VERSION, "shows": [asdict(summary) for summary in summaries]}
+    temporary_path = Path(path).with_name(Path(path).name + ".tmp")
+    temporary_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    os.replace(temporary_path, path)
+
+
+def read_index(path: str | Path) -> list[ShowSummary]:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    summaries = []
+    for item in payload.get("shows", []):
+        item["address_ranges"] = [tuple(address_range) for address_range in item.get("address_ranges", [])]
+        summaries.append(ShowSummary(**item))
+    return summaries
+
+
+def search_index(
+    summaries: list[ShowSummary],
+    *,
+    text: str | None = None,
+    universe: int | None = None,
+    min_fixtures: int | None = None,
+    schema_version: int | None = None,
+    invalid_only: bool = False,
+) -> list[ShowSummary]:
+    needle = text.lower() if text else None
+    matches = []
+    for summary in summaries:
+        if invalid_only and summary.is_valid:
+            continue
+        if universe is not None and universe not in summary.universes:
+            continue
+        if min_fixtures is not None and summary.fixture_count < min_fixtures:
+            continue
+        if schema_version is not None and summary.schema_version != schema_version:
+            continue
+        if needle is not None and not any(
+            needle in value.lower() for value in (summary.path, *summary.scene_names, *summary.sequence_names)
+        ):
+            continue
+        matches.append(summary)
+    return matches
+
+
+def _looks_like_show(path: Path) -> bool:
+    if path.suffix.lower() != ".json":
+        return True
+    try:
+        with path.open("rb") as handle:
+            head = handle.read(SNIFF_BYTES)
+    except OSError:
+        # Unreadable files stay in the list so the index reports them instead of dropping them silently.
+        return True
+    return head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"{") and any(key in head for key in SHOW_JSON_KEYS)
+
+
+def _unique_fixtures(show_file: ShowFile) -> list[FixturePatch]:
+    fixtures = {}
+    for patch in show_file.fixtures:
+        fixtures.setdefault(patch.fixture_id, patch)
+    return list(fixtures.values())
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from engine.models import ShowFile
+
+from .binary_show import BinaryShowCodec
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 32
+INDEX_FILE_NAME = "index.json"
+
+
+def default_cache_directory() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "mydmx" / "shows"
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    path: str
+    mtime_ns: int
+    size: int
+    digest: str
+    stored_bytes: int
+    last_used: float
+
+
+class ShowCache:
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else default_cache_directory()
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._codec = BinaryShowCodec()
+        self._lock = threading.Lock()
+        self._entries: dict[str, CacheEntry] | None = None
+
+    def get(self, path: str | Path, *, lazy: bool = False) -> ShowFile | None:
+        # The cache is an optimisation only: any I/O failure reads as a miss rather than failing the load.
+        try:
+            return self._get(Path(path).resolve(), lazy)
+        except OSError:
+            self.misses += 1
+            return None
+
+    def fill(self, path: str | Path, parse: Callable[[bytes], ShowFile]) -> ShowFile:
+        # The entry is keyed by the digest of the very bytes that were parsed, and the stat is taken before the
+        # read, so a file replaced mid-load can only ever miss, never serve the other version.
+        source = Path(path).resolve()
+        stat = source.stat()
+        data = source.read_bytes()
+        show_file = parse(data)
+        try:
+            self._put(source, stat, hashlib.blake2b(data, digest_size=20).hexdigest(), show_file)
+        except OSError:
+            pass
+        return show_file
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in list(self._load_index().values()):
+                self._drop(entry.digest)
+            self._save_index()
+
+    def _get(self, source: Path, lazy: bool) -> ShowFile | None:
+        stat = source.stat()
+        with self._lock:
+            entries = self._load_index()
+            entry = entries.get(str(source))
+            if entry is None or (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+                digest = _hash_file(source)
+                entry = next((candidate for candidate in entries.values() if candidate.digest == digest), None)
+                if entry is None:
+                    self.misses += 1
+                    return None
+                if entry.path != str(source):
+                    entry = CacheEntry(str(source), stat.st_mtime_ns, stat.st_size, digest, entry.stored_bytes, entry.last_used)
+                    entries[entry.path] = entry
+                entry.mtime_ns = stat.st_mtime_ns
+                entry.size = stat.st_size
+            try:
+                data = self._entry_path(entry.digest).read_bytes()
+                show_file = self._codec.loads(data, lazy=lazy)
+            except Exception:
+                # A corrupt or outdated entry can fail to decode in any number of ways; it is dropped either way.
+                self._drop(entry.digest)
+                self._save_index()
+                self.misses += 1
+                return None
+            entry.last_used = time.time()
+            self._save_index()
+            self.hits += 1
+            return show_file
+
+    def _put(self, source: Path, stat: os.stat_result, digest: str, show_file: ShowFile) -> None:
+        data = self._codec.dumps(show_file, compression=None)
+        with self._lock:
+            entries = self._load_index()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temporary_path = self._entry_path(digest).with_suffix(".tmp")
+            temporary_path.write_bytes(data)
+            os.replace(temporary_path, self._entry_path(digest))
+            entries[str(source)] = CacheEntry(str(source), stat.st_mtime_ns, stat.st_size, digest, len(data), time.time())
+            self._evict()
+            self._save_index()
+
+    def _evict(self) -> None:
+        entries = self._entries
+        by_digest: dict[str, CacheEntry] = {}
+        for entry in entries.values():
+            current = by_digest.get(entry.digest)
+            if current is None or entry.last_used > current.last_used:
+                by_digest[entry.digest] = entry
+        total_bytes = sum(entry.stored_bytes for entry in by_digest.values())
+        for entry in sorted(by_digest.values(), key=lambda item: item.last_used):
+            if len(by_digest) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            del by_digest[entry.digest]
+            total_bytes -= entry.stored_bytes
+            self._drop(entry.digest)
+
+    def _drop(self, digest: str) -> None:
+        for key in [key for key, entry in self._entries.items() if entry.digest == digest]:
+            del self._entries[key]
+        self._entry_path(digest).unlink(missing_ok=True)
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.dmxshow"
+
+    def _load_index(self) -> dict[str, CacheEntry]:
+        if self._entries is None:
+            try:
+                payload = json.loads((self.directory / INDEX_FILE_NAME).read_text(encoding="utf-8"))
+                self._entries = {item["path"]: CacheEntry(**item) for item in payload.get("entries", [])}
+            except (OSError, ValueError, TypeError, KeyError):
+                self._entries = {}
+        return self._entries
+
+    def _save_index(self) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temporary_path = self.directory / (INDEX_FILE_NAME + ".tmp")
+            temporary_path.write_text(json.dumps({"entries": [asdict(entry) for entry in self._entries.values()]}), encoding="utf-8")
+            os.replace(temporary_path, self.directory / INDEX_FILE_NAME)
+        except OSError:
+            pass
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with path.open("rb") as handle:
+        while chunk := handle.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
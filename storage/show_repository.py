@@ -1,26 +1,68 @@
 from __future__ import annotations
 
 import json
+import threading
+from collections.abc import Collection, Mapping
+from functools import partial
 from pathlib import Path
 
-from engine.models import Cue, FixtureGroup, FixturePatch, FixtureState, Scene, Sequence, ShowFile, Transition, TriggerMode
+from engine.models import Cue, FixtureGroup, FixturePatch, FixtureState, Palette, Scene, Sequence, ShowFile, Transition, TriggerMode
+from engine.palettes import share_state_blocks
+
+from .binary_show import BINARY_SUFFIX, MAGIC, BinaryShowCodec
+from .lazy_scenes import JsonSceneReader, LazySceneLibrary, index_show_file
+from .show_cache import ShowCache
+from .sqlite_repository import SQLITE_MAGIC, SQLITE_SUFFIX, SqliteShowRepository
 
 
 class ShowRepository:
-    def load(self, path: str | Path) -> ShowFile:
-        with Path(path).open("r", encoding="utf-8") as handle:
-            payload = json.load(handle)
-
-        fixtures = [
-            FixturePatch(
-                fixture_id=item["fixture_id"],
-                start_address=item["start_address"],
-                num_channels=item["num_channels"],
-                position=(item.get("position", [0, 0])[0], item.get("position", [0, 0])[1]),
-                angle=item.get("angle", 0),
-            )
-            for item in payload.get("fixtures", [])
-        ]
+    def __init__(self, cache: ShowCache | None = None) -> None:
+        self.cache = cache
+        self._binary_codec = BinaryShowCodec()
+        self._sqlite = SqliteShowRepository()
+
+    def load(self, path: str | Path, *, lazy: bool = False) -> ShowFile:
+        with Path(path).open("rb") as handle:
+            prefix = handle.read(len(SQLITE_MAGIC))
+        if prefix == SQLITE_MAGIC:
+            return self._sqlite.load(path, lazy=lazy)
+        if prefix.startswith(MAGIC):
+            return self._binary_codec.loads(Path(path).read_bytes(), lazy=lazy)
+        if self.cache is not None:
+            cached = self.cache.get(path, lazy=lazy)
+            if cached is not None:
+                return cached
+            if not lazy:
+                return self.cache.fill(path, self._parse_json)
+            # The lazy index serves this load; the full parse the cache needs happens off the caller's thread.
+            threading.Thread(target=self._fill_cache, args=(path,), name="mydmx-show-cache", daemon=True).start()
+        if lazy:
+            return self._load_json_lazy(path)
+        return self._load_json(path)
+
+    def _fill_cache(self, path: str | Path) -> None:
+        try:
+            self.cache.fill(path, self._parse_json)
+        except (OSError, ValueError):
+            pass
+
+    def _load_json_lazy(self, path: str | Path) -> ShowFile:
+        payload, entries = index_show_file(path)
+        palettes = self._deserialize_palettes(payload)
+        reader = JsonSceneReader(path, partial(self._deserialize_scene, palettes=palettes))
+        return self._build_show_file(payload, LazySceneLibrary(entries, reader), palettes)
+
+    def _load_json(self, path: str | Path) -> ShowFile:
+        return self._parse_json(Path(path).read_bytes())
+
+    def _parse_json(self, data: bytes) -> ShowFile:
+        payload = json.loads(data)
+        palettes = self._deserialize_palettes(payload)
+        scenes = [self._deserialize_scene(item, palettes) for item in payload.get("scenes", [])]
+        return self._build_show_file(payload, scenes, palettes)
+
+    def _build_show_file(self, payload: dict, scenes: list[Scene] | LazySceneLibrary, palettes: dict[str, Palette]) -> ShowFile:
+        fixtures = [self._deserialize_fixture_patch(item) for item in payload.get("fixtures", [])]
         groups = [
             FixtureGroup(
                 id=item["id"],
@@ -29,7 +71,6 @@ class ShowRepository:
             )
             for item in payload.get("groups", [])
         ]
-        scenes = [self._deserialize_scene(item) for item in payload.get("scenes", [])]
         sequences = [self._deserialize_sequence(item) for item in payload.get("sequences", [])]
         return ShowFile(
             fixtures=fixtures,
@@ -37,14 +78,28 @@ class ShowRepository:
             scenes=scenes,
             sequences=sequences,
             schema_version=payload.get("schema_version", 1),
+            palettes=list(palettes.values()),
         )
 
-    def save(self, path: str | Path, show_file: ShowFile) -> None:
+    def save(self, path: str | Path, show_file: ShowFile, *, binary: bool | None = None, compression: str | None = "zlib") -> None:
+        if Path(path).suffix.lower() == SQLITE_SUFFIX:
+            self._sqlite.save(path, show_file)
+            return
+        if binary is None:
+            binary = Path(path).suffix.lower() == BINARY_SUFFIX
+        if binary:
+            data = self._binary_codec.dumps(show_file, compression=compression)
+            Path(path).write_bytes(data)
+            return
+        scenes = list(show_file.scenes.values()) if isinstance(show_file.scenes, Mapping) else show_file.scenes
+        palettes, scenes = share_state_blocks(show_file.palettes, scenes)
+        palette_ids = {palette.id for palette in palettes}
         payload = {
             "schema_version": show_file.schema_version,
             "fixtures": [self._serialize_fixture_patch(patch) for patch in show_file.fixtures],
             "groups": [self._serialize_group(group) for group in show_file.groups],
-            "scenes": [self._serialize_scene(scene) for scene in show_file.scenes],
+            "palettes": [self._serialize_palette(palette) for palette in palettes],
+            "scenes": [self._serialize_scene(scene, palette_ids) for scene in scenes],
             "sequences": [self._serialize_sequence(sequence) for sequence in show_file.sequences],
         }
         with Path(path).open("w", encoding="utf-8") as handle:
@@ -57,6 +112,7 @@ class ShowRepository:
             "num_channels": patch.num_channels,
             "position": [patch.position[0], patch.position[1]],
             "angle": patch.angle,
+            "universe": patch.universe,
         }
 
     def _serialize_group(self, group: FixtureGroup) -> dict:
@@ -66,13 +122,24 @@ class ShowRepository:
             "fixture_ids": list(group.fixture_ids),
         }
 
-    def _serialize_scene(self, scene: Scene) -> dict:
+    def _serialize_palette(self, palette: Palette) -> dict:
         return {
+            "id": palette.id,
+            "name": palette.name,
+            "fixture_states": [self._serialize_fixture_state(state) for state in palette.fixture_states.values()],
+        }
+
+    def _serialize_scene(self, scene: Scene, palette_ids: Collection[str] = ()) -> dict:
+        payload = {
             "id": scene.id,
             "name": scene.name,
             "notes": scene.notes,
-            "fixture_states": [self._serialize_fixture_state(state) for state in scene.fixture_states.values()],
         }
+        if scene.palette_id is not None:
+            payload["palette"] = scene.palette_id
+        if scene.palette_id not in palette_ids:
+            payload["fixture_states"] = [self._serialize_fixture_state(state) for state in scene.fixture_states.values()]
+        return payload
 
     def _serialize_sequence(self, sequence: Sequence) -> dict:
         return {
@@ -80,6 +147,7 @@ class ShowRepository:
             "name": sequence.name,
             "notes": sequence.notes,
             "cyclic": sequence.cyclic,
+            "tracking": sequence.tracking,
             "cues": [self._serialize_cue(cue) for cue in sequence.cues],
         }
 
@@ -106,13 +174,43 @@ class ShowRepository:
             "white": state.white,
         }
 
-    def _deserialize_scene(self, payload: dict) -> Scene:
+    def _deserialize_fixture_patch(self, payload: dict) -> FixturePatch:
+        position = payload.get("position", [0, 0])
+        return FixturePatch(
+            fixture_id=payload["fixture_id"],
+            start_address=payload["start_address"],
+            num_channels=payload["num_channels"],
+            position=(position[0], position[1]),
+            angle=payload.get("angle", 0),
+            universe=payload.get("universe", 1),
+        )
+
+    def _deserialize_palettes(self, payload: dict) -> dict[str, Palette]:
+        palettes = [self._deserialize_palette(item) for item in payload.get("palettes", [])]
+        return {palette.id: palette for palette in palettes}
+
+    def _deserialize_palette(self, payload: dict) -> Palette:
         states = [self._deserialize_fixture_state(item) for item in payload.get("fixture_states", [])]
+        return Palette(
+            id=payload["id"],
+            name=payload.get("name", ""),
+            fixture_states={state.fixture_id: state for state in states},
+        )
+
+    def _deserialize_scene(self, payload: dict, palettes: Mapping[str, Palette] | None = None) -> Scene:
+        palette_id = payload.get("palette")
+        palette = palettes.get(palette_id) if palettes and palette_id is not None else None
+        if palette is not None and "fixture_states" not in payload:
+            fixture_states = palette.fixture_states
+        else:
+            states = [self._deserialize_fixture_state(item) for item in payload.get("fixture_states", [])]
+            fixture_states = {state.fixture_id: state for state in states}
         return Scene(
             id=payload["id"],
             name=payload["name"],
             notes=payload.get("notes", ""),
-            fixture_states={state.fixture_id: state for state in states},
+            fixture_states=fixture_states,
+            palette_id=palette_id,
         )
 
     def _deserialize_sequence(self, payload: dict) -> Sequence:
@@ -122,6 +220,7 @@ class ShowRepository:
             name=payload["name"],
             notes=payload.get("notes", ""),
             cyclic=payload.get("cyclic", False),
+            tracking=payload.get("tracking", False),
             cues=cues,
         )
 
@@ -148,4 +247,4 @@ class ShowRepository:
             green=payload.get("green", 0),
             blue=payload.get("blue", 0),
             white=payload.get("white", 0),
-        )
\ No newline at end of file
+        ).normalized()
\ No newline at end of file
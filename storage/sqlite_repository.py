@@ -0,0 +1,502 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from collections.abc import Collection, Iterable, Mapping
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+from engine.models import Cue, FixtureGroup, FixturePatch, FixtureState, Palette, Scene, Sequence, ShowFile, Transition, TriggerMode
+from engine.palettes import share_state_blocks
+
+from .lazy_scenes import LazySceneLibrary
+
+SQLITE_SUFFIX = ".dmxdb"
+SQLITE_MAGIC = b"SQLite format 3\x00"
+DATABASE_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fixtures (
+    fixture_id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    start_address INTEGER NOT NULL,
+    num_channels INTEGER NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    angle INTEGER NOT NULL,
+    universe INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fixture_groups (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    fixture_ids TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS palettes (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS palette_states (
+    palette_id TEXT NOT NULL REFERENCES palettes(id) ON DELETE CASCADE,
+    fixture_id INTEGER NOT NULL,
+    intensity INTEGER NOT NULL,
+    red INTEGER NOT NULL,
+    green INTEGER NOT NULL,
+    blue INTEGER NOT NULL,
+    white INTEGER NOT NULL,
+    PRIMARY KEY (palette_id, fixture_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS palette_states_by_fixture ON palette_states (fixture_id, palette_id);
+CREATE TABLE IF NOT EXISTS scenes (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    palette_id TEXT
+);
+CREATE TABLE IF NOT EXISTS fixture_states (
+    scene_id TEXT NOT NULL REFERENCES scenes(id) ON DELETE CASCADE,
+    fixture_id INTEGER NOT NULL,
+    intensity INTEGER NOT NULL,
+    red INTEGER NOT NULL,
+    green INTEGER NOT NULL,
+    blue INTEGER NOT NULL,
+    white INTEGER NOT NULL,
+    PRIMARY KEY (scene_id, fixture_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fixture_states_by_fixture ON fixture_states (fixture_id, scene_id);
+CREATE TABLE IF NOT EXISTS sequences (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    cyclic INTEGER NOT NULL,
+    tracking INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cues (
+    sequence_id TEXT NOT NULL REFERENCES sequences(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    scene_id TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    trigger_mode TEXT NOT NULL,
+    fade_in_ms INTEGER NOT NULL,
+    fade_out_ms INTEGER NOT NULL,
+    hold_ms INTEGER NOT NULL,
+    PRIMARY KEY (sequence_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cues_by_scene ON cues (scene_id);
+"""
+
+
+@dataclass(slots=True)
+class PartialShowFile(ShowFile):
+    # What a partial load read; saving it only deletes rows from these sets and leaves the rest of the library alone.
+    loaded_scene_ids: frozenset[str] = frozenset()
+    loaded_sequence_ids: frozenset[str] = frozenset()
+
+
+class SqliteShowRepository:
+    def load(self, path: str | Path, *, lazy: bool = False) -> ShowFile:
+        with closing(self._connect(path)) as connection:
+            sequences = self._load_sequences(connection)
+            palettes = self._load_palettes(connection)
+            if lazy:
+                entries = {
+                    scene_id: (name, scene_id)
+                    for scene_id, name in connection.execute("SELECT id, name FROM scenes ORDER BY position")
+                }
+                scenes: list[Scene] | LazySceneLibrary = LazySceneLibrary(entries, SqliteSceneReader(path, self, palettes))
+            else:
+                scenes = self._load_scenes(connection, palettes)
+            return self._build_show_file(connection, scenes, sequences, palettes)
+
+    def load_sequence(self, path: str | Path, sequence_id: str) -> PartialShowFile:
+        with closing(self._connect(path)) as connection:
+            sequences = self._load_sequences(connection, "= ?", (sequence_id,))
+            if not sequences:
+                raise KeyError(sequence_id)
+            palettes = self._load_palettes(connection)
+            scenes = self._load_scenes(connection, palettes, "IN (SELECT scene_id FROM cues WHERE sequence_id = ?)", (sequence_id,))
+            show_file = self._build_show_file(connection, scenes, sequences, palettes)
+        return PartialShowFile(
+            fixtures=show_file.fixtures,
+            groups=show_file.groups,
+            scenes=show_file.scenes,
+            sequences=show_file.sequences,
+            schema_version=show_file.schema_version,
+            palettes=show_file.palettes,
+            loaded_scene_ids=frozenset(scene.id for scene in scenes),
+            loaded_sequence_ids=frozenset((sequence_id,)),
+        )
+
+    def scenes_using_fixture(self, path: str | Path, fixture_id: int) -> list[str]:
+        with closing(self._connect(path)) as connection:
+            rows = connection.execute(
+                """
+                SELECT id FROM scenes
+                WHERE id IN (SELECT scene_id FROM fixture_states WHERE fixture_id = ?)
+                OR palette_id IN (SELECT palette_id FROM palette_states WHERE fixture_id = ?)
+                ORDER BY position
+                """,
+                (fixture_id, fixture_id),
+            )
+            return [scene_id for (scene_id,) in rows]
+
+    def sequences_using_scene(self, path: str | Path, scene_id: str) -> list[str]:
+        with closing(self._connect(path)) as connection:
+            rows = connection.execute("SELECT DISTINCT sequence_id FROM cues WHERE scene_id = ?", (scene_id,))
+            return [sequence_id for (sequence_id,) in rows]
+
+    def save(self, path: str | Path, show_file: ShowFile) -> int:
+        untouched = self._unmaterialized_scene_ids(show_file.scenes, path)
+        if isinstance(show_file.scenes, Mapping):
+            scenes = [show_file.scenes[scene_id] for scene_id in show_file.scenes if scene_id not in untouched]
+        else:
+            scenes = list(show_file.scenes)
+        partial = isinstance(show_file, PartialShowFile)
+        palettes, scenes = share_state_blocks(show_file.palettes, scenes)
+        if partial or untouched:
+            # Palettes of scenes that were not loaded are unknown here, so a partial save writes every palette and prunes none.
+            written_ids = {palette.id for palette in palettes}
+            palettes += [palette for palette in show_file.palettes if palette.id not in written_ids]
+        with closing(self._connect(path)) as connection, connection:
+            written = self._save_meta(connection, show_file)
+            written += self._save_fixtures(connection, show_file.fixtures)
+            written += self._save_groups(connection, show_file.groups)
+            written += self._save_palettes(connection, palettes, prune=not (partial or untouched))
+            written += self._save_scenes(
+                connection,
+                scenes,
+                {palette.id for palette in palettes},
+                untouched=untouched,
+                scope=show_file.loaded_scene_ids if partial else None,
+            )
+            written += self._save_sequences(connection, show_file.sequences, scope=show_file.loaded_sequence_ids if partial else None)
+            return written
+
+    def read_scene(self, connection: sqlite3.Connection, scene_id: str, palettes: dict[str, Palette] | None = None) -> Scene:
+        scenes = self._load_scenes(connection, palettes or {}, "= ?", (scene_id,))
+        if not scenes:
+            raise KeyError(scene_id)
+        return scenes[0]
+
+    def _connect(self, path: str | Path) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(path), check_same_thread=False)
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.executescript(_SCHEMA)
+        if "palette_id" not in {row[1] for row in connection.execute("PRAGMA table_info(scenes)")}:
+            connection.execute("ALTER TABLE scenes ADD COLUMN palette_id TEXT")
+        connection.execute("CREATE INDEX IF NOT EXISTS scenes_by_palette ON scenes (palette_id)")
+        return connection
+
+    def _unmaterialized_scene_ids(self, scenes: list[Scene] | Mapping[str, Scene], path: str | Path) -> frozenset[str]:
+        # Scenes a lazy library never materialised still match the rows they were read from, so they are skipped.
+        reader = getattr(scenes, "reader", None)
+        if not isinstance(reader, SqliteSceneReader) or reader.path.resolve() != Path(path).resolve():
+            return frozenset()
+        return frozenset(scene_id for scene_id in scenes if not scenes.is_materialized(scene_id))
+
+    def _build_show_file(
+        self,
+        connection: sqlite3.Connection,
+        scenes: list[Scene] | LazySceneLibrary,
+        sequences: list[Sequence],
+        palettes: dict[str, Palette],
+    ) -> ShowFile:
+        meta = dict(connection.execute("SELECT key, value FROM meta"))
+        fixtures = [
+            FixturePatch(fixture_id=fixture_id, start_address=start, num_channels=channels, position=(x, y), angle=angle, universe=universe)
+            for fixture_id, start, channels, x, y, angle, universe in connection.execute(
+                "SELECT fixture_id, start_address, num_channels, x, y, angle, universe FROM fixtures ORDER BY position"
+            )
+        ]
+        groups = [
+            FixtureGroup(id=group_id, name=name, fixture_ids=json.loads(fixture_ids))
+            for group_id, name, fixture_ids in connection.execute("SELECT id, name, fixture_ids FROM fixture_groups ORDER BY position")
+        ]
+        return ShowFile(
+            fixtures=fixtures,
+            groups=groups,
+            scenes=scenes,
+            sequences=sequences,
+            schema_version=int(meta.get("schema_version", 1)),
+            palettes=list(palettes.values()),
+        )
+
+    def _load_palettes(self, connection: sqlite3.Connection) -> dict[str, Palette]:
+        palettes = {palette_id: Palette(id=palette_id, name=name) for palette_id, name in connection.execute("SELECT id, name FROM palettes")}
+        for palette_id, fixture_id, intensity, red, green, blue, white in connection.execute(
+            "SELECT palette_id, fixture_id, intensity, red, green, blue, white FROM palette_states"
+        ):
+            palettes[palette_id].fixture_states[fixture_id] = FixtureState(fixture_id, intensity, red, green, blue, white)
+        return palettes
+
+    def _load_scenes(
+        self,
+        connection: sqlite3.Connection,
+        palettes: dict[str, Palette],
+        id_condition: str | None = None,
+        parameters: tuple = (),
+    ) -> list[Scene]:
+        scenes = {
+            scene_id: Scene(id=scene_id, name=name, notes=notes, palette_id=palette_id)
+            for scene_id, name, notes, palette_id in connection.execute(
+                f"SELECT id, name, notes, palette_id FROM scenes {_where('id', id_condition)} ORDER BY position",
+                parameters,
+            )
+        }
+        for scene_id, fixture_id, intensity, red, green, blue, white in connection.execute(
+            f"SELECT scene_id, fixture_id, intensity, red, green, blue, white FROM fixture_states {_where('scene_id', id_condition)}",
+            parameters,
+        ):
+            scenes[scene_id].fixture_states[fixture_id] = FixtureState(fixture_id, intensity, red, green, blue, white)
+        for scene in scenes.values():
+            palette = palettes.get(scene.palette_id) if scene.palette_id is not None else None
+            if palette is not None and not scene.fixture_states:
+                scene.fixture_states = palette.fixture_states
+        return list(scenes.values())
+
+    def _load_sequences(self, connection: sqlite3.Connection, id_condition: str | None = None, parameters: tuple = ()) -> list[Sequence]:
+        sequences = {
+            sequence_id: Sequence(id=sequence_id, name=name, notes=notes, cyclic=bool(cyclic), tracking=bool(tracking))
+            for sequence_id, name, notes, cyclic, tracking in connection.execute(
+                f"SELECT id, name, notes, cyclic, tracking FROM sequences {_where('id', id_condition)} ORDER BY position",
+                parameters,
+            )
+        }
+        cue_filter = _where("sequence_id", id_condition)
+        for sequence_id, cue_id, scene_id, notes, trigger_mode, fade_in_ms, fade_out_ms, hold_ms in connection.execute(
+            f"""
+            SELECT sequence_id, id, scene_id, notes, trigger_mode, fade_in_ms, fade_out_ms, hold_ms
+            FROM cues {cue_filter} ORDER BY sequence_id, position
+            """,
+            parameters,
+        ):
+            sequences[sequence_id].cues.append(
+                Cue(
+                    id=cue_id,
+                    scene_id=scene_id,
+                    notes=notes,
+                    trigger_mode=TriggerMode(trigger_mode),
+                    transition=Transition(fade_in_ms=fade_in_ms, fade_out_ms=fade_out_ms, hold_ms=hold_ms),
+                )
+            )
+        return list(sequences.values())
+
+    def _save_meta(self, connection: sqlite3.Connection, show_file: ShowFile) -> int:
+        rows = {"schema_version": str(show_file.schema_version), "database_version": str(DATABASE_VERSION)}
+        existing = dict(connection.execute("SELECT key, value FROM meta"))
+        changed = [(key, value) for key, value in rows.items() if existing.get(key) != value]
+        connection.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", changed)
+        return len(changed)
+
+    def _save_fixtures(self, connection: sqlite3.Connection, fixtures: list[FixturePatch]) -> int:
+        rows = {
+            patch.fixture_id: (position, patch.start_address, patch.num_channels, patch.position[0], patch.position[1], patch.angle, patch.universe)
+            for position, patch in enumerate(fixtures)
+        }
+        existing = {
+            row[0]: tuple(row[1:])
+            for row in connection.execute("SELECT fixture_id, position, start_address, num_channels, x, y, angle, universe FROM fixtures")
+        }
+        return self._sync_rows(
+            connection,
+            "fixtures",
+            "fixture_id",
+            existing,
+            rows,
+            "INSERT OR REPLACE INTO fixtures (fixture_id, position, start_address, num_channels, x, y, angle, universe) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        )
+
+    def _save_groups(self, connection: sqlite3.Connection, groups: list[FixtureGroup]) -> int:
+        rows = {group.id: (position, group.name, json.dumps(list(group.fixture_ids))) for position, group in enumerate(groups)}
+        existing = {row[0]: tuple(row[1:]) for row in connection.execute("SELECT id, position, name, fixture_ids FROM fixture_groups")}
+        return self._sync_rows(
+            connection,
+            "fixture_groups",
+            "id",
+            existing,
+            rows,
+            "INSERT OR REPLACE INTO fixture_groups (id, position, name, fixture_ids) VALUES (?, ?, ?, ?)",
+        )
+
+    def _save_palettes(self, connection: sqlite3.Connection, palettes: list[Palette], *, prune: bool = True) -> int:
+        existing = dict(connection.execute("SELECT id, digest FROM palettes"))
+        written = 0
+        for palette in palettes:
+            states = [state.normalized() for state in palette.fixture_states.values()]
+            digest = _digest(palette.name, [(state.fixture_id, state.intensity, state.red, state.green, state.blue, state.white) for state in states])
+            if existing.pop(palette.id, None) == digest:
+                continue
+            written += 1
+            connection.execute("INSERT OR REPLACE INTO palettes (id, name, digest) VALUES (?, ?, ?)", (palette.id, palette.name, digest))
+            connection.execute("DELETE FROM palette_states WHERE palette_id = ?", (palette.id,))
+            connection.executemany(
+                "INSERT INTO palette_states (palette_id, fixture_id, intensity, red, green, blue, white) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(palette.id, state.fixture_id, state.intensity, state.red, state.green, state.blue, state.white) for state in states],
+            )
+        if not prune:
+            return written
+        connection.executemany("DELETE FROM palettes WHERE id = ?", [(palette_id,) for palette_id in existing])
+        return written + len(existing)
+
+    def _save_scenes(
+        self,
+        connection: sqlite3.Connection,
+        scenes: list[Scene],
+        palette_ids: set[str],
+        *,
+        untouched: Collection[str] = frozenset(),
+        scope: Collection[str] | None = None,
+    ) -> int:
+        existing = {scene_id: (position, digest) for scene_id, position, digest in connection.execute("SELECT id, position, digest FROM scenes")}
+        appended = max((position for position, _digest in existing.values()), default=-1)
+        written = 0
+        position = -1
+        for scene in scenes:
+            # Scenes sharing a stored palette keep no rows of their own; editing the palette rewrites only its rows.
+            states = [] if scene.palette_id in palette_ids else [state.normalized() for state in scene.fixture_states.values()]
+            digest = _digest(
+                scene.name,
+                scene.notes,
+                scene.palette_id or "",
+                [(state.fixture_id, state.intensity, state.red, state.green, state.blue, state.white) for state in states],
+            )
+            previous = existing.pop(scene.id, None)
+            if previous is None and (untouched or scope is not None):
+                # Rows outside this save keep their positions, so new scenes go after all of them.
+                appended += 1
+                position = appended
+            else:
+                position = _next_position(previous, position)
+            if previous == (position, digest):
+                continue
+            written += 1
+            if previous is not None and previous[1] == digest:
+                connection.execute("UPDATE scenes SET position = ? WHERE id = ?", (position, scene.id))
+                continue
+            connection.execute(
+                "INSERT OR REPLACE INTO scenes (id, position, name, notes, digest, palette_id) VALUES (?, ?, ?, ?, ?, ?)",
+                (scene.id, position, scene.name, scene.notes, digest, scene.palette_id),
+            )
+            connection.execute("DELETE FROM fixture_states WHERE scene_id = ?", (scene.id,))
+            connection.executemany(
+                "INSERT INTO fixture_states (scene_id, fixture_id, intensity, red, green, blue, white) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(scene.id, state.fixture_id, state.intensity, state.red, state.green, state.blue, state.white) for state in states],
+            )
+        removed = _removed_ids(existing, untouched, scope)
+        connection.executemany("DELETE FROM scenes WHERE id = ?", [(scene_id,) for scene_id in removed])
+        return written + len(removed)
+
+    def _save_sequences(self, connection: sqlite3.Connection, sequences: list[Sequence], *, scope: Collection[str] | None = None) -> int:
+        existing = {
+            sequence_id: (position, digest)
+            for sequence_id, position, digest in connection.execute("SELECT id, position, digest FROM sequences")
+        }
+        appended = max((position for position, _digest in existing.values()), default=-1)
+        written = 0
+        position = -1
+        for sequence in sequences:
+            cue_rows = [
+                (
+                    sequence.id,
+                    cue_position,
+                    cue.id,
+                    cue.scene_id,
+                    cue.notes,
+                    cue.trigger_mode.value,
+                    cue.transition.fade_in_ms,
+                    cue.transition.fade_out_ms,
+                    cue.transition.hold_ms,
+                )
+                for cue_position, cue in enumerate(sequence.cues)
+            ]
+            digest = _digest(sequence.name, sequence.notes, sequence.cyclic, sequence.tracking, cue_rows)
+            previous = existing.pop(sequence.id, None)
+            if previous is None and scope is not None:
+                appended += 1
+                position = appended
+            else:
+                position = _next_position(previous, position)
+            if previous == (position, digest):
+                continue
+            written += 1
+            if previous is not None and previous[1] == digest:
+                connection.execute("UPDATE sequences SET position = ? WHERE id = ?", (position, sequence.id))
+                continue
+            connection.execute(
+                "INSERT OR REPLACE INTO sequences (id, position, name, notes, cyclic, tracking, digest) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (sequence.id, position, sequence.name, sequence.notes, int(sequence.cyclic), int(sequence.tracking), digest),
+            )
+            connection.execute("DELETE FROM cues WHERE sequence_id = ?", (sequence.id,))
+            connection.executemany(
+                """
+                INSERT INTO cues (sequence_id, position, id, scene_id, notes, trigger_mode, fade_in_ms, fade_out_ms, hold_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                cue_rows,
+            )
+        removed = _removed_ids(existing, (), scope)
+        connection.executemany("DELETE FROM sequences WHERE id = ?", [(sequence_id,) for sequence_id in removed])
+        return written + len(removed)
+
+    def _sync_rows(
+        self,
+        connection: sqlite3.Connection,
+        table: str,
+        key_column: str,
+        existing: dict,
+        rows: dict,
+        upsert: str,
+    ) -> int:
+        changed = [(key, *row) for key, row in rows.items() if existing.get(key) != row]
+        removed = [(key,) for key in existing if key not in rows]
+        connection.executemany(upsert, changed)
+        connection.executemany(f"DELETE FROM {table} WHERE {key_column} = ?", removed)
+        return len(changed) + len(removed)
+
+
+class SqliteSceneReader:
+    def __init__(self, path: str | Path, repository: SqliteShowRepository, palettes: dict[str, Palette] | None = None) -> None:
+        self._path = Path(path)
+        self._repository = repository
+        self._palettes = palettes or {}
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __call__(self, scene_id: str) -> Scene:
+        if self._connection is None:
+            self._connection = self._repository._connect(self._path)
+        return self._repository.read_scene(self._connection, scene_id, self._palettes)
+
+
+def _next_position(previous: tuple[int, str] | None, last_position: int) -> int:
+    # Rows keep their stored position while the order still holds, so deletes and appends rewrite nothing else.
+    if previous is not None and previous[0] > last_position:
+        return previous[0]
+    return last_position + 1
+
+
+def _removed_ids(remaining: Iterable[str], untouched: Collection[str], scope: Collection[str] | None) -> list[str]:
+    return [row_id for row_id in remaining if row_id not in untouched and (scope is None or row_id in scope)]
+
+
+def _where(column: str, condition: str | None) -> str:
+    return f"WHERE {column} {condition}" if condition else ""
+
+
+def _digest(*parts: Iterable | str | bool) -> str:
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()